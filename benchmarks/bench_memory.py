@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""Memory benchmark of the K2HR3 API objects.
+
+Measures the bytes allocated per object by using tracemalloc.
+
+.. code-block:: console
+
+    $ python3 benchmarks/bench_memory.py --count 100000
+"""
+
+import argparse
+from http.client import HTTPMessage
+import os
+import sys
+import tracemalloc
+
+here = os.path.dirname(__file__)
+src_dir = os.path.join(here, '..', 'src')
+if os.path.exists(src_dir):
+    sys.path.insert(0, src_dir)
+
+# pylint: disable=wrong-import-position
+from k2hr3client.api import (K2hr3ApiResponse, K2hr3HTTPMethod,  # noqa: E402
+                             K2hr3Request, json_headers)
+from k2hr3client.resource import K2hr3Resource  # noqa: E402
+from k2hr3client.role import K2hr3Role, K2hr3RoleHost  # noqa: E402
+
+
+def _role(i):
+    return K2hr3Role("token")
+
+
+def _resource(i):
+    return K2hr3Resource("token", resource_path=f"resource{i}")
+
+
+def _role_host(i):
+    return K2hr3RoleHost(f"host{i}", "8020", f"cuk{i}", "", "tag",
+                         "10.0.0.1", "10.0.0.1")
+
+
+def _request(i):
+    return K2hr3Request(K2hr3HTTPMethod.GET, f"v1/role/role{i}",
+                        {'expand': False}, json_headers("U=token"))
+
+
+def _response(i):
+    hdrs = HTTPMessage()
+    hdrs['Content-Type'] = 'application/json; charset=utf-8'
+    hdrs['Content-Length'] = '32'
+    return K2hr3ApiResponse(200, "http://127.0.0.1:18080/v1/role", hdrs,
+                            '{"result":true,"message":null}')
+
+
+def measure(factory, count):
+    """Return the bytes allocated per object and whether it has __dict__."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objs = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    size = sum(stat.size_diff for stat in stats)
+    return size / count, hasattr(objs[0], '__dict__')
+
+
+def main():
+    """Print the result."""
+    parser = argparse.ArgumentParser(description='k2hr3client memory bench')
+    parser.add_argument('--count', dest='count', type=int, default=100000,
+                        help='number of objects per measurement')
+    args = parser.parse_args()
+    for name, factory in [('K2hr3Role', _role),
+                          ('K2hr3Resource', _resource),
+                          ('K2hr3RoleHost', _role_host),
+                          ('K2hr3Request', _request),
+                          ('K2hr3ApiResponse', _response)]:
+        per_object, has_dict = measure(factory, args.count)
+        print(f"{name:20} {per_object:10.1f} bytes/object  "
+              f"__dict__={has_dict}")
+
+
+if __name__ == '__main__':
+    main()
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
@@ -48,7 +48,7 @@
 import json
 from typing import Optional
 
-from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod
+from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod, json_headers
 from k2hr3client.exception import K2hr3Exception
 
 _ACR_API_ADD_MEMBER = """
@@ -64,7 +64,8 @@ class K2hr3Acr(K2hr3Api):  # pylint: disable=too-many-instance-attributes
     See https://k2hr3.antpick.ax/api_acr.html
     """
 
-    __slots__ = ('_r3token', '_service')
+    __slots__ = ('_r3token', '_service', 'tenant', 'cip', 'cport', 'ccuk',
+                 'crole', 'sport', 'srole', 'scuk')
 
     def __init__(self, r3token: str, service: str):
         """Init the members."""
@@ -73,10 +74,7 @@ class K2hr3Acr(K2hr3Api):  # pylint: disable=too-many-instance-attributes
         self.service = service
 
         # following attrs are dynamically set later.
-        self.headers = {
-            'Content-Type': 'application/json',
-            'x-auth-token': 'U={}'.format(self._r3token)
-        }
+        self.headers = json_headers(f'U={self._r3token}')
         self.body = None
         self.urlparams = None
         # attributes that are unique to this class
@@ -192,15 +190,15 @@ class K2hr3Acr(K2hr3Api):  # pylint: disable=too-many-instance-attributes
                 return f'{self.version}/{self.basepath}/{self.service}'
         if method == K2hr3HTTPMethod.PUT:
             if self.api_id == 1:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'tenant': self.tenant
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.service}'
         if method == K2hr3HTTPMethod.GET:
             if self.api_id == 2:
                 return f'{self.version}/{self.basepath}/{self.service}'
             if self.api_id == 3:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'cip': self.cip,
                     'cport': self.cport,
                     'crole': self.crole,
@@ -208,13 +206,13 @@ class K2hr3Acr(K2hr3Api):  # pylint: disable=too-many-instance-attributes
                     'sport': self.sport,
                     'srole': self.srole,
                     'scuk': self.scuk,
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.service}'
         if method == K2hr3HTTPMethod.DELETE:
             if self.api_id == 4:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'tenant': self.tenant
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.service}'
         return None
 #
@@ -37,10 +37,13 @@ k2hr3client - Python library for K2HR3 API.
 """
 
 import abc
+from collections.abc import Mapping as _Mapping
+import copy
 from enum import Enum
 import logging
 from http.client import HTTPMessage
-from typing import Optional
+from types import MappingProxyType
+from typing import Iterable, Iterator, Mapping, Optional, Tuple, Union
 
 from k2hr3client.exception import K2hr3Exception
 
@@ -64,6 +67,65 @@ class K2hr3HTTPMethod(Enum):  # type: ignore[no-redef]
     TRACE = 9
 
 
+_EMPTY_HEADERS = MappingProxyType({})  # type: Mapping[str, str]
+_JSON_HEADERS = MappingProxyType({'Content-Type': 'application/json'})
+
+
+def json_headers(auth: Optional[str] = None) -> Mapping[str, str]:
+    """Return the read-only headers of a JSON request.
+
+    The headers are not cached not to keep the tokens. The requests that an
+    instance builds share the headers of the instance.
+
+    :param auth: the value of the x-auth-token header, e.g. U=token
+    :type auth: str or None
+    :returns: headers
+    :rtype: Mapping
+    """
+    if not auth:
+        return _JSON_HEADERS
+    return MappingProxyType({'Content-Type': 'application/json',
+                             'x-auth-token': auth})
+
+
+class K2hr3ResponseHeaders(_Mapping):
+    """K2hr3ResponseHeaders stores the response headers compactly.
+
+    The header names are case-insensitive like http.client.HTTPMessage.
+    """
+
+    __slots__ = ('_items',)
+
+    def __init__(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Init the members."""
+        self._items = tuple((str(name), str(val)) for name, val in items)
+
+    def __repr__(self) -> str:
+        """Represent the members."""
+        return '<K2hr3ResponseHeaders ' + repr(self._items) + '>'
+
+    def __getitem__(self, name: str) -> str:
+        """Return the first value of the header."""
+        lname = name.lower()
+        for key, val in self._items:
+            if key.lower() == lname:
+                return val
+        raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate the header names."""
+        return (key for key, _ in self._items)
+
+    def __len__(self) -> int:
+        """Return the number of the headers."""
+        return len(self._items)
+
+    def get_all(self, name: str) -> list:
+        """Return all values of the header."""
+        lname = name.lower()
+        return [val for key, val in self._items if key.lower() == lname]
+
+
 class K2hr3ApiResponse():  # pylint: disable=too-many-instance-attributes
     """K2hr3ApiResponse stores the response of K2HR3 WebAPI.
 
@@ -104,19 +166,25 @@ class K2hr3ApiResponse():  # pylint: disable=too-many-instance-attributes
             self._body = val
 
     @property
-    def hdrs(self) -> HTTPMessage:
+    def hdrs(self) -> K2hr3ResponseHeaders:
         """Return the header."""
         return self._hdrs
 
     @hdrs.setter
-    def hdrs(self, val: HTTPMessage) -> None:
-        """Set the headers that must not be empty."""
-        if isinstance(val, HTTPMessage) is False:
+    def hdrs(self, val: Union[HTTPMessage, Mapping]) -> None:
+        """Set the headers that must not be empty.
+
+        The headers are copied to a K2hr3ResponseHeaders that is smaller than
+        http.client.HTTPMessage.
+        """
+        if isinstance(val, (HTTPMessage, _Mapping)) is False:
             raise K2hr3Exception(
                 f'value type must be http.client.HTTPMessage, not {type(val)}')
         if not val:
             raise K2hr3Exception("val should not be empty")
         if getattr(self, '_hdrs', None) is None:
+            if isinstance(val, K2hr3ResponseHeaders) is False:
+                val = K2hr3ResponseHeaders(val.items())
             self._hdrs = val
 
     @property
@@ -150,12 +218,80 @@ class K2hr3ApiResponse():  # pylint: disable=too-many-instance-attributes
             self._url = val
 
 
+class K2hr3Request():
+    """K2hr3Request describes a request to the K2HR3 WebAPI.
+
+    The members are read only, so an instance can be shared by threads.
+    """
+
+    __slots__ = ('_method', '_path', '_params', '_hdrs', '_body')
+
+    def __init__(self, method: K2hr3HTTPMethod, path: str,  # pylint: disable=R0917 # noqa
+                 params: Optional[Mapping] = None,
+                 hdrs: Optional[Mapping] = None,
+                 body: Optional[Union[str, Iterable[bytes]]] = None) -> None:
+        """Init the members.
+
+        The body is a str or an iterable of bytes that is streamed.
+        """
+        self._method = method
+        self._path = path
+        self._params = MappingProxyType(dict(params)) if params else None
+        # NOTE: read-only headers like json_headers() are shared as is.
+        if isinstance(hdrs, MappingProxyType):
+            self._hdrs = hdrs
+        elif hdrs:
+            self._hdrs = MappingProxyType(dict(hdrs))
+        else:
+            self._hdrs = _EMPTY_HEADERS
+        self._body = body
+
+    def __repr__(self) -> str:
+        """Represent the members."""
+        attrs = []
+        values = ""
+        for attr in ['_method', '_path', '_params', '_body']:
+            val = getattr(self, attr, None)
+            if val:
+                attrs.append((attr, repr(val)))
+                values = ', '.join(['%s=%s' % i for i in attrs]) # pylint: disable=consider-using-f-string # noqa
+        return '<K2hr3Request ' + values + '>'
+
+    @property
+    def method(self) -> K2hr3HTTPMethod:
+        """Return the http method."""
+        return self._method
+
+    @property
+    def path(self) -> str:
+        """Return the url path."""
+        return self._path
+
+    @property
+    def urlparams(self) -> Optional[Mapping]:
+        """Return the url params."""
+        return self._params
+
+    @property
+    def headers(self) -> Mapping:
+        """Return the request headers."""
+        return self._hdrs
+
+    @property
+    def body(self) -> Optional[Union[str, Iterable[bytes]]]:
+        """Return the request body."""
+        return self._body
+
+
 class K2hr3Api(abc.ABC):  # pylint: disable=too-many-instance-attributes
     """Base class of all K2HR3 WebAPIs."""
 
+    __slots__ = ('_basepath', '_params', '_hdrs', '_body', '_version',
+                 '_resp', 'api_id')
+
     DEFAULT_VERSION = "v1"
 
-    def __init__(self, basepath: str, params: Optional[str] = None,  # pylint: disable=R0917 # noqa
+    def __init__(self, basepath: str, params: Optional[dict] = None,  # pylint: disable=R0917 # noqa
                  hdrs: Optional[dict] = None, body: Optional[str] = None,
                  version: str = DEFAULT_VERSION) -> None:  # pylint: disable=W0613 # noqa
         """Init the K2hr3 API members.
@@ -208,26 +344,24 @@ class K2hr3Api(abc.ABC):  # pylint: disable=too-many-instance-attributes
     # getters and setters
     #
     @property
-    def urlparams(self) -> Optional[str]:
+    def urlparams(self) -> Optional[dict]:
         """Return the url params."""
         return self._params
 
     @urlparams.setter
-    def urlparams(self, val: Optional[str]) -> None:  # pylint: disable=arguments-differ, invalid-overridden-method # noqa
-        """Set the params."""
-        if getattr(self, '_params', None) is None:
-            self._params = val
+    def urlparams(self, val: Optional[dict]) -> None:  # pylint: disable=arguments-differ, invalid-overridden-method # noqa
+        """Set the params that are encoded by K2hr3Http."""
+        self._params = val
 
     @property
-    def headers(self) -> Optional[dict]:
+    def headers(self) -> Optional[Mapping]:
         """Return the request headers."""
         return self._hdrs
 
     @headers.setter
-    def headers(self, val: Optional[dict]) -> None:  # pylint: disable=arguments-differ, invalid-overridden-method # noqa
+    def headers(self, val: Optional[Mapping]) -> None:  # pylint: disable=arguments-differ, invalid-overridden-method # noqa
         """Set the headers."""
-        if getattr(self, '_hdrs', None) is None:
-            self._hdrs = val
+        self._hdrs = val
 
     @property
     def body(self) -> Optional[str]:
@@ -237,8 +371,7 @@ class K2hr3Api(abc.ABC):  # pylint: disable=too-many-instance-attributes
     @body.setter
     def body(self, val: Optional[str]) -> None:  # pylint: disable=arguments-differ, invalid-overridden-method # noqa
         """Set the body."""
-        if getattr(self, '_body', None) is None:
-            self._body = val
+        self._body = val
 
     @property
     def resp(self) -> K2hr3ApiResponse:
@@ -248,8 +381,7 @@ class K2hr3Api(abc.ABC):  # pylint: disable=too-many-instance-attributes
     @resp.setter
     def resp(self, val: K2hr3ApiResponse) -> None:
         """Set the response as is."""
-        if getattr(self, '_resp', None) is None:
-            self._resp = val
+        self._resp = val
 
     @property
     def version(self) -> str:
@@ -271,6 +403,34 @@ class K2hr3Api(abc.ABC):  # pylint: disable=too-many-instance-attributes
     #
     # methods that are invoked from other classes
     #
+    def copy(self) -> 'K2hr3Api':
+        """Return a copy of the instance without the response.
+
+        The copy shares the headers, so it is cheaper than a new instance.
+        Use a copy per API call to send requests from several threads.
+        """
+        api = copy.copy(self)
+        api.resp = None  # type: ignore
+        return api
+
+    def _prepare(self, method: K2hr3HTTPMethod) -> Optional[str]:
+        """Clear the previous url params and body, and return the url path."""
+        self.urlparams = None
+        self.body = None
+        return self._api_path(method)
+
+    def build_request(self, method: K2hr3HTTPMethod) -> K2hr3Request:
+        """Build a request of the current API call.
+
+        :raise K2hr3Exception: if the API call does not support the method.
+        """
+        path = self._prepare(method)
+        if path is None:
+            raise K2hr3Exception(
+                f'{method.name} is not supported, api_id {self.api_id}')
+        return K2hr3Request(method, path, self.urlparams, self.headers,
+                            self.body)
+
     def set_response(self, code: int, url: str, headers: HTTPMessage,
                      body: Optional[str]) -> None:
         """Set the API responses in K2hr3Http class."""
@@ -0,0 +1,645 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""K2HR3 Python Client of the token management.
+
+.. code-block:: python
+
+    # Import modules from k2hr3client package.
+    from k2hr3client.api import K2hr3HTTPMethod
+    from k2hr3client.auth import (K2hr3AuthMiddleware, K2hr3RoleTokenCache,
+                                  K2hr3TokenManager, K2hr3TokenValidator)
+    from k2hr3client.http import K2hr3Http
+
+    myhttp = K2hr3Http("http://127.0.0.1:18080")
+    manager = K2hr3TokenManager(myhttp)
+
+    # POST a request to K2HR3 Token API at the first call only.
+    # The token is refreshed in background before it expires.
+    r3token = manager.get_token("demo", iaas_token="gAAAAA...")
+
+    # GET a role token from K2HR3 Role Token API at the first call only.
+    roletokens = K2hr3RoleTokenCache(myhttp)
+    roletoken = roletokens.get_role_token(r3token, "myrole", expire=3600)
+    roletokens.stats.hit_rate  // 0.0
+
+    # HEAD a request to K2HR3 Token API at the first call only.
+    validator = K2hr3TokenValidator(myhttp)
+    validator.is_valid(r3token)  // True
+
+    # Send requests with a new token if the token has expired.
+    middleware = K2hr3AuthMiddleware(
+        myhttp,
+        lambda: manager.get_token("demo", iaas_token="gAAAAA..."),
+        lambda: manager.renew_token("demo", iaas_token="gAAAAA..."))
+    resp = middleware.send(K2hr3Role(r3token).get("myrole").build_request(
+        K2hr3HTTPMethod.GET))
+
+"""
+
+from collections import OrderedDict
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple, Union
+
+from k2hr3client.api import (K2hr3ApiResponse, K2hr3HTTPMethod, K2hr3Request,
+                             json_headers)
+from k2hr3client.cache import K2hr3CacheStats, K2hr3ExpiringCache
+from k2hr3client.cache import parse_expire, token_digest
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client.http import K2hr3Http
+from k2hr3client.model import K2hr3RoleTokenModel, K2hr3TokenModel
+from k2hr3client.store import K2hr3TokenStore
+from k2hr3client.token import K2hr3AuthType, K2hr3RoleToken, K2hr3Token
+
+LOG = logging.getLogger(__name__)
+
+# NOTE: K2HR3 returns no expire of a scoped token by default.
+DEFAULT_TOKEN_TTL_SECONDS = 3600
+DEFAULT_REFRESH_AHEAD_SECONDS = 300
+# NOTE: K2HR3 uses the default expire of a role token if the expire is 0.
+DEFAULT_ROLE_TOKEN_TTL_SECONDS = 3600
+DEFAULT_VALID_TTL_SECONDS = 60
+DEFAULT_INVALID_TTL_SECONDS = 10
+# NOTE: the codes that mean the token is invalid.
+_INVALID_TOKEN_CODES = (401, 403, 404)
+# NOTE: the codes that mean the token may have expired.
+_REJECTED_TOKEN_CODES = (401, 403)
+
+
+def _call_store(method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Call a method of a token store and return None if it failed.
+
+    The store is optional, so a token is got from the server if the store
+    could not be used.
+    """
+    try:
+        return method(*args, **kwargs)
+    except K2hr3Exception as error:
+        LOG.warning('ignored the token store, %s', error)
+        return None
+
+
+class K2hr3TokenManager():
+    """Manage the scoped K2HR3 tokens.
+
+    A token is cached for each endpoint, project and identity until it
+    expires and is refreshed in background shortly before the expiry. The
+    identity is the digest of the OpenStack token, the user, or the callable
+    that returns the OpenStack token if no user is given. Concurrent requests
+    of a token are collapsed into one request.
+    """
+
+    __slots__ = ('_http', '_cache', '_ttl', '_clock', '_store',
+                 '_refresh_ahead', '_maxsize', '_keys', '_lock')
+
+    def __init__(self, r3http: K2hr3Http,  # pylint: disable=too-many-arguments # noqa
+                 ttl: float = DEFAULT_TOKEN_TTL_SECONDS,
+                 refresh_ahead: float = DEFAULT_REFRESH_AHEAD_SECONDS,
+                 maxsize: int = 1024,
+                 clock: Callable[[], float] = time.time,
+                 store: Optional[K2hr3TokenStore] = None) -> None:
+        """Init the members.
+
+        :param r3http: the http client of the K2HR3 API server
+        :type r3http: K2hr3Http
+        :param ttl: the seconds a token is valid if the server returns no
+                    expire
+        :type ttl: float
+        :param refresh_ahead: the seconds before the expiry to refresh
+        :type refresh_ahead: float
+        :param maxsize: the max number of tokens
+        :type maxsize: int
+        :param store: the on-disk store to share tokens with other processes
+        :type store: K2hr3TokenStore
+        """
+        self._http = r3http
+        self._ttl = ttl
+        self._clock = clock
+        self._store = store
+        self._refresh_ahead = refresh_ahead
+        self._maxsize = maxsize
+        self._cache = K2hr3ExpiringCache(maxsize=maxsize,
+                                         refresh_ahead=refresh_ahead,
+                                         clock=clock)
+        # NOTE: the cache key -> (project, user, the user in the store) of
+        # the tokens of this manager, the least recently used first.
+        self._keys = OrderedDict()  # type: OrderedDict[Tuple, Tuple[str, str, Optional[str]]] # noqa
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3TokenManager baseurl={self._http.baseurl!r} ' \
+               f'size={len(self._cache)}>'
+
+    @property
+    def stats(self) -> K2hr3CacheStats:
+        """Return the cache statistics."""
+        return self._cache.stats
+
+    def _key(self, project: str,
+             iaas_token: Union[str, Callable[[], str], None],
+             user: Optional[str]) -> Tuple[Tuple, Optional[str]]:
+        """Return the cache key and the user in the store of an identity.
+
+        A token of a callable without a user is not stored, because the
+        callable has no identity that other processes share.
+        """
+        if isinstance(iaas_token, str):
+            store_user = \
+                'iaas:' + token_digest(iaas_token)  # type: Optional[str]
+            identity = ('iaas', store_user)  # type: Tuple
+        elif callable(iaas_token) and not user:
+            store_user = None
+            identity = ('callable', iaas_token)
+        else:
+            store_user = user or ''
+            identity = ('user', store_user)
+        key = (self._http.baseurl, project) + identity
+        with self._lock:
+            self._keys[key] = (project, user or '', store_user)
+            self._keys.move_to_end(key)
+            while len(self._keys) > self._maxsize:
+                self._keys.popitem(last=False)
+        return key, store_user
+
+    def get_token(self, project: str,
+                  iaas_token: Union[str, Callable[[], str], None] = None,
+                  user: Optional[str] = None,
+                  password: Optional[str] = None) -> str:
+        """Return a valid scoped K2HR3 token.
+
+        The token is created by the OpenStack token or by the user and the
+        password. A callable that returns an OpenStack token is called when
+        the token is created or refreshed. Pass the user with a callable to
+        share the token with other processes through the store.
+
+        :param project: the project(K2HR3 tenant) name
+        :type project: str
+        :param iaas_token: the OpenStack token or a callable that returns it
+        :param user: the user name
+        :type user: str
+        :param password: the password of the user
+        :type password: str
+        :raise K2hr3Exception: if the server does not create a token.
+        """
+        if iaas_token is None and not (user and password):
+            raise K2hr3Exception('iaas_token or user and password required')
+        key, store_user = self._key(project, iaas_token, user)
+
+        def loader():
+            return self._create_token(project, iaas_token, user, password,
+                                      store_user)
+        return self._cache.get(key, loader)
+
+    def invalidate(self, project: Optional[str] = None,
+                   user: Optional[str] = None,
+                   iaas_token: Union[str, Callable[[], str], None] = None
+                   ) -> None:
+        """Remove the tokens of this manager.
+
+        All tokens are removed if the project is None. Otherwise the tokens
+        of the project and the user are removed, only the one of the
+        OpenStack token if it is given. The tokens are removed from the store
+        too, and the tokens of other managers in the store are kept.
+        """
+        if project is not None and iaas_token is not None:
+            keys = dict([self._key(project, iaas_token, user)])
+            with self._lock:
+                for key in keys:
+                    self._keys.pop(key, None)
+        else:
+            with self._lock:
+                keys = {key: val[2] for key, val in self._keys.items()
+                        if project is None or val[:2] == (project, user or '')}
+                for key in keys:
+                    del self._keys[key]
+        for key, store_user in keys.items():
+            self._cache.invalidate(key)
+            if self._store is not None and store_user is not None:
+                _call_store(self._store.delete, str(self._http.baseurl),
+                            key[1], store_user)
+
+    def renew_token(self, project: str,
+                    iaas_token: Union[str, Callable[[], str], None] = None,
+                    user: Optional[str] = None,
+                    password: Optional[str] = None) -> str:
+        """Create a new token even if a cached token exists.
+
+        Call this method when the server rejected the cached token.
+
+        :raise K2hr3Exception: if the server does not create a token.
+        """
+        self.invalidate(project, user, iaas_token)
+        return self.get_token(project, iaas_token, user, password)
+
+    def _create_token(self, project: str,  # pylint: disable=too-many-arguments # noqa
+                      iaas_token: Union[str, Callable[[], str], None],
+                      user: Optional[str],
+                      password: Optional[str],
+                      store_user: Optional[str]) -> Tuple[str, float]:
+        """Create a token and return it with the expiry."""
+        if self._store is not None and store_user is not None:
+            stored = _call_store(self._store.get, str(self._http.baseurl),
+                                 project, store_user,
+                                 min_ttl=self._refresh_ahead)
+            if stored is not None:
+                LOG.debug('reused a stored token of %s', project)
+                return stored
+        if callable(iaas_token):
+            iaas_token = iaas_token()
+        if iaas_token is not None:
+            r3token = K2hr3Token(project, iaas_token)
+        else:
+            r3token = K2hr3Token(project, None,
+                                 auth_type=K2hr3AuthType.CREDENTIAL)
+        request = r3token.create(user, password).build_request(
+            K2hr3HTTPMethod.POST)
+        now = self._clock()
+        resp = self._http.send(request)
+        if resp.code >= 400:
+            raise K2hr3Exception(
+                f'could not create a token of {project}, code {resp.code}')
+        model = K2hr3TokenModel.from_response(resp)
+        if not model.token:
+            raise K2hr3Exception(f'no token of {project} in the response')
+        expires_at = parse_expire(model.expire)
+        if expires_at is None:
+            expires_at = now + self._ttl
+        LOG.debug('created a token of %s, expires at %s', project, expires_at)
+        if self._store is not None and store_user is not None:
+            _call_store(self._store.put, str(self._http.baseurl), project,
+                        store_user, model.token, expires_at)
+        return model.token, expires_at
+
+
+class K2hr3RoleTokenCache():
+    """Cache the role tokens.
+
+    A role token is cached for each K2HR3 token, role and requested expire,
+    and is refreshed in background shortly before it expires. Concurrent
+    requests of a role token are collapsed into one request.
+    """
+
+    __slots__ = ('_http', '_cache', '_ttl', '_clock', '_store',
+                 '_refresh_ahead')
+
+    def __init__(self, r3http: K2hr3Http,  # pylint: disable=too-many-arguments # noqa
+                 ttl: float = DEFAULT_ROLE_TOKEN_TTL_SECONDS,
+                 refresh_ahead: float = DEFAULT_REFRESH_AHEAD_SECONDS,
+                 maxsize: int = 1024,
+                 clock: Callable[[], float] = time.time,
+                 store: Optional[K2hr3TokenStore] = None) -> None:
+        """Init the members.
+
+        :param r3http: the http client of the K2HR3 API server
+        :type r3http: K2hr3Http
+        :param ttl: the seconds a role token is valid if the expire is 0
+        :type ttl: float
+        :param refresh_ahead: the seconds before the expiry to refresh
+        :type refresh_ahead: float
+        :param maxsize: the max number of role tokens
+        :type maxsize: int
+        :param store: the on-disk store to share tokens with other processes
+        :type store: K2hr3TokenStore
+        """
+        self._http = r3http
+        self._ttl = ttl
+        self._clock = clock
+        self._store = store
+        self._refresh_ahead = refresh_ahead
+        self._cache = K2hr3ExpiringCache(maxsize=maxsize,
+                                         refresh_ahead=refresh_ahead,
+                                         clock=clock)
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3RoleTokenCache baseurl={self._http.baseurl!r} ' \
+               f'size={len(self._cache)}>'
+
+    @property
+    def stats(self) -> K2hr3CacheStats:
+        """Return the cache statistics."""
+        return self._cache.stats
+
+    def _key(self, r3token: str, role: str, expire: int) -> Tuple:
+        return (self._http.baseurl, token_digest(r3token), role, expire)
+
+    def get(self, r3token: str, role: str,
+            expire: int = 0) -> K2hr3RoleTokenModel:
+        """Return the response of a valid role token.
+
+        :param r3token: the K2HR3 token
+        :type r3token: str
+        :param role: the role path
+        :type role: str
+        :param expire: the seconds the role token is valid, 0 is the default
+        :type expire: int
+        :raise K2hr3Exception: if the server does not return a role token.
+        """
+        def loader():
+            return self._get_role_token(r3token, role, expire)
+        return self._cache.get(self._key(r3token, role, expire), loader)
+
+    def get_role_token(self, r3token: str, role: str,
+                       expire: int = 0) -> str:
+        """Return a valid role token."""
+        return self.get(r3token, role, expire).token  # type: ignore
+
+    def get_registerpath(self, r3token: str, role: str,
+                         expire: int = 0) -> str:
+        """Return the registerpath of a valid role token."""
+        return self.get(r3token, role, expire).registerpath  # type: ignore
+
+    def invalidate(self, r3token: Optional[str] = None,
+                   role: Optional[str] = None, expire: int = 0) -> None:
+        """Remove a role token or all role tokens if the r3token is None.
+
+        The role token is removed from the store too.
+        """
+        if r3token is None or role is None:
+            self._cache.invalidate()
+        else:
+            self._cache.invalidate(self._key(r3token, role, expire))
+            if self._store is not None:
+                _call_store(self._store.delete, str(self._http.baseurl),
+                            role, token_digest(r3token),
+                            f'roletoken:{expire}')
+
+    def _get_role_token(self, r3token: str, role: str,
+                        expire: int) -> Tuple[K2hr3RoleTokenModel, float]:
+        """Get a role token and return it with the expiry."""
+        if self._store is not None:
+            stored = _call_store(self._store.get, str(self._http.baseurl),
+                                 role, token_digest(r3token),
+                                 f'roletoken:{expire}',
+                                 min_ttl=self._refresh_ahead)
+            if stored is not None:
+                LOG.debug('reused a stored role token of %s', role)
+                return K2hr3RoleTokenModel(data=stored[0]), stored[1]
+        request = K2hr3RoleToken(r3token, role, expire).build_request(
+            K2hr3HTTPMethod.GET)
+        now = self._clock()
+        resp = self._http.send(request)
+        if resp.code >= 400:
+            raise K2hr3Exception(
+                f'could not get a role token of {role}, code {resp.code}')
+        model = K2hr3RoleTokenModel.from_response(resp)
+        if not model.token:
+            raise K2hr3Exception(f'no role token of {role} in the response')
+        LOG.debug('got a role token of %s', role)
+        expires_at = now + (expire if expire > 0 else self._ttl)
+        if self._store is not None:
+            _call_store(self._store.put, str(self._http.baseurl), role,
+                        token_digest(r3token),
+                        {'token': model.token,
+                         'registerpath': model.registerpath},
+                        expires_at, f'roletoken:{expire}')
+        return model, expires_at
+
+
+class K2hr3TokenValidator():
+    """Cache the results of the K2HR3 token validation.
+
+    A valid token is cached for the positive TTL and an invalid token for the
+    negative TTL. The cache keys are the digests of the tokens, so the tokens
+    are not kept in memory.
+    """
+
+    __slots__ = ('_http', '_cache', '_valid_ttl', '_invalid_ttl', '_clock')
+
+    def __init__(self, r3http: K2hr3Http,
+                 valid_ttl: float = DEFAULT_VALID_TTL_SECONDS,
+                 invalid_ttl: float = DEFAULT_INVALID_TTL_SECONDS,
+                 maxsize: int = 10000,
+                 clock: Callable[[], float] = time.time) -> None:
+        """Init the members.
+
+        :param r3http: the http client of the K2HR3 API server
+        :type r3http: K2hr3Http
+        :param valid_ttl: the seconds a valid token is cached
+        :type valid_ttl: float
+        :param invalid_ttl: the seconds an invalid token is cached
+        :type invalid_ttl: float
+        :param maxsize: the max number of tokens
+        :type maxsize: int
+        """
+        self._http = r3http
+        self._valid_ttl = valid_ttl
+        self._invalid_ttl = invalid_ttl
+        self._clock = clock
+        self._cache = K2hr3ExpiringCache(maxsize=maxsize, refresh_ahead=0,
+                                         background=False, clock=clock)
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3TokenValidator baseurl={self._http.baseurl!r} ' \
+               f'size={len(self._cache)}>'
+
+    @property
+    def stats(self) -> K2hr3CacheStats:
+        """Return the cache statistics."""
+        return self._cache.stats
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the ratio of cache hits to all validations."""
+        return self._cache.stats.hit_rate
+
+    def is_valid(self, r3token: str) -> bool:
+        """Return True if the K2HR3 token is valid.
+
+        :raise K2hr3Exception: if the server could not validate the token.
+        """
+        def loader():
+            return self._validate(r3token)
+        return self._cache.get(token_digest(r3token), loader)
+
+    def invalidate(self, r3token: Optional[str] = None) -> None:
+        """Forget the result of a token or all tokens if it is None."""
+        self._cache.invalidate(
+            None if r3token is None else token_digest(r3token))
+
+    def revoke(self, r3token: str) -> None:
+        """Regard a token as invalid until the positive TTL passes.
+
+        A validation in progress does not overwrite the revocation.
+        """
+        key = token_digest(r3token)
+        self._cache.invalidate(key)
+        self._cache.put(key, False, self._clock() + self._valid_ttl)
+
+    def _validate(self, r3token: str) -> Tuple[bool, float]:
+        """Validate a token and return the result with the expiry."""
+        mytoken = K2hr3Token(None, None, auth_type=K2hr3AuthType.CREDENTIAL)
+        mytoken.headers = json_headers(f'U={r3token}')
+        request = mytoken.validate().build_request(K2hr3HTTPMethod.HEAD)
+        now = self._clock()
+        resp = self._http.send(request)
+        if resp.code < 400:
+            return True, now + self._valid_ttl
+        if resp.code in _INVALID_TOKEN_CODES:
+            return False, now + self._invalid_ttl
+        raise K2hr3Exception(f'could not validate a token, code {resp.code}')
+
+
+class K2hr3AuthMiddleware():
+    """Send requests with a valid scoped token.
+
+    The x-auth-token header of a scoped token(U=) is rewritten with the
+    current token. If the server rejects the token, one new token is got for
+    all waiting callers and the requests are sent again. A request whose body
+    is streamed from an iterable is not sent again, because the body has been
+    consumed.
+    """
+
+    __slots__ = ('_http', '_get_token', '_renew_token', '_validator',
+                 '_cond', '_token', '_generation', '_renewing', '_attempt',
+                 '_failed')
+
+    def __init__(self, r3http: K2hr3Http, get_token: Callable[[], str],
+                 renew_token: Optional[Callable[[], str]] = None,
+                 validator: Optional[K2hr3TokenValidator] = None) -> None:
+        """Init the members.
+
+        :param r3http: the http client of the K2HR3 API server
+        :type r3http: K2hr3Http
+        :param get_token: the function that returns a token
+        :param renew_token: the function that returns a new token, default
+                            is get_token
+        :param validator: the validator to tell an expired token from a
+                          forbidden request on 403
+        :type validator: K2hr3TokenValidator
+        """
+        self._http = r3http
+        self._get_token = get_token
+        self._renew_token = renew_token or get_token
+        self._validator = validator
+        self._cond = threading.Condition()
+        self._token = None  # type: Optional[str]
+        self._generation = 0
+        self._renewing = False
+        self._attempt = 0
+        # NOTE: the attempt that failed to get a token.
+        self._failed = 0
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3AuthMiddleware baseurl={self._http.baseurl!r} ' \
+               f'generation={self._generation}>'
+
+    @property
+    def baseurl(self) -> Optional[str]:
+        """Return the url of the K2HR3 API server."""
+        return self._http.baseurl
+
+    def _acquire(self, rejected: Optional[int]) -> Tuple[str, int]:
+        """Return the current token or a new token if it was rejected."""
+        waited = None
+        with self._cond:
+            while True:
+                if self._token is not None and rejected != self._generation:
+                    return self._token, self._generation
+                if waited is not None and waited == self._failed:
+                    # NOTE: the waiting callers share the failure.
+                    raise K2hr3Exception('could not get a token')
+                if not self._renewing:
+                    self._renewing = True
+                    self._attempt += 1
+                    attempt = self._attempt
+                    break
+                waited = self._attempt
+                self._cond.wait()
+        try:
+            if self._token is None:
+                token = self._get_token()
+            else:
+                token = self._renew_token()
+        except Exception:
+            with self._cond:
+                self._failed = attempt
+                self._renewing = False
+                self._cond.notify_all()
+            raise
+        with self._cond:
+            self._token = token
+            self._generation += 1
+            self._renewing = False
+            self._cond.notify_all()
+            return token, self._generation
+
+    @staticmethod
+    def _with_token(request: K2hr3Request, token: str) -> K2hr3Request:
+        """Return the request whose scoped token is replaced."""
+        auth = request.headers.get('x-auth-token')
+        if not auth or not auth.startswith('U=') or auth == f'U={token}':
+            return request
+        headers = dict(request.headers)
+        headers['x-auth-token'] = f'U={token}'
+        return K2hr3Request(request.method, request.path, request.urlparams,
+                            headers, request.body)
+
+    def _rejected(self, resp: K2hr3ApiResponse, token: str) -> bool:
+        """Return True if the server rejected the token."""
+        if resp.code not in _REJECTED_TOKEN_CODES:
+            return False
+        if resp.code == 403 and self._validator is not None:
+            # NOTE: a valid token is forbidden by the policies.
+            self._validator.invalidate(token)
+            return not self._validator.is_valid(token)
+        return True
+
+    def send(self, request: K2hr3Request) -> K2hr3ApiResponse:
+        """Send a request with the current token and return the response.
+
+        The request is sent again with a new token once if the server
+        rejects the token. If the body is not a str or bytes, a new token is
+        got for the next requests and the response of the rejected token is
+        returned.
+
+        :raise K2hr3Exception: if the server could not be reached or a token
+                               could not be got.
+        """
+        auth = request.headers.get('x-auth-token')
+        if not auth or not auth.startswith('U='):
+            return self._http.send(request)
+        token, generation = self._acquire(None)
+        resp = self._http.send(self._with_token(request, token))
+        if not self._rejected(resp, token):
+            return resp
+        LOG.info('the token was rejected, code %s. renewing it.', resp.code)
+        token, _ = self._acquire(generation)
+        if request.body is not None and \
+                not isinstance(request.body, (str, bytes)):
+            LOG.warning('could not send the streamed body of %s again',
+                        request.path)
+            return resp
+        return self._http.send(self._with_token(request, token))
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
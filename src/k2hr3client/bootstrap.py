@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""K2HR3 Python Client of the authentication bootstrap.
+
+The bootstrap gets an OpenStack token, a K2HR3 token, and the role tokens and
+the role token lists of several roles. The requests of the roles are sent
+concurrently on the pooled connections.
+
+.. code-block:: python
+
+    # Import modules from k2hr3client package.
+    from k2hr3client.bootstrap import K2hr3Bootstrap
+
+    bootstrap = K2hr3Bootstrap("http://127.0.0.1:18080",
+                               "http://127.0.0.1/identity/v3/auth/tokens")
+    result = bootstrap.run("demo", ["role1", "role2"],
+                           user="demo", password="password")
+    result.role_tokens["role1"].token  // role token
+    result.registerpath("role1")  // registerpath of the role token
+    result.timings  // {'openstack_token': 0.1, 'k2hr3_token': 0.05, ...}
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from k2hr3client.api import K2hr3HTTPMethod
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client.http import K2hr3ConnectionPool, K2hr3Http
+from k2hr3client.model import (K2hr3RoleTokenListModel, K2hr3RoleTokenModel,
+                               K2hr3TokenModel)
+from k2hr3client.token import K2hr3RoleToken, K2hr3RoleTokenList, K2hr3Token
+
+LOG = logging.getLogger(__name__)
+
+
+class K2hr3BootstrapResult():
+    """Represent the tokens that the bootstrap got."""
+
+    __slots__ = ('openstack_token', 'r3token', 'role_tokens', 'token_lists',
+                 'timings')
+
+    def __init__(self) -> None:
+        """Init the members."""
+        self.openstack_token = None  # type: Optional[str]
+        self.r3token = None  # type: Optional[str]
+        self.role_tokens = {}  # type: Dict[str, K2hr3RoleTokenModel]
+        self.token_lists = {}  # type: Dict[str, K2hr3RoleTokenListModel]
+        # NOTE: the seconds each stage took.
+        self.timings = {}  # type: Dict[str, float]
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3BootstrapResult roles={sorted(self.role_tokens)!r} ' \
+               f'timings={self.timings!r}>'
+
+    def registerpath(self, role: str) -> Optional[str]:
+        """Return the registerpath of the role token of the role."""
+        role_token = self.role_tokens.get(role)
+        if role_token is None:
+            return None
+        if role_token.registerpath:
+            return role_token.registerpath
+        token_list = self.token_lists.get(role)
+        if token_list is None or role_token.token is None:
+            return None
+        return token_list.registerpath(role_token.token)
+
+
+class K2hr3Bootstrap():
+    """Get the tokens to use K2HR3 roles.
+
+    The connections to the identity server and the K2HR3 API server are kept
+    alive in a connection pool and reused.
+    """
+
+    __slots__ = ('_http', '_pool', '_identity_url', '_max_workers', '_clock')
+
+    def __init__(self, baseurl: str, identity_url: Optional[str] = None,
+                 max_workers: int = 8,
+                 pool: Optional[K2hr3ConnectionPool] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """Init the members.
+
+        :param baseurl: the url of the K2HR3 API server
+        :type baseurl: str
+        :param identity_url: the url of the OpenStack identity token API
+        :type identity_url: str
+        :param max_workers: the max number of concurrent requests
+        :type max_workers: int
+        :param pool: the connection pool, a new pool is used by default
+        :type pool: K2hr3ConnectionPool
+        """
+        self._pool = pool or K2hr3ConnectionPool(maxsize=max_workers)
+        self._http = K2hr3Http(baseurl, self._pool)
+        self._identity_url = identity_url
+        self._max_workers = max_workers
+        self._clock = clock
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3Bootstrap baseurl={self._http.baseurl!r} ' \
+               f'identity_url={self._identity_url!r}>'
+
+    def close(self) -> None:
+        """Close the idle connections."""
+        self._pool.close()
+
+    def run(self, project: str, roles: Iterable[str],  # pylint: disable=too-many-arguments # noqa
+            iaas_token: Optional[str] = None, user: Optional[str] = None,
+            password: Optional[str] = None, expire: int = 0,
+            token_list: bool = True) -> K2hr3BootstrapResult:
+        """Get the tokens of the roles.
+
+        The OpenStack token is got from the identity server by the user and
+        the password unless the iaas_token is given.
+
+        :param project: the project(K2HR3 tenant) name
+        :type project: str
+        :param roles: the role paths
+        :param iaas_token: the scoped OpenStack token
+        :type iaas_token: str
+        :param expire: the expire of the role tokens
+        :type expire: int
+        :param token_list: get the role token lists if True
+        :type token_list: bool
+        :raise K2hr3Exception: if a token could not be got.
+        """
+        result = K2hr3BootstrapResult()
+
+        # 1. Gets a openstack token id from openstack identity server
+        started = self._clock()
+        if iaas_token is None:
+            if not (self._identity_url and user and password):
+                raise K2hr3Exception(
+                    'iaas_token or identity_url, user and password required')
+            iaas_token = K2hr3Token.get_openstack_token(
+                self._identity_url, user, password, project, pool=self._pool)
+            if not iaas_token:
+                raise K2hr3Exception(f'no openstack token of {project}')
+            result.timings['openstack_token'] = self._clock() - started
+        result.openstack_token = iaas_token
+
+        # 2. Gets a k2hr3 token from the openstack token
+        started = self._clock()
+        resp = self._http.send(K2hr3Token(project, iaas_token).create()
+                               .build_request(K2hr3HTTPMethod.POST))
+        if resp.code >= 400:
+            raise K2hr3Exception(
+                f'could not create a token of {project}, code {resp.code}')
+        result.r3token = K2hr3TokenModel.from_response(resp).token
+        if not result.r3token:
+            raise K2hr3Exception(f'no token of {project} in the response')
+        result.timings['k2hr3_token'] = self._clock() - started
+
+        # 3. Gets the role tokens and the role token lists concurrently
+        started = self._clock()
+        roles = list(roles)
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            role_futures = {role: executor.submit(
+                self._get, K2hr3RoleToken(result.r3token, role, expire),
+                K2hr3RoleTokenModel) for role in roles}
+            list_futures = {}
+            if token_list:
+                list_futures = {role: executor.submit(
+                    self._get,
+                    K2hr3RoleTokenList(result.r3token, role, True),
+                    K2hr3RoleTokenListModel) for role in roles}
+            for role, future in role_futures.items():
+                result.role_tokens[role] = future.result()
+            result.timings['role_tokens'] = self._clock() - started
+            for role, future in list_futures.items():
+                result.token_lists[role] = future.result()
+            if token_list:
+                result.timings['role_token_lists'] = self._clock() - started
+        LOG.debug('bootstrap %s timings %s', project, result.timings)
+        return result
+
+    def _get(self, r3api, model):
+        """GET a request of the API and return the model of the response."""
+        resp = self._http.send(r3api.build_request(K2hr3HTTPMethod.GET))
+        if resp.code >= 400:
+            raise K2hr3Exception(
+                f'could not get {type(r3api).__name__} of {r3api.role}, '
+                f'code {resp.code}')
+        return model.from_response(resp)
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
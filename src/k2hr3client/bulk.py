@@ -0,0 +1,596 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""K2HR3 Python Client of the bulk operations.
+
+The requests of a bulk operation are sent concurrently. The result holds the
+succeeded items and the failed items.
+
+.. code-block:: python
+
+    # Import modules from k2hr3client package.
+    from k2hr3client.bulk import prune_role_tokens
+    from k2hr3client.http import K2hr3Http
+    from k2hr3client.token import K2hr3RoleTokenList
+
+    myhttp = K2hr3Http("http://127.0.0.1:18080")
+    mylist = K2hr3RoleTokenList("gAAAAA...", "myrole", True)
+    myhttp.GET(mylist)
+
+    # DELETE the expired role tokens concurrently.
+    result = prune_role_tokens(myhttp, "gAAAAA...", mylist.index)
+    result.succeeded  // {'roletoken1': None, ...}
+    result.failed  // {}
+
+    # Add hosts to a role by the chunks of 100 hosts.
+    hosts = [K2hr3RoleHost("10.0.0.1", "0", "", "", "", "", ""), ...]
+    result = add_role_members(myhttp, "gAAAAA...", "myrole", hosts)
+    result.succeeded  // {('10.0.0.1', '0', ''): None, ...}
+
+    # Show the changes to make the members of a role the hosts.
+    plan = reconcile_role_members(myhttp, "gAAAAA...", "myrole", hosts,
+                                  dry_run=True)
+    plan.as_dict()  // {'role': 'myrole', 'add': [...], 'remove': [...]}
+
+    # Issue the role tokens of the containers and register them.
+    specs = [("myrole", 8080, "container1", "", "", "", ""), ...]
+    result = issue_role_tokens(myhttp, "gAAAAA...", specs, max_workers=16)
+    role_tokens_cloud_config(result.succeeded.values())
+    // {'write_files': [{'path': '/etc/k2hr3/roletokens.json', ...}]}
+
+    # Get the resources concurrently in 5 seconds.
+    resources = get_resources(myhttp, ["cluster1", "cluster2"],
+                              r3token="gAAAAA...", timeout=5)
+    resources["cluster1"].data  // the resource data or a K2hr3Exception
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import json
+import logging
+import time
+from typing import (Any, Callable, Dict, Hashable, Iterable, List, Optional,
+                    Tuple, Union)
+
+from k2hr3client.api import K2hr3Api, K2hr3ApiResponse, K2hr3HTTPMethod
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client.http import K2hr3Http
+from k2hr3client.model import (K2hr3ResourceModel, K2hr3RoleModel,
+                               K2hr3RoleTokenModel)
+from k2hr3client.resource import K2hr3Resource
+from k2hr3client.role import (K2hr3Role, K2hr3RoleHost, K2hr3TokenType,
+                              role_host_to_dict)
+from k2hr3client.token import K2hr3RoleToken, K2hr3RoleTokenIndex
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_CHUNK_SIZE = 100
+DEFAULT_ROLE_TOKENS_PATH = '/etc/k2hr3/roletokens.json'
+
+
+class K2hr3BulkResult():
+    """Represent the result of a bulk operation."""
+
+    __slots__ = ('succeeded', 'failed')
+
+    def __init__(self) -> None:
+        """Init the members."""
+        # NOTE: item -> the value that the operation returned.
+        self.succeeded = {}  # type: Dict[Hashable, Any]
+        # NOTE: item -> the error message.
+        self.failed = {}  # type: Dict[Hashable, str]
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3BulkResult succeeded={len(self.succeeded)} ' \
+               f'failed={len(self.failed)}>'
+
+    @property
+    def ok(self) -> bool:  # pylint: disable=invalid-name
+        """Return True if no item failed."""
+        return not self.failed
+
+
+def run_bulk(items: Iterable[Hashable], func: Callable[[Hashable], Any],
+             max_workers: int = DEFAULT_MAX_WORKERS,
+             timeout: Optional[float] = None) -> K2hr3BulkResult:
+    """Call the function for the items concurrently.
+
+    The results are ordered as the items. An item whose call raises an
+    exception is failed. The items that are not done in the timeout are
+    failed and the calls that are not started are cancelled. The calls that
+    are running are not waited for.
+
+    :param items: the items
+    :param func: the function called with an item
+    :param max_workers: the max number of concurrent calls
+    :type max_workers: int
+    :param timeout: the seconds to wait for all calls, no limit by default
+    :type timeout: float
+    :returns: the result
+    :rtype: K2hr3BulkResult
+    """
+    result = K2hr3BulkResult()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [(item, executor.submit(func, item)) for item in items]
+        for item, future in futures:
+            remaining = None if deadline is None else \
+                max(deadline - time.monotonic(), 0)
+            try:
+                result.succeeded[item] = future.result(remaining)
+            except FutureTimeoutError as error:
+                # NOTE: The TimeoutError of the function is an OSError.
+                if future.done():
+                    LOG.error('bulk operation of %s failed, %s', item, error)
+                    result.failed[item] = str(error)
+                else:
+                    future.cancel()
+                    result.failed[item] = 'deadline exceeded'
+            except (K2hr3Exception, OSError) as error:
+                LOG.error('bulk operation of %s failed, %s', item, error)
+                result.failed[item] = str(error)
+            except Exception as error:  # pylint: disable=broad-except
+                # NOTE: An unexpected error of an item, like a broken
+                # response body, does not discard the results of the others.
+                LOG.exception('bulk operation of %s failed', item)
+                result.failed[item] = f'{type(error).__name__}: {error}'
+    finally:
+        executor.shutdown(wait=deadline is None, cancel_futures=True)
+    return result
+
+
+def send_api(r3http: K2hr3Http, r3api: K2hr3Api, method: K2hr3HTTPMethod,
+             allowed_codes: Iterable[int] = ()) -> K2hr3ApiResponse:
+    """Send a request of the API and return the response.
+
+    :raise K2hr3Exception: if the server returns an error that is not allowed.
+    """
+    resp = r3http.send(r3api.build_request(method))
+    if resp.code >= 400 and resp.code not in allowed_codes:
+        raise K2hr3Exception(
+            f'{method.name} {type(r3api).__name__} failed, code {resp.code}')
+    return resp
+
+
+def prune_role_tokens(r3http: K2hr3Http, r3token: str,
+                      index: K2hr3RoleTokenIndex,
+                      now: Optional[float] = None,
+                      max_workers: int = DEFAULT_MAX_WORKERS
+                      ) -> K2hr3BulkResult:
+    """Delete the expired role tokens concurrently.
+
+    A role token that has already been deleted is regarded as succeeded.
+
+    :param r3http: the http client of the K2HR3 API server
+    :type r3http: K2hr3Http
+    :param r3token: the K2HR3 token
+    :type r3token: str
+    :param index: the index of the role tokens
+    :type index: K2hr3RoleTokenIndex
+    :param now: the epoch seconds, default is the current time
+    :type now: float
+    :returns: the result keyed by the role tokens
+    :rtype: K2hr3BulkResult
+    """
+    def delete(token):
+        myrole = K2hr3Role(r3token).delete_roletoken_with_string(token)
+        send_api(r3http, myrole, K2hr3HTTPMethod.DELETE, allowed_codes=(404,))
+
+    return run_bulk(index.expired(now), delete, max_workers)
+
+
+def role_host_key(host: K2hr3RoleHost) -> Tuple[str, str, str]:
+    """Return the key that identifies a host of a role.
+
+    K2HR3 identifies a host of a role by the hostname or the ip address, the
+    port and the cuk. The values are compared as strings.
+    """
+    return tuple('' if val is None else str(val)  # type: ignore[return-value]
+                 for val in (host.host, host.port, host.cuk))
+
+
+def _chunks(items: List[Any], size: int) -> List[Tuple[Any, ...]]:
+    """Split the items into the tuples of the size."""
+    if size < 1:
+        raise K2hr3Exception(f'chunk size must be positive, not {size}')
+    return [tuple(items[pos:pos + size]) for pos in range(0, len(items), size)]
+
+
+def add_role_members(r3http: K2hr3Http, r3token: str, role: str,  # pylint: disable=too-many-arguments # noqa
+                     hosts: Iterable[K2hr3RoleHost],
+                     chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     clear_hostname: bool = False, clear_ips: bool = False,
+                     max_workers: int = DEFAULT_MAX_WORKERS
+                     ) -> K2hr3BulkResult:
+    """Add the hosts to the role concurrently.
+
+    The duplicated hosts are removed and the others are split into chunks.
+    Each chunk is added by a request of add_members. Use a K2hr3Http with a
+    K2hr3ConnectionPool to keep the connections alive.
+
+    :param r3http: the http client of the K2HR3 API server
+    :type r3http: K2hr3Http
+    :param r3token: the K2HR3 token
+    :type r3token: str
+    :param role: the role path
+    :type role: str
+    :param hosts: the hosts
+    :param chunk_size: the max number of hosts in a request
+    :type chunk_size: int
+    :returns: the result keyed by role_host_key of the hosts
+    :rtype: K2hr3BulkResult
+    :raise K2hr3Exception: if the chunk size is not positive.
+    """
+    unique = {}  # type: Dict[Tuple[str, str, str], K2hr3RoleHost]
+    for host in hosts:
+        unique.setdefault(role_host_key(host), host)
+
+    chunks = _chunks(list(unique.values()), chunk_size)
+
+    def add(pos):
+        myrole = K2hr3Role(r3token).add_members(
+            role, list(chunks[pos]), clear_hostname, clear_ips)
+        send_api(r3http, myrole, K2hr3HTTPMethod.POST)
+
+    # NOTE: The chunks are identified by the positions in the logs.
+    chunk_result = run_bulk(range(len(chunks)), add, max_workers)
+    result = K2hr3BulkResult()
+    for pos in chunk_result.succeeded:
+        for host in chunks[pos]:
+            result.succeeded[role_host_key(host)] = None
+    for pos, message in chunk_result.failed.items():
+        for host in chunks[pos]:
+            result.failed[role_host_key(host)] = message
+    return result
+
+
+class K2hr3ReconcilePlan():
+    """Represent the changes to make the members of a role the hosts.
+
+    A registered host that has the same key as a desired host is kept even if
+    the other members, like the extra, differ.
+    """
+
+    __slots__ = ('role', 'add', 'remove', 'keep', 'result')
+
+    def __init__(self, role: str) -> None:
+        """Init the members."""
+        self.role = role
+        self.add = []  # type: List[K2hr3RoleHost]
+        self.remove = []  # type: List[K2hr3RoleHost]
+        # NOTE: the number of hosts that are not changed.
+        self.keep = 0
+        # NOTE: None if the plan is not applied.
+        self.result = None  # type: Optional[K2hr3BulkResult]
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3ReconcilePlan role={self.role!r} ' \
+               f'add={len(self.add)} remove={len(self.remove)} ' \
+               f'keep={self.keep}>'
+
+    @property
+    def empty(self) -> bool:
+        """Return True if nothing is changed."""
+        return not (self.add or self.remove)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the plan as a JSON serializable dict."""
+        return {
+            'role': self.role,
+            'add': [role_host_to_dict(host) for host in self.add],
+            'remove': [role_host_to_dict(host) for host in self.remove],
+            'keep': self.keep
+        }
+
+
+def plan_role_members(r3http: K2hr3Http, r3token: str, role: str,
+                      hosts: Iterable[K2hr3RoleHost]) -> K2hr3ReconcilePlan:
+    """Compare the members of the role with the hosts.
+
+    :param r3http: the http client of the K2HR3 API server
+    :type r3http: K2hr3Http
+    :param r3token: the K2HR3 token
+    :type r3token: str
+    :param role: the role path
+    :type role: str
+    :param hosts: the desired hosts
+    :returns: the plan
+    :rtype: K2hr3ReconcilePlan
+    :raise K2hr3Exception: if the role could not be got.
+    """
+    desired = {}  # type: Dict[Tuple[str, str, str], K2hr3RoleHost]
+    for host in hosts:
+        desired.setdefault(role_host_key(host), host)
+    resp = send_api(r3http, K2hr3Role(r3token).get(role, expand=False),
+                    K2hr3HTTPMethod.GET)
+    current = {}  # type: Dict[Tuple[str, str, str], K2hr3RoleHost]
+    for host in K2hr3RoleModel.from_response(resp).hosts:
+        current.setdefault(role_host_key(host), host)
+
+    plan = K2hr3ReconcilePlan(role)
+    plan.add = [host for key, host in desired.items() if key not in current]
+    plan.remove = [host for key, host in current.items()
+                   if key not in desired]
+    plan.keep = len(desired) - len(plan.add)
+    return plan
+
+
+def reconcile_role_members(r3http: K2hr3Http, r3token: str, role: str,  # pylint: disable=too-many-arguments # noqa
+                           hosts: Iterable[K2hr3RoleHost],
+                           dry_run: bool = False,
+                           max_workers: int = DEFAULT_MAX_WORKERS
+                           ) -> K2hr3ReconcilePlan:
+    """Make the members of the role the hosts.
+
+    Only the hosts that are not registered are added and only the registered
+    hosts that are not desired are deleted, concurrently. The result of the
+    plan is keyed by role_host_key of the hosts.
+
+    :param r3http: the http client of the K2HR3 API server
+    :type r3http: K2hr3Http
+    :param r3token: the K2HR3 token
+    :type r3token: str
+    :param role: the role path
+    :type role: str
+    :param hosts: the desired hosts
+    :param dry_run: return the plan without changing the role if True
+    :type dry_run: bool
+    :returns: the plan
+    :rtype: K2hr3ReconcilePlan
+    :raise K2hr3Exception: if the role could not be got.
+    """
+    plan = plan_role_members(r3http, r3token, role, hosts)
+    LOG.info('reconcile %s, dry_run=%s', plan, dry_run)
+    if dry_run or plan.empty:
+        return plan
+
+    changes = {}  # type: Dict[Tuple[str, str, str], Tuple[bool, K2hr3RoleHost]] # noqa
+    for host in plan.add:
+        changes[role_host_key(host)] = (True, host)
+    for host in plan.remove:
+        changes[role_host_key(host)] = (False, host)
+
+    def apply(key):
+        add, host = changes[key]
+        if add:
+            # NOTE: PUT does not send the clear_hostname and the clear_ips.
+            myrole = K2hr3Role(r3token).add_member(role, host, False, False)
+            send_api(r3http, myrole, K2hr3HTTPMethod.PUT)
+        else:
+            myrole = K2hr3Role(r3token).delete_member(
+                role, host.host, host.port, host.cuk)
+            send_api(r3http, myrole, K2hr3HTTPMethod.DELETE,
+                     allowed_codes=(404,))
+
+    plan.result = run_bulk(changes, apply, max_workers)
+    return plan
+
+
+class K2hr3ContainerSpec():  # pylint: disable=too-few-public-methods
+    """Represent a container that joins a role with a role token."""
+
+    __slots__ = ('role', 'port', 'cuk', 'extra', 'tag', 'inboundip',
+                 'outboundip')
+
+    def __init__(self, role: str, port: Any = 0, cuk: str = '',  # pylint: disable=too-many-arguments # noqa
+                 extra: str = '', tag: str = '', inboundip: str = '',
+                 outboundip: str = '') -> None:
+        """Init the members."""
+        self.role = role
+        self.port = port
+        self.cuk = cuk
+        self.extra = extra
+        self.tag = tag
+        self.inboundip = inboundip
+        self.outboundip = outboundip
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3ContainerSpec role={self.role!r} ' \
+               f'port={self.port!r} cuk={self.cuk!r}>'
+
+
+class K2hr3IssuedRoleToken():
+    """Represent a role token that is issued and registered."""
+
+    __slots__ = ('role', 'cuk', 'token', 'registerpath')
+
+    def __init__(self, role: str, cuk: str, token: str,
+                 registerpath: Optional[str]) -> None:
+        """Init the members."""
+        self.role = role
+        self.cuk = cuk
+        self.token = token
+        self.registerpath = registerpath
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        # NOTE: The token is not shown.
+        return f'<K2hr3IssuedRoleToken role={self.role!r} ' \
+               f'cuk={self.cuk!r}>'
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the members as a JSON serializable dict."""
+        return {'role': self.role, 'cuk': self.cuk, 'roletoken': self.token,
+                'registerpath': self.registerpath}
+
+
+def issue_role_tokens(r3http: K2hr3Http, r3token: str,
+                      specs: Iterable[Any], expire: int = 0,
+                      max_workers: int = DEFAULT_MAX_WORKERS
+                      ) -> K2hr3BulkResult:
+    """Issue the role tokens of the containers and register them.
+
+    A spec is a K2hr3ContainerSpec or a tuple of the arguments of it. A role
+    token is got and the container is added to the role with the role token.
+    The role token is deleted if the container could not be added. The
+    max_workers bounds the number of containers in flight.
+
+    :param r3http: the http client of the K2HR3 API server
+    :type r3http: K2hr3Http
+    :param r3token: the K2HR3 token
+    :type r3token: str
+    :param specs: the containers
+    :param expire: the expire of the role tokens
+    :type expire: int
+    :returns: the result keyed by the (role, cuk) pairs, which holds
+              K2hr3IssuedRoleToken
+    :rtype: K2hr3BulkResult
+    """
+    containers = {}  # type: Dict[Tuple[str, str], K2hr3ContainerSpec]
+    for spec in specs:
+        if not isinstance(spec, K2hr3ContainerSpec):
+            spec = K2hr3ContainerSpec(*spec)
+        containers.setdefault((spec.role, spec.cuk), spec)
+
+    def issue(key):
+        spec = containers[key]
+        resp = send_api(r3http, K2hr3RoleToken(r3token, spec.role, expire),
+                        K2hr3HTTPMethod.GET)
+        model = K2hr3RoleTokenModel.from_response(resp)
+        if not model.token:
+            raise K2hr3Exception(f'no role token of {spec.role}')
+        myrole = K2hr3Role(model.token, K2hr3TokenType.ROLE_TOKEN)
+        myrole.add_member_with_roletoken(
+            spec.role, spec.port, spec.cuk, spec.extra, spec.tag,
+            spec.inboundip, spec.outboundip)
+        try:
+            send_api(r3http, myrole, K2hr3HTTPMethod.PUT)
+        except (K2hr3Exception, OSError):
+            try:
+                send_api(r3http, K2hr3Role(r3token)
+                         .delete_roletoken_with_string(model.token),
+                         K2hr3HTTPMethod.DELETE, allowed_codes=(404,))
+            except (K2hr3Exception, OSError) as error:
+                LOG.warning('could not delete the role token of %s, %s',
+                            key, error)
+            raise
+        return K2hr3IssuedRoleToken(spec.role, spec.cuk, model.token,
+                                    model.registerpath)
+
+    return run_bulk(containers, issue, max_workers)
+
+
+def role_tokens_cloud_config(issued: Iterable[K2hr3IssuedRoleToken],
+                             path: str = DEFAULT_ROLE_TOKENS_PATH
+                             ) -> Dict[str, Any]:
+    """Return the cloud-config that writes the role tokens to a file.
+
+    The file is a JSON list of K2hr3IssuedRoleToken.as_dict and only the
+    owner can read it.
+
+    :param issued: the issued role tokens
+    :param path: the file path
+    :type path: str
+    :returns: the cloud-config
+    :rtype: dict
+    """
+    content = json.dumps([token.as_dict() for token in issued], indent=2)
+    return {'write_files': [{'path': path, 'permissions': '0600',
+                             'owner': 'root:root', 'content': content}]}
+
+
+def resource_get_api(path: str, r3token: Optional[str] = None,  # pylint: disable=too-many-arguments # noqa
+                     roletoken: Optional[str] = None,
+                     expand: bool = False, service: Optional[str] = None,
+                     data_type: Optional[str] = None,
+                     keys: Optional[dict] = None) -> K2hr3Resource:
+    """Return a K2hr3Resource that gets a resource.
+
+    K2hr3Resource.get is used with the K2HR3 token and get_with_roletoken is
+    used with the role token.
+
+    :raise K2hr3Exception: if no token is given.
+    """
+    if r3token:
+        return K2hr3Resource(r3token, resource_path=path).get(expand, service)
+    if roletoken:
+        return K2hr3Resource(
+            roletoken=roletoken, resource_path=path).get_with_roletoken(
+                data_type, keys, service)  # type: ignore[arg-type]
+    raise K2hr3Exception('r3token or roletoken required')
+
+
+def get_resources(r3http: K2hr3Http, paths: Iterable[str],  # pylint: disable=too-many-arguments # noqa
+                  r3token: Optional[str] = None,
+                  roletoken: Optional[str] = None,
+                  expand: bool = False, service: Optional[str] = None,
+                  data_type: Optional[str] = None,
+                  keys: Optional[dict] = None,
+                  cache: Any = None,
+                  max_workers: int = DEFAULT_MAX_WORKERS,
+                  timeout: Optional[float] = None
+                  ) -> Dict[str, Union[K2hr3ResourceModel, K2hr3Exception]]:
+    """Get the resources concurrently.
+
+    The resources are got by K2hr3Resource.get with the K2HR3 token or by
+    get_with_roletoken with the role token. The duplicated paths are got
+    once.
+
+    :param r3http: the http client of the K2HR3 API server
+    :type r3http: K2hr3Http
+    :param paths: the resource paths or the YRN full resource paths
+    :param r3token: the K2HR3 token
+    :type r3token: str
+    :param roletoken: the role token used if no K2HR3 token is given
+    :type roletoken: str
+    :param expand: expand the aliases if True, with the K2HR3 token
+    :type expand: bool
+    :param data_type: the data type, with the role token
+    :type data_type: str
+    :param keys: the keys, with the role token
+    :type keys: dict
+    :param cache: a K2hr3ResourceCache to read the resources through
+    :param timeout: the seconds to wait for all resources
+    :type timeout: float
+    :returns: the resources or the errors ordered as the paths
+    :rtype: dict
+    :raise K2hr3Exception: if no token is given.
+    """
+    if not (r3token or roletoken):
+        raise K2hr3Exception('r3token or roletoken required')
+
+    def get(path):
+        myresource = resource_get_api(path, r3token, roletoken, expand,
+                                      service, data_type, keys)
+        if cache is not None:
+            return cache.get(myresource)
+        return K2hr3ResourceModel.from_response(
+            send_api(r3http, myresource, K2hr3HTTPMethod.GET))
+
+    paths = list(dict.fromkeys(paths))
+    result = run_bulk(paths, get, max_workers, timeout)
+    return {path: result.succeeded[path] if path in result.succeeded
+            else K2hr3Exception(result.failed[path]) for path in paths}
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""K2HR3 Python Client of the expiring cache.
+
+.. code-block:: python
+
+    # Import modules from k2hr3client package.
+    import time
+    from k2hr3client.cache import K2hr3ExpiringCache
+
+    mycache = K2hr3ExpiringCache(maxsize=128, refresh_ahead=60)
+
+    # The loader returns the value and the time when the value expires.
+    def loader():
+        return "value", time.time() + 3600
+
+    mycache.get("key", loader)  // loads the value
+    mycache.get("key", loader)  // returns the cached value
+    mycache.stats.hit_rate  // 0.5
+
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timezone
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+LOG = logging.getLogger(__name__)
+
+# NOTE: A loader returns the value and the time(epoch seconds) it expires.
+Loader = Callable[[], Tuple[Any, float]]
+
+
+def parse_expire(val: Any) -> Optional[float]:
+    """Return the epoch seconds of an expire value in a response.
+
+    The value is the epoch seconds or a ISO 8601 date string. A date string
+    without the timezone is regarded as UTC.
+
+    :returns: epoch seconds or None if the value is unknown
+    :rtype: float
+    """
+    if isinstance(val, bool) or val is None:
+        return None
+    if isinstance(val, (int, float)):
+        return float(val)
+    if isinstance(val, str) and val:
+        try:
+            date = datetime.fromisoformat(val.replace('Z', '+00:00'))
+        except ValueError:
+            LOG.debug('unknown expire format %s', val)
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return date.timestamp()
+    return None
+
+
+def token_digest(token: str) -> str:
+    """Return the digest of a token not to keep the token in cache keys."""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+class K2hr3CacheStats():
+    """Count the cache accesses."""
+
+    __slots__ = ('hits', 'misses', 'refreshes', 'errors', 'evictions')
+
+    def __init__(self) -> None:
+        """Init the members."""
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+        self.evictions = 0
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        values = ', '.join([f'{attr}={getattr(self, attr)}'
+                            for attr in self.__slots__])
+        return '<K2hr3CacheStats ' + values + '>'
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the ratio of hits to all accesses."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters as a dict."""
+        stats = {attr: getattr(self, attr) for attr in self.__slots__}
+        stats['hit_rate'] = self.hit_rate
+        return stats
+
+
+class _K2hr3CacheEntry():
+    """Hold a cached value."""
+
+    __slots__ = ('value', 'expires_at', 'refresh_at')
+
+    def __init__(self, value: Any, expires_at: float,
+                 refresh_at: float) -> None:
+        self.value = value
+        self.expires_at = expires_at
+        self.refresh_at = refresh_at
+
+
+class K2hr3ExpiringCache():
+    """Cache values until they expire.
+
+    A value is loaded once even if several threads request it at the same
+    time. A value that is about to expire is refreshed in a background thread
+    while the current value is returned. The least recently used value is
+    evicted if the cache is full.
+    """
+
+    __slots__ = ('_entries', '_inflight', '_lock', '_maxsize',
+                 '_refresh_ahead', '_background', '_clock', '_stats',
+                 '_generation', '_on_evict')
+
+    def __init__(self, maxsize: int = 1024, refresh_ahead: float = 60.0,  # pylint: disable=too-many-arguments # noqa
+                 background: bool = True,
+                 clock: Callable[[], float] = time.time,
+                 on_evict: Optional[Callable[[Hashable], Any]] = None
+                 ) -> None:
+        """Init the members.
+
+        :param maxsize: the max number of values
+        :type maxsize: int
+        :param refresh_ahead: the seconds before the expiry to refresh
+        :type refresh_ahead: float
+        :param background: refresh values in background threads if True
+        :type background: bool
+        :param clock: the function that returns the current epoch seconds
+        :param on_evict: the function that is called with the key of an
+                         evicted value. It must not use the cache.
+        """
+        self._entries = OrderedDict()  # type: OrderedDict[Hashable, _K2hr3CacheEntry] # noqa
+        self._inflight = {}  # type: Dict[Hashable, Future]
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self._refresh_ahead = refresh_ahead
+        self._background = background
+        self._clock = clock
+        self._stats = K2hr3CacheStats()
+        # NOTE: A value loaded before the invalidation is not stored.
+        self._generation = 0
+        self._on_evict = on_evict
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3ExpiringCache size={len(self._entries)} ' \
+               f'maxsize={self._maxsize}>'
+
+    def __len__(self) -> int:
+        """Return the number of values."""
+        return len(self._entries)
+
+    @property
+    def stats(self) -> K2hr3CacheStats:
+        """Return the statistics."""
+        return self._stats
+
+    def _store(self, key: Hashable, value: Any, expires_at: float) -> None:
+        """Store a value. The lock must be held."""
+        now = self._clock()
+        margin = min(self._refresh_ahead, max(expires_at - now, 0) / 2)
+        self._entries[key] = _K2hr3CacheEntry(value, expires_at,
+                                              expires_at - margin)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            evicted, _ = self._entries.popitem(last=False)
+            self._stats.evictions += 1
+            if self._on_evict is not None:
+                self._on_evict(evicted)
+
+    def put(self, key: Hashable, value: Any, expires_at: float) -> None:
+        """Store a value that expires at the epoch seconds."""
+        with self._lock:
+            self._store(key, value, expires_at)
+
+    def peek(self, key: Hashable) -> Any:
+        """Return a valid value or None without loading it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and self._clock() < entry.expires_at:
+                return entry.value
+        return None
+
+    def expires_at(self, key: Hashable) -> Optional[float]:
+        """Return the epoch seconds when the value expires."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.expires_at if entry else None
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Remove a value or all values if the key is None."""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def get(self, key: Hashable, loader: Loader) -> Any:
+        """Return the value of the key.
+
+        The loader is called if the value is not cached or expired.
+
+        :raise Exception: the exception that the loader raised.
+        """
+        refresh = False
+        with self._lock:
+            generation = self._generation
+            entry = self._entries.get(key)
+            now = self._clock()
+            if entry is not None and now < entry.expires_at:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                if now >= entry.refresh_at and key not in self._inflight:
+                    if self._background:
+                        self._inflight[key] = Future()
+                        refresh = True
+                if not refresh:
+                    return entry.value
+                value = entry.value
+            else:
+                self._stats.misses += 1
+                future = self._inflight.get(key)
+                owner = future is None
+                if owner:
+                    future = Future()
+                    self._inflight[key] = future
+        if refresh:
+            threading.Thread(target=self._load,
+                             args=(key, loader, generation, True),
+                             name='k2hr3-cache-refresh', daemon=True).start()
+            return value
+        if owner:
+            return self._load(key, loader, generation)
+        return future.result()  # type: ignore
+
+    def _load(self, key: Hashable, loader: Loader, generation: int,
+              refresh: bool = False) -> Any:
+        """Call the loader and notify the waiting threads."""
+        with self._lock:
+            future = self._inflight[key]
+        try:
+            value, expires_at = loader()
+        except Exception as error:  # pylint: disable=broad-except
+            LOG.error('could not load %s, %s', key, error)
+            with self._lock:
+                self._stats.errors += 1
+                del self._inflight[key]
+            future.set_exception(error)
+            if refresh:
+                # NOTE: The current value is kept until it expires.
+                return None
+            raise
+        with self._lock:
+            if refresh:
+                self._stats.refreshes += 1
+            if generation == self._generation:
+                self._store(key, value, expires_at)
+            del self._inflight[key]
+        future.set_result(value)
+        return value
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
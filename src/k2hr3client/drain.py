@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""K2HR3 Python Client of the bulk teardown of hosts.
+
+The members and the role tokens of the selected hosts are found in the roles
+and deleted concurrently. A member or a role token that has already been
+deleted is regarded as deleted, so a drain can be retried.
+
+.. code-block:: python
+
+    # Import modules from k2hr3client package.
+    from k2hr3client.drain import K2hr3HostSelector, drain_hosts
+    from k2hr3client.hostindex import K2hr3HostIndex
+    from k2hr3client.http import K2hr3Http
+
+    myhttp = K2hr3Http("http://127.0.0.1:18080")
+    index = K2hr3HostIndex(myhttp, "gAAAAA...")
+    index.refresh()
+
+    selector = K2hr3HostSelector(ips=["10.0.0.1"], tags=["hypervisor1"])
+    summary = drain_hosts(myhttp, "gAAAAA...", selector, index=index)
+    summary.as_dict()  // {'roles': 2, 'members': 10, 'roletokens': 10, ...}
+
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from k2hr3client.api import K2hr3HTTPMethod
+from k2hr3client.bulk import (DEFAULT_MAX_WORKERS, K2hr3BulkResult,
+                              role_host_key, run_bulk, send_api)
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client.hostindex import K2hr3HostIndex
+from k2hr3client.http import K2hr3Http
+from k2hr3client.model import (K2hr3RoleModel, K2hr3RoleTokenEntryModel,
+                               K2hr3RoleTokenListModel, to_role_host)
+from k2hr3client.role import K2hr3Role, K2hr3RoleHost
+from k2hr3client.token import K2hr3RoleTokenList
+
+LOG = logging.getLogger(__name__)
+
+
+class K2hr3HostSelector():
+    """Select hosts by the ip addresses, the cuks or the tags.
+
+    A host is selected if any of them matches. The hostnames are selected by
+    the ip addresses too.
+    """
+
+    __slots__ = ('ips', 'cuks', 'tags')
+
+    def __init__(self, ips: Iterable[str] = (), cuks: Iterable[str] = (),
+                 tags: Iterable[str] = ()) -> None:
+        """Init the members."""
+        self.ips = frozenset(ips)
+        self.cuks = frozenset(cuks)
+        self.tags = frozenset(tags)
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3HostSelector ips={sorted(self.ips)!r} ' \
+               f'cuks={sorted(self.cuks)!r} tags={sorted(self.tags)!r}>'
+
+    @property
+    def empty(self) -> bool:
+        """Return True if no host is selected."""
+        return not (self.ips or self.cuks or self.tags)
+
+    def match_host(self, host: K2hr3RoleHost) -> bool:
+        """Return True if a member of a role is selected."""
+        return bool((host.host and host.host in self.ips)
+                    or (host.cuk and host.cuk in self.cuks)
+                    or (host.tag and host.tag in self.tags))
+
+    def match_role_token(self, entry: K2hr3RoleTokenEntryModel) -> bool:
+        """Return True if a role token is selected.
+
+        A role token has no tag, so it is selected by the ip address, the
+        hostname or the cuk.
+        """
+        return bool((entry.ip and entry.ip in self.ips)
+                    or (entry.hostname and entry.hostname in self.ips)
+                    or (entry.cuk and entry.cuk in self.cuks))
+
+    def roles(self, index: K2hr3HostIndex) -> Set[str]:
+        """Return the roles of the selected hosts in the index."""
+        roles = set()  # type: Set[str]
+        for ip in self.ips:  # pylint: disable=invalid-name
+            roles.update(index.roles_by_ip(ip))
+            roles.update(index.roles_by_host(ip))
+        for cuk in self.cuks:
+            roles.update(index.roles_by_cuk(cuk))
+        for tag in self.tags:
+            roles.update(index.roles_by_tag(tag))
+        return roles
+
+
+class K2hr3DrainSummary():
+    """Represent the result of a drain.
+
+    The result is keyed by ('member', role, host, port, cuk) for the members
+    and ('roletoken', role, n) for the role tokens. The role tokens are not
+    shown in the keys because they are secrets. A role that could not be
+    searched is keyed by ('role', role) in the failed items.
+    """
+
+    __slots__ = ('roles', 'result')
+
+    def __init__(self) -> None:
+        """Init the members."""
+        # NOTE: the roles that are searched.
+        self.roles = []  # type: List[str]
+        self.result = K2hr3BulkResult()
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3DrainSummary roles={len(self.roles)} ' \
+               f'members={self.members} roletokens={self.roletokens} ' \
+               f'failed={len(self.result.failed)}>'
+
+    def _count(self, kind: str) -> int:
+        return sum(1 for key in self.result.succeeded
+                   if key[0] == kind)  # type: ignore[index]
+
+    @property
+    def members(self) -> int:
+        """Return the number of the deleted members."""
+        return self._count('member')
+
+    @property
+    def roletokens(self) -> int:
+        """Return the number of the deleted role tokens."""
+        return self._count('roletoken')
+
+    @property
+    def ok(self) -> bool:  # pylint: disable=invalid-name
+        """Return True if nothing failed."""
+        return self.result.ok
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the summary as a JSON serializable dict."""
+        return {
+            'roles': len(self.roles),
+            'members': self.members,
+            'roletokens': self.roletokens,
+            'failed': {'/'.join(str(part) for part in key): message  # type: ignore[union-attr] # noqa
+                       for key, message in self.result.failed.items()}
+        }
+
+
+def _search(r3http: K2hr3Http, r3token: str, role: str,
+            selector: K2hr3HostSelector, roletokens: bool
+            ) -> Tuple[List[K2hr3RoleHost], List[str]]:
+    """Return the selected members and role tokens of a role.
+
+    A role that has already been deleted has nothing.
+    """
+    myrole = K2hr3Role(r3token).get(role, expand=False)
+    resp = send_api(r3http, myrole, K2hr3HTTPMethod.GET, allowed_codes=(404,))
+    if resp.code == 404:
+        return [], []
+    model = K2hr3RoleModel.from_response(resp)
+    hosts = [host for host in (to_role_host(entry) for entry
+                               in model.hostnames + model.ips)
+             if selector.match_host(host)]
+    tokens = []  # type: List[str]
+    if roletokens:
+        resp = send_api(r3http, K2hr3RoleTokenList(r3token, role, True),
+                        K2hr3HTTPMethod.GET, allowed_codes=(404,))
+        if resp.code == 404:
+            return hosts, tokens
+        token_list = K2hr3RoleTokenListModel.from_response(resp)
+        for token in token_list.tokens:
+            entry = token_list.entry(token)
+            if entry is not None and selector.match_role_token(entry):
+                tokens.append(token)
+    return hosts, tokens
+
+
+def drain_hosts(r3http: K2hr3Http, r3token: str,  # pylint: disable=too-many-arguments,too-many-locals # noqa
+                selector: K2hr3HostSelector,
+                roles: Optional[Iterable[str]] = None,
+                index: Optional[K2hr3HostIndex] = None,
+                roletokens: bool = True,
+                max_workers: int = DEFAULT_MAX_WORKERS) -> K2hr3DrainSummary:
+    """Delete the members and the role tokens of the selected hosts.
+
+    The roles are searched concurrently. They are the given roles and the
+    roles of the selected hosts in the index. The found members and role
+    tokens are deleted concurrently and the roles are updated in the index.
+
+    :param r3http: the http client of the K2HR3 API server
+    :type r3http: K2hr3Http
+    :param r3token: the K2HR3 token
+    :type r3token: str
+    :param selector: the selector of the hosts
+    :type selector: K2hr3HostSelector
+    :param roles: the roles to search
+    :param index: the index to find the roles
+    :type index: K2hr3HostIndex
+    :param roletokens: delete the role tokens too if True
+    :type roletokens: bool
+    :param max_workers: the max number of concurrent requests
+    :type max_workers: int
+    :returns: the summary
+    :rtype: K2hr3DrainSummary
+    :raise K2hr3Exception: if no host or no role is given.
+    """
+    if selector.empty:
+        raise K2hr3Exception('no host is selected')
+    if roles is None and index is None:
+        raise K2hr3Exception('roles or index required')
+    names = dict.fromkeys(roles or ())
+    if index is not None:
+        names.update(dict.fromkeys(sorted(selector.roles(index))))
+
+    summary = K2hr3DrainSummary()
+    summary.roles = list(names)
+    found = run_bulk(summary.roles,
+                     lambda role: _search(r3http, r3token, role, selector,
+                                          roletokens),
+                     max_workers)
+
+    deletions = {}  # type: Dict[Tuple[Any, ...], K2hr3Role]
+    for role, (hosts, tokens) in found.succeeded.items():  # type: ignore[misc] # noqa
+        for host in hosts:
+            deletions[('member', role) + role_host_key(host)] = K2hr3Role(
+                r3token).delete_member(role, host.host, host.port, host.cuk)
+        for pos, token in enumerate(tokens):
+            deletions[('roletoken', role, pos)] = K2hr3Role(
+                r3token).delete_roletoken_with_string(token)
+    summary.result = run_bulk(
+        deletions,
+        lambda key: send_api(r3http, deletions[key], K2hr3HTTPMethod.DELETE,
+                             allowed_codes=(404,)),
+        max_workers)
+    for role, message in found.failed.items():
+        summary.result.failed[('role', role)] = message
+    summary.result.succeeded = {key: None for key
+                                in summary.result.succeeded}
+
+    if index is not None:
+        changed = {key[1] for key in summary.result.succeeded
+                   if key[0] == 'member'}  # type: ignore[index]
+        if changed:
+            index.update(sorted(changed))
+    LOG.info('drained %s', summary)
+    return summary
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""K2HR3 Python Client of the host to role index.
+
+The roles are listed by K2HR3 LIST API and got concurrently. The index maps
+the hostnames, the ip addresses, the cuks and the tags of the hosts to the
+roles. A role is indexed again only if the response of it is changed.
+
+.. code-block:: python
+
+    # Import modules from k2hr3client package.
+    from k2hr3client.hostindex import K2hr3HostIndex
+    from k2hr3client.http import K2hr3Http
+
+    myhttp = K2hr3Http("http://127.0.0.1:18080")
+    index = K2hr3HostIndex(myhttp, "gAAAAA...")
+    index.refresh()
+
+    index.roles_by_ip("10.0.0.1")  // frozenset({'yrn:yahoo:::demo:role:r1'})
+    index.roles_by_cuk("mycuk")  // frozenset()
+
+    # Get the roles again and index only the changed roles.
+    index.refresh()
+    # Get again only the roles that are new or older than 60 seconds.
+    index.refresh(max_age=60)
+
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import (Callable, Dict, FrozenSet, Iterable, List, Optional, Set,
+                    Tuple)
+
+from k2hr3client.api import K2hr3HTTPMethod
+
+from k2hr3client.api import K2hr3HTTPMethod
+from k2hr3client.bulk import (DEFAULT_MAX_WORKERS, K2hr3BulkResult, run_bulk,
+                              send_api)
+from k2hr3client.http import K2hr3Http
+from k2hr3client.list import K2hr3List
+from k2hr3client.model import K2hr3ListModel, K2hr3RoleModel, to_role_host
+from k2hr3client.role import K2hr3Role
+
+LOG = logging.getLogger(__name__)
+
+# NOTE: the kinds of the keys of the index.
+_KINDS = ('host', 'ip', 'cuk', 'tag')
+
+
+class K2hr3HostIndex():
+    """Map the hosts to the roles that they are members of.
+
+    The roles are got without the expansion by default, so a host is mapped
+    to the roles it is registered to directly. The digest of the response of
+    a role is kept, so a role whose response is not changed is not indexed
+    again.
+    """
+
+    __slots__ = ('_http', '_r3token', '_path', '_expand', '_max_workers',
+                 '_clock', '_maps', '_entries', '_fetched', '_digests',
+                 '_lock')
+
+    def __init__(self, r3http: K2hr3Http, r3token: str,  # pylint: disable=too-many-arguments # noqa
+                 path: str = 'role', expand: bool = False,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 clock: Callable[[], float] = time.time) -> None:
+        """Init the members.
+
+        :param r3http: the http client of the K2HR3 API server
+        :type r3http: K2hr3Http
+        :param r3token: the K2HR3 token
+        :type r3token: str
+        :param path: the path of K2HR3 LIST API, like "role" or
+                     "myservice/role"
+        :type path: str
+        :param expand: map the hosts of the nested roles to the roles if True
+        :type expand: bool
+        :param max_workers: the max number of concurrent requests
+        :type max_workers: int
+        """
+        self._http = r3http
+        self._r3token = r3token
+        self._path = path
+        self._expand = expand
+        self._max_workers = max_workers
+        self._clock = clock
+        # NOTE: kind -> key -> roles
+        self._maps = {kind: {} for kind in _KINDS}  # type: Dict[str, Dict[str, Set[str]]] # noqa
+        # NOTE: role -> (kind, key) pairs of the role
+        self._entries = {}  # type: Dict[str, List[Tuple[str, str]]]
+        # NOTE: role -> the epoch seconds when the role was got
+        self._fetched = {}  # type: Dict[str, float]
+        # NOTE: role -> the digest of the response of the role
+        self._digests = {}  # type: Dict[str, str]
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3HostIndex path={self._path!r} ' \
+               f'roles={len(self._entries)}>'
+
+    def __len__(self) -> int:
+        """Return the number of indexed roles."""
+        return len(self._entries)
+
+    def __contains__(self, role: object) -> bool:
+        """Return True if the role is indexed."""
+        return role in self._entries
+
+    @property
+    def roles(self) -> List[str]:
+        """Return the indexed roles."""
+        with self._lock:
+            return list(self._entries)
+
+    def _lookup(self, kind: str, key: str) -> FrozenSet[str]:
+        with self._lock:
+            return frozenset(self._maps[kind].get(key, ()))
+
+    def roles_by_host(self, host: str) -> FrozenSet[str]:
+        """Return the roles of the hostname."""
+        return self._lookup('host', host)
+
+    def roles_by_ip(self, ip: str) -> FrozenSet[str]:  # pylint: disable=invalid-name # noqa
+        """Return the roles of the ip address."""
+        return self._lookup('ip', ip)
+
+    def roles_by_cuk(self, cuk: str) -> FrozenSet[str]:
+        """Return the roles of the cuk."""
+        return self._lookup('cuk', cuk)
+
+    def roles_by_tag(self, tag: str) -> FrozenSet[str]:
+        """Return the roles of the tag."""
+        return self._lookup('tag', tag)
+
+    def list_roles(self) -> List[str]:
+        """Return the roles listed by K2HR3 LIST API.
+
+        :raise K2hr3Exception: if the roles could not be listed.
+        """
+        mylist = K2hr3List(self._r3token, self._path).get(expand=True)
+        resp = send_api(self._http, mylist, K2hr3HTTPMethod.GET)
+        return list(dict.fromkeys(K2hr3ListModel.from_response(resp).walk()))
+
+    def _fetch(self, role: str
+               ) -> Optional[Tuple[str, List[Tuple[str, str]]]]:
+        """GET a role and return the digest and the (kind, key) pairs.
+
+        None is returned if the response is not changed.
+        """
+        myrole = K2hr3Role(self._r3token).get(role, expand=self._expand)
+        resp = send_api(self._http, myrole, K2hr3HTTPMethod.GET)
+        digest = hashlib.sha256((resp.body or '').encode('utf-8')).hexdigest()
+        with self._lock:
+            if self._digests.get(role) == digest:
+                return None
+        model = K2hr3RoleModel.from_response(resp)
+        entries = []
+        for kind, hosts in (('host', model.hostnames), ('ip', model.ips)):
+            for entry in hosts:
+                host = to_role_host(entry)
+                for pair in ((kind, host.host), ('cuk', host.cuk),
+                             ('tag', host.tag)):
+                    if pair[1]:
+                        entries.append(pair)
+        return digest, list(dict.fromkeys(entries))
+
+    def _remove(self, role: str) -> None:
+        """Remove a role from the maps. The lock must be held."""
+        for kind, key in self._entries.pop(role, ()):
+            roles = self._maps[kind].get(key)
+            if roles is not None:
+                roles.discard(role)
+                if not roles:
+                    del self._maps[kind][key]
+        self._fetched.pop(role, None)
+        self._digests.pop(role, None)
+
+    def _store(self, role: str, digest: str,
+               entries: List[Tuple[str, str]], fetched: float) -> None:
+        """Replace the entries of a role. The lock must be held."""
+        self._remove(role)
+        for kind, key in entries:
+            self._maps[kind].setdefault(key, set()).add(role)
+        self._entries[role] = entries
+        self._fetched[role] = fetched
+        self._digests[role] = digest
+
+    def update(self, roles: Iterable[str]) -> K2hr3BulkResult:
+        """Get the roles concurrently and replace the entries of them.
+
+        The entries of a role are replaced only if the response of it is
+        changed. The entries of a role that could not be got are kept.
+
+        :returns: the result keyed by the roles. The value of a role is True
+                  if the role is changed.
+        :rtype: K2hr3BulkResult
+        """
+        started = self._clock()
+        result = run_bulk(list(dict.fromkeys(roles)), self._fetch,
+                          self._max_workers)
+        with self._lock:
+            for role, fetched in result.succeeded.items():
+                if fetched is None:
+                    if role in self._entries:
+                        self._fetched[role] = started  # type: ignore[index]
+                    result.succeeded[role] = False
+                else:
+                    self._store(role, *fetched, started)  # type: ignore
+                    result.succeeded[role] = True
+        return result
+
+    def remove(self, roles: Iterable[str]) -> None:
+        """Remove the roles from the index."""
+        with self._lock:
+            for role in roles:
+                self._remove(role)
+
+    def refresh(self, max_age: Optional[float] = None) -> K2hr3BulkResult:
+        """List the roles and index the roles that are changed.
+
+        The roles that are not listed are removed. All listed roles are got
+        if max_age is None, otherwise only the roles that are new or were got
+        more than max_age seconds ago are got. A role that is got is indexed
+        again only if the response of it is changed.
+
+        :param max_age: the seconds a role is not got again
+        :type max_age: float
+        :returns: the result keyed by the roles that are got. The value of a
+                  role is True if the role is changed.
+        :rtype: K2hr3BulkResult
+        :raise K2hr3Exception: if the roles could not be listed.
+        """
+        listed = self.list_roles()
+        now = self._clock()
+        with self._lock:
+            listed_set = set(listed)
+            for role in [role for role in self._entries
+                         if role not in listed_set]:
+                self._remove(role)
+            if max_age is None:
+                targets = listed
+            else:
+                targets = [role for role in listed
+                           if role not in self._fetched
+                           or now - self._fetched[role] > max_age]
+        result = self.update(targets)
+        LOG.debug('%s roles of %s listed roles are changed',
+                  sum(1 for val in result.succeeded.values() if val),
+                  len(listed))
+        return result
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
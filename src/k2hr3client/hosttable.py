@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""K2HR3 Python Client of the compact host table.
+
+The hosts of a role are stored in columns. The strings are interned in a
+pool shared by the tables and the ip addresses are packed in integers, so a
+role that has many hosts uses little memory.
+
+.. code-block:: python
+
+    # Import modules from k2hr3client package.
+    from k2hr3client.hosttable import K2hr3RoleHostTable
+    from k2hr3client.http import K2hr3Http
+    from k2hr3client.role import K2hr3Role
+    from k2hr3client.stream import iter_role_hosts
+
+    myhttp = K2hr3Http("http://127.0.0.1:18080")
+    myrole = K2hr3Role("gAAAAA...").get("myrole", expand=False)
+    hosts = iter_role_hosts(myhttp, myrole)
+    table = K2hr3RoleHostTable.from_role_hosts(hosts)
+
+    subnet = table.filter_network("10.0.0.0/24").filter_tag("web")
+    subnet[0].host  // '10.0.0.1'
+    subnet.to_role_hosts()  // [<K2hr3RoleHost ...>, ...]
+
+"""
+
+from array import array
+import ipaddress
+import logging
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from k2hr3client.role import K2hr3RoleHost, K2hr3RoleHostList
+
+LOG = logging.getLogger(__name__)
+
+_FIELDS = K2hr3RoleHost.__slots__
+_MASK64 = (1 << 64) - 1
+# NOTE: IPv4 addresses are packed as IPv4-mapped IPv6 addresses.
+_IPV4_MAPPED = 0xffff << 32
+_NOT_IP = 0
+
+
+def _pack_ip(text: str) -> Tuple[int, int]:
+    """Return the family and the 128 bits integer of an ip address."""
+    if not text or not (text[0].isdigit() or ':' in text):
+        return _NOT_IP, 0
+    try:
+        addr = ipaddress.ip_address(text)
+    except ValueError:
+        return _NOT_IP, 0
+    if addr.version == 4:
+        return 4, _IPV4_MAPPED | int(addr)
+    return 6, int(addr)
+
+
+def _unpack_ip(family: int, value: int) -> str:
+    """Return the string of a packed ip address."""
+    if family == 4:
+        return str(ipaddress.IPv4Address(value & 0xffffffff))
+    return str(ipaddress.IPv6Address(value))
+
+
+class K2hr3StringPool():
+    """Intern the strings and identify them by integers.
+
+    The id of the empty string is 0.
+    """
+
+    __slots__ = ('_ids', '_strings')
+
+    def __init__(self) -> None:
+        """Init the members."""
+        self._ids = {'': 0}  # type: Dict[str, int]
+        self._strings = ['']  # type: List[str]
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3StringPool size={len(self._strings)}>'
+
+    def __len__(self) -> int:
+        """Return the number of the strings."""
+        return len(self._strings)
+
+    def add(self, val: Any) -> int:
+        """Return the id of a string after adding it."""
+        text = '' if val is None else str(val)
+        sid = self._ids.get(text)
+        if sid is None:
+            text = sys.intern(text)
+            sid = len(self._strings)
+            self._ids[text] = sid
+            self._strings.append(text)
+        return sid
+
+    def find(self, val: Any) -> Optional[int]:
+        """Return the id of a string or None if not added."""
+        return self._ids.get('' if val is None else str(val))
+
+    def get(self, sid: int) -> str:
+        """Return the string of the id."""
+        return self._strings[sid]
+
+
+class K2hr3RoleHostRow():
+    """Represent a host in a K2hr3RoleHostTable without copying it."""
+
+    __slots__ = ('_table', '_pos')
+
+    def __init__(self, table: 'K2hr3RoleHostTable', pos: int) -> None:
+        """Init the members."""
+        self._table = table
+        self._pos = pos
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3RoleHostRow host={self.host!r} port={self.port!r} ' \
+               f'cuk={self.cuk!r}>'
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if the hosts have the same members."""
+        if not isinstance(other, (K2hr3RoleHostRow, K2hr3RoleHost)):
+            return NotImplemented
+        return all(getattr(self, attr) == getattr(other, attr)
+                   for attr in _FIELDS)
+
+    def __hash__(self) -> int:
+        """Return the hash of the members."""
+        return hash(tuple(getattr(self, attr) for attr in _FIELDS))
+
+    @property
+    def host(self) -> str:
+        """Return the hostname or the ip address."""
+        return self._table._host(self._pos)  # pylint: disable=protected-access # noqa
+
+    @property
+    def port(self) -> str:
+        """Return the port."""
+        return self._table._text('port', self._pos)  # pylint: disable=protected-access # noqa
+
+    @property
+    def cuk(self) -> str:
+        """Return the cuk."""
+        return self._table._text('cuk', self._pos)  # pylint: disable=protected-access # noqa
+
+    @property
+    def extra(self) -> str:
+        """Return the extra."""
+        return self._table._text('extra', self._pos)  # pylint: disable=protected-access # noqa
+
+    @property
+    def tag(self) -> str:
+        """Return the tag."""
+        return self._table._text('tag', self._pos)  # pylint: disable=protected-access # noqa
+
+    @property
+    def inboundip(self) -> str:
+        """Return the inbound ip address."""
+        return self._table._text('inboundip', self._pos)  # pylint: disable=protected-access # noqa
+
+    @property
+    def outboundip(self) -> str:
+        """Return the outbound ip address."""
+        return self._table._text('outboundip', self._pos)  # pylint: disable=protected-access # noqa
+
+    def to_role_host(self) -> K2hr3RoleHost:
+        """Return a K2hr3RoleHost of the host."""
+        return K2hr3RoleHost(*[getattr(self, attr) for attr in _FIELDS])
+
+
+class K2hr3RoleHostTable():
+    """Store the hosts of a role in columns.
+
+    The members of a host are the ids of the strings in the pool. The host
+    that is an ip address in the canonical form is stored in the packed
+    columns only. The filters return new tables that share the pool.
+    """
+
+    __slots__ = ('_pool', '_columns', '_family', '_addr_hi', '_addr_lo',
+                 '_keys')
+
+    def __init__(self, pool: Optional[K2hr3StringPool] = None) -> None:
+        """Init the members.
+
+        :param pool: the string pool, a new pool is used by default
+        :type pool: K2hr3StringPool
+        """
+        self._pool = pool if pool is not None else K2hr3StringPool()
+        self._columns = {attr: array('I') for attr in _FIELDS}  # type: Dict[str, array] # noqa
+        self._family = array('B')
+        self._addr_hi = array('Q')
+        self._addr_lo = array('Q')
+        # NOTE: the key of a host -> the position, built at the first lookup.
+        self._keys = None  # type: Optional[Dict[Tuple[int, ...], int]]
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3RoleHostTable hosts={len(self)}>'
+
+    def __len__(self) -> int:
+        """Return the number of the hosts."""
+        return len(self._family)
+
+    def __getitem__(self, pos: int) -> K2hr3RoleHostRow:
+        """Return the host at the position."""
+        if pos < 0:
+            pos += len(self)
+        if not 0 <= pos < len(self):
+            raise IndexError('host table index out of range')
+        return K2hr3RoleHostRow(self, pos)
+
+    def __iter__(self) -> Iterator[K2hr3RoleHostRow]:
+        """Iterate the hosts."""
+        for pos in range(len(self)):
+            yield K2hr3RoleHostRow(self, pos)
+
+    def __contains__(self, host: object) -> bool:
+        """Return True if a host that has the same key is stored.
+
+        A host is identified by the hostname or the ip address, the port and
+        the cuk.
+        """
+        if not all(hasattr(host, attr) for attr in ('host', 'port', 'cuk')):
+            return False
+        return self.find(host) is not None
+
+    @property
+    def pool(self) -> K2hr3StringPool:
+        """Return the string pool."""
+        return self._pool
+
+    def _text(self, attr: str, pos: int) -> str:
+        return self._pool.get(self._columns[attr][pos])
+
+    def _host(self, pos: int) -> str:
+        sid = self._columns['host'][pos]
+        family = self._family[pos]
+        if sid or family == _NOT_IP:
+            return self._pool.get(sid)
+        return _unpack_ip(family, (self._addr_hi[pos] << 64)
+                          | self._addr_lo[pos])
+
+    def _key(self, pos: int) -> Tuple[int, ...]:
+        columns = self._columns
+        return (columns['host'][pos], self._family[pos], self._addr_hi[pos],
+                self._addr_lo[pos], columns['port'][pos], columns['cuk'][pos])
+
+    def append(self, host: Any, port: Any = '', cuk: Any = '',  # pylint: disable=too-many-arguments # noqa
+               extra: Any = '', tag: Any = '', inboundip: Any = '',
+               outboundip: Any = '') -> None:
+        """Append a host."""
+        text = '' if host is None else str(host)
+        family, value = _pack_ip(text)
+        if family != _NOT_IP and _unpack_ip(family, value) == text:
+            sid = 0
+        else:
+            sid = self._pool.add(text)
+        add = self._pool.add
+        for attr, val in (('host', None), ('port', port), ('cuk', cuk),
+                          ('extra', extra), ('tag', tag),
+                          ('inboundip', inboundip),
+                          ('outboundip', outboundip)):
+            self._columns[attr].append(sid if attr == 'host' else add(val))
+        self._family.append(family)
+        self._addr_hi.append(value >> 64)
+        self._addr_lo.append(value & _MASK64)
+        if self._keys is not None:
+            self._keys.setdefault(self._key(len(self) - 1), len(self) - 1)
+
+    def extend(self, hosts: Iterable[Any]) -> None:
+        """Append the K2hr3RoleHost or the K2hr3RoleHostRow objects."""
+        for host in hosts:
+            self.append(*[getattr(host, attr) for attr in _FIELDS])
+
+    def find(self, host: Any) -> Optional[K2hr3RoleHostRow]:
+        """Return the stored host that has the same key as the host."""
+        if self._keys is None:
+            self._keys = {}
+            for pos in range(len(self)):
+                self._keys.setdefault(self._key(pos), pos)
+        text = '' if host.host is None else str(host.host)
+        family, value = _pack_ip(text)
+        if family != _NOT_IP and _unpack_ip(family, value) == text:
+            sid = 0  # type: Optional[int]
+        else:
+            sid = self._pool.find(text)
+        port = self._pool.find(host.port)
+        cuk = self._pool.find(host.cuk)
+        if sid is None or port is None or cuk is None:
+            return None
+        pos = self._keys.get((sid, family, value >> 64, value & _MASK64,
+                              port, cuk))
+        return None if pos is None else K2hr3RoleHostRow(self, pos)
+
+    def _select(self, positions: Iterable[int]) -> 'K2hr3RoleHostTable':
+        """Return a new table of the hosts at the positions."""
+        positions = list(positions)
+        table = K2hr3RoleHostTable(self._pool)
+        for attr, column in self._columns.items():
+            table._columns[attr] = array('I', [column[pos]  # pylint: disable=protected-access # noqa
+                                               for pos in positions])
+        for attr in ('_family', '_addr_hi', '_addr_lo'):
+            column = getattr(self, attr)
+            setattr(table, attr, array(column.typecode,
+                                       [column[pos] for pos in positions]))
+        return table
+
+    def _filter_text(self, attr: str, val: Any) -> 'K2hr3RoleHostTable':
+        sid = self._pool.find(val)
+        if sid is None:
+            return K2hr3RoleHostTable(self._pool)
+        return self._select(pos for pos, cur in enumerate(self._columns[attr])
+                            if cur == sid)
+
+    def filter_tag(self, tag: str) -> 'K2hr3RoleHostTable':
+        """Return the hosts that have the tag."""
+        return self._filter_text('tag', tag)
+
+    def filter_port(self, port: Any) -> 'K2hr3RoleHostTable':
+        """Return the hosts that have the port."""
+        return self._filter_text('port', port)
+
+    def filter_cuk(self, cuk: str) -> 'K2hr3RoleHostTable':
+        """Return the hosts that have the cuk."""
+        return self._filter_text('cuk', cuk)
+
+    def filter_network(self, prefix: str) -> 'K2hr3RoleHostTable':
+        """Return the hosts whose ip addresses are in the network.
+
+        :param prefix: the network, like "10.0.0.0/24" or "fd00::/8"
+        :type prefix: str
+        :raise ValueError: if the prefix is not a network.
+        """
+        network = ipaddress.ip_network(prefix, strict=False)
+        if network.version == 4:
+            family, first = 4, _IPV4_MAPPED | int(network.network_address)
+        else:
+            family, first = 6, int(network.network_address)
+        last = first + network.num_addresses - 1
+        first_hi, last_hi = first >> 64, last >> 64
+        families, highs, lows = self._family, self._addr_hi, self._addr_lo
+        return self._select(
+            pos for pos in range(len(self))
+            if families[pos] == family and first_hi <= highs[pos] <= last_hi
+            and first <= ((highs[pos] << 64) | lows[pos]) <= last)
+
+    @classmethod
+    def from_role_hosts(cls, hosts: Iterable[Any],
+                        pool: Optional[K2hr3StringPool] = None
+                        ) -> 'K2hr3RoleHostTable':
+        """Return a table of the K2hr3RoleHost objects."""
+        table = cls(pool)
+        table.extend(hosts)
+        return table
+
+    @classmethod
+    def from_host_list(cls, hostlist: K2hr3RoleHostList,
+                       pool: Optional[K2hr3StringPool] = None
+                       ) -> 'K2hr3RoleHostTable':
+        """Return a table of a K2hr3RoleHostList."""
+        return cls.from_role_hosts(hostlist.hostlist, pool)
+
+    def to_role_hosts(self) -> List[K2hr3RoleHost]:
+        """Return the hosts as K2hr3RoleHost objects."""
+        return [row.to_role_host() for row in self]
+
+    def to_host_list(self) -> K2hr3RoleHostList:
+        """Return the hosts as a K2hr3RoleHostList."""
+        hostlist = K2hr3RoleHostList()
+        for row in self:
+            hostlist.add_host(row.to_role_host())
+        return hostlist
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
@@ -34,32 +34,196 @@ k2hr3client - Python library for K2HR3 API.
     # GET the K2hr Extdata API.
     httpreq.GET(example.acquires_template())
     print(example.resp)
+
+    # Send requests of an API instance from several threads.
+    from k2hr3client.api import K2hr3HTTPMethod
+    from k2hr3client.role import K2hr3Role
+    myrole = K2hr3Role("token")
+    resp = httpreq.send(
+        myrole.copy().get("myrole").build_request(K2hr3HTTPMethod.GET))
+    print(resp.body)
+
+    # Keep the connections alive and reuse them.
+    pool = khttp.K2hr3ConnectionPool()
+    httpreq = khttp.K2hr3Http('http://127.0.0.1:18080', pool)
 """
 
-from enum import Enum
+import codecs
+from collections import defaultdict
+import http.client
 import json
 import logging
 import re
 import socket
 import ssl
+import threading
 import time
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
 import urllib
 import urllib.parse
 import urllib.request
 from urllib.error import ContentTooShortError, HTTPError, URLError
 
-from k2hr3client.api import K2hr3HTTPMethod, K2hr3Api
+from k2hr3client.api import (K2hr3HTTPMethod, K2hr3Api, K2hr3ApiResponse,
+                             K2hr3Request)
 from k2hr3client.exception import K2hr3Exception
 from k2hr3client import CONFIG
 
 LOG = logging.getLogger(__name__)
 
 
-class _AgentError(Enum):
-    NONE = 1
-    TEMP = 2
-    FATAL = 3
+def _encode_urlparams(
+        params: Optional[Union[Mapping[str, Any], str]]) -> Optional[str]:
+    """Encode the url parameters of a K2HR3 API request.
+
+    Parameters whose value is None are omitted. Booleans, lists and dicts are
+    serialized in JSON because the K2HR3 API server parses them as JSON.
+
+    :param params: url parameters
+    :type params: mapping or None
+    :returns: the url-encoded query string or None if no parameters
+    :rtype: str
+    """
+    if not params:
+        return None
+    if isinstance(params, str):
+        # NOTE: JSON strings are accepted only for backward compatibility.
+        params = json.loads(params)
+    query = []
+    for key, val in params.items():  # type: ignore[union-attr]
+        if val is None:
+            continue
+        if isinstance(val, (bool, dict, list, tuple)):
+            val = json.dumps(val, separators=(',', ':'))
+        query.append((key, val))
+    if not query:
+        return None
+    return urllib.parse.urlencode(query)
+
+
+def _create_ssl_context(allow_self_signed_cert: bool) -> ssl.SSLContext:
+    """Return a ssl context."""
+    # https://docs.python.jp/3/library/ssl.html#ssl.create_default_context
+    ctx = ssl.create_default_context()
+    if allow_self_signed_cert:
+        # https://github.com/python/cpython/blob/master/Lib/ssl.py#L567
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+
+class K2hr3ConnectionPool():
+    """Keep the http connections alive and reuse them for each host.
+
+    A pool can be shared by several K2hr3Http instances and threads.
+    """
+
+    __slots__ = ('_idle', '_lock', '_maxsize', '_context')
+
+    def __init__(self, maxsize: int = 8,
+                 context: Optional[ssl.SSLContext] = None) -> None:
+        """Init the members.
+
+        :param maxsize: the max number of idle connections of a host
+        :type maxsize: int
+        :param context: the ssl context of https connections
+        :type context: ssl.SSLContext
+        """
+        self._idle = defaultdict(list)  # type: Dict[Tuple[str, str, bool], List[http.client.HTTPConnection]] # noqa
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self._context = context
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3ConnectionPool maxsize={self._maxsize} ' \
+               f'hosts={len(self._idle)}>'
+
+    def _acquire(self, key: Tuple[str, str, bool], timeout: Optional[float],
+                 context: Optional[ssl.SSLContext]
+                 ) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return an idle connection or a new connection."""
+        with self._lock:
+            if self._idle[key]:
+                return self._idle[key].pop(), True
+        scheme, netloc, _ = key
+        if scheme == 'https':
+            return http.client.HTTPSConnection(
+                netloc, timeout=timeout, context=context), False
+        return http.client.HTTPConnection(netloc, timeout=timeout), False
+
+    def _release(self, key: Tuple[str, str, bool],
+                 conn: http.client.HTTPConnection) -> None:
+        """Keep a connection alive or close it if the pool is full."""
+        with self._lock:
+            if len(self._idle[key]) < self._maxsize:
+                self._idle[key].append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            conns = [conn for idle in self._idle.values() for conn in idle]
+            self._idle.clear()
+        for conn in conns:
+            conn.close()
+
+    def urlopen(self, req: urllib.request.Request,
+                timeout: Optional[float] = None,
+                context: Optional[ssl.SSLContext] = None
+                ) -> K2hr3ApiResponse:
+        """Send a request and return the response.
+
+        The response of a http error is returned as is. A request on a
+        connection that the server has closed is sent again on a new one.
+
+        :raise OSError: if the server could not be reached.
+        :raise K2hr3Exception: if the response is invalid.
+        """
+        parsed = urllib.parse.urlsplit(req.full_url)
+        verified = False
+        if parsed.scheme == 'https':
+            if context is None:
+                context = self._context or _create_ssl_context(
+                    CONFIG['http'].getboolean('allow_self_signed_cert'))
+            verified = context.verify_mode != ssl.CERT_NONE
+        # NOTE: the connections that verify the certificates are not shared
+        # with the requests that do not, and vice versa.
+        key = (parsed.scheme, parsed.netloc, verified)
+        selector = req.selector or '/'
+        headers = dict(req.header_items())
+        while True:
+            conn, reused = self._acquire(key, timeout, context)
+            try:
+                conn.request(req.get_method(), selector, body=req.data,
+                             headers=headers)
+                res = conn.getresponse()
+                body = res.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError,
+                    BrokenPipeError):
+                conn.close()
+                if reused:
+                    # NOTE: the server closed an idle keep-alive connection.
+                    continue
+                raise
+            except http.client.HTTPException as error:
+                conn.close()
+                raise K2hr3Exception(f'invalid response, {error}') from error
+            except OSError:
+                conn.close()
+                raise
+            if res.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            if res.status >= 400:
+                LOG.error(
+                    'Could not complete the request. code %s reason %s headers %s',  # noqa
+                    res.status, res.reason, res.msg)
+            return K2hr3ApiResponse(code=res.status, url=req.full_url,
+                                    hdrs=res.msg,
+                                    body=body.decode('utf-8'))
 
 
 class K2hr3Http():  # pylint: disable=too-many-instance-attributes
@@ -71,16 +235,24 @@ class K2hr3Http():  # pylint: disable=too-many-instance-attributes
     __slots__ = ('_baseurl', '_hdrs', '_timeout_seconds',
                  '_url', '_urlparams',
                  '_retry_interval_seconds', '_retries',
-                 '_allow_self_signed_cert')
+                 '_allow_self_signed_cert', '_pool')
+
+    def __init__(self, baseurl: str,
+                 pool: Optional[K2hr3ConnectionPool] = None) -> None:
+        """Init the members.
 
-    def __init__(self, baseurl: str) -> None:
-        """Init the members."""
+        :param baseurl: the url of the K2HR3 API server
+        :type baseurl: str
+        :param pool: the connection pool to keep the connections alive
+        :type pool: K2hr3ConnectionPool
+        """
         self._set_baseurl(baseurl)
+        self._pool = pool
         self._timeout_seconds = CONFIG['http'].getint('timeout_seconds')
         self._url = None  # type: Optional[str]
         self._urlparams = None  # type: Optional[str]
         self._retry_interval_seconds = CONFIG['http'].getint('retry_interval_seconds')  # noqa
-        self._retries = CONFIG['http'].getint('retries')
+        self._retries = CONFIG['http'].getint('max_retries')
         self._allow_self_signed_cert = CONFIG['http'].getboolean('allow_self_signed_cert')  # noqa
 
     def __repr__(self) -> str:
@@ -209,200 +381,200 @@ class K2hr3Http():  # pylint: disable=too-many-instance-attributes
         del self.url
         del self.urlparams
 
+    def _ssl_context(self, req: urllib.request.Request) -> Optional[ssl.SSLContext]:  # noqa
+        """Return the ssl context of the request."""
+        if req.type == 'https':
+            return _create_ssl_context(self._allow_self_signed_cert)
+        return None
+
+    def _urlopen(self, req: urllib.request.Request) -> K2hr3ApiResponse:
+        """Open the url and return the response.
+
+        The response of a http error is returned as is. Temporary errors are
+        retried. This method does not change the members.
+
+        :raise K2hr3Exception: if the server could not be reached.
+        """
+        ctx = self._ssl_context(req)
+        retries = self._retries
+        while True:
+            try:
+                if self._pool is not None:
+                    return self._pool.urlopen(req, self._timeout_seconds, ctx)
+                with urllib.request.urlopen(req, timeout=self._timeout_seconds,
+                                            context=ctx) as res:
+                    return K2hr3ApiResponse(code=res.getcode(),
+                                            url=res.geturl(),
+                                            hdrs=res.info(),
+                                            body=res.read().decode('utf-8'))
+            except HTTPError as error:
+                # NOTE: urllib raises a 304 of a conditional request too.
+                (LOG.error if error.code >= 400 else LOG.debug)(
+                    'Could not complete the request. code %s reason %s headers %s',  # noqa
+                    error.code, error.reason, error.headers)
+                with error:
+                    return K2hr3ApiResponse(code=error.code,
+                                            url=error.geturl(),
+                                            hdrs=error.headers,
+                                            body=error.read().decode('utf-8'))
+            except (ContentTooShortError, URLError) as error:
+                # https://github.com/python/cpython/blob/master/Lib/urllib/error.py#L73
+                LOG.error('Could not read the server. reason %s', error.reason)
+                raise K2hr3Exception(
+                    f'could not read the server, {error.reason}') from error
+            except (socket.timeout, OSError) as error:  # temporary error
+                LOG.error('error(OSError, socket) %s', error)
+                retries -= 1  # decrement the retries value.
+                if retries < 0:
+                    LOG.error("reached the max retry count.")
+                    raise K2hr3Exception(
+                        f'reached the max retry count, {error}') from error
+                LOG.warning('sleeping for %s. remaining retries=%s',
+                            self._retry_interval_seconds, retries)
+                time.sleep(self._retry_interval_seconds)
+
     def _HTTP_REQUEST_METHOD(self, r3api: K2hr3Api, req: urllib.request.Request) -> bool:   # pylint: disable=invalid-name # noqa
-        agent_error = _AgentError.NONE
         try:
-            ctx = None
-            if req.type == 'https':
-                # https://docs.python.jp/3/library/ssl.html#ssl.create_default_context
-                ctx = ssl.create_default_context()
-                if self._allow_self_signed_cert:
-                    # https://github.com/python/cpython/blob/master/Lib/ssl.py#L567
-                    ctx.check_hostname = False
-                    ctx.verify_mode = ssl.CERT_NONE
-            with urllib.request.urlopen(req, timeout=self._timeout_seconds,
-                                        context=ctx) as res:
-                r3api.set_response(code=res.getcode(),
-                                   url=res.geturl(),
-                                   headers=res.info(),
-                                   body=res.read().decode('utf-8'))
-                return True
+            resp = self._urlopen(req)
+        except K2hr3Exception:
+            LOG.debug('problem. See the error log.')
+            return False
+        if resp.code >= 400:
+            LOG.debug('problem. See the error log.')
+            return False
+        r3api.resp = resp
+        LOG.debug('no problem.')
+        return True
+
+    def _to_urllib_request(self, request: K2hr3Request) -> urllib.request.Request:  # noqa
+        """Convert a K2hr3Request to a urllib Request."""
+        url = f"{self._baseurl}/{request.path}"
+        query = _encode_urlparams(request.urlparams)
+        data = None
+        if request.method == K2hr3HTTPMethod.POST:
+            if request.headers.get('Content-Type') == "application/json":
+                if isinstance(request.body, str):
+                    if request.body:
+                        data = request.body.encode('ascii')
+                elif request.body is not None:
+                    # NOTE: an iterable body like a resource data of a file
+                    # is sent with chunked transfer encoding.
+                    data = request.body
+            elif query:
+                data = query.encode('ascii')
+            query = None
+        if query:
+            url = "?".join([url, query])
+        headers = {'User-Agent': 'K2hr3Http'}
+        headers.update(request.headers)
+        return urllib.request.Request(url, data=data, headers=headers,
+                                      method=request.method.name)
+
+    def send(self, request: K2hr3Request) -> K2hr3ApiResponse:
+        """Send a request and return the response.
+
+        The response of a http error is returned too. This method does not
+        change the members, so an instance can send requests from several
+        threads.
+
+        :raise K2hr3Exception: if the server could not be reached.
+        """
+        req = self._to_urllib_request(request)
+        if req.type not in ('http', 'https'):
+            raise K2hr3Exception(f'http or https, not {req.type}')
+        return self._urlopen(req)
+
+    def stream(self, request: K2hr3Request,
+               chunk_size: int = 65536) -> Iterator[str]:
+        """Send a request and iterate the response body by chunks.
+
+        The response body is read and decoded by chunks, so the memory usage
+        is bounded by the chunk size. Use the k2hr3client.stream module to
+        parse the chunks. This method does not change the members.
+
+        :raise K2hr3Exception: if the server could not be reached or the
+                               server returned a http error.
+        """
+        req = self._to_urllib_request(request)
+        if req.type not in ('http', 'https'):
+            raise K2hr3Exception(f'http or https, not {req.type}')
+        try:
+            res = urllib.request.urlopen(req, timeout=self._timeout_seconds,
+                                         context=self._ssl_context(req))
         except HTTPError as error:
             LOG.error(
-                'Could not complete the request. code %s reason %s headers %s',
+                'Could not complete the request. code %s reason %s headers %s',  # noqa
                 error.code, error.reason, error.headers)
-            agent_error = _AgentError.FATAL
+            error.close()
+            raise K2hr3Exception(
+                f'could not complete the request, code {error.code}') \
+                from error
         except (ContentTooShortError, URLError) as error:
-            # https://github.com/python/cpython/blob/master/Lib/urllib/error.py#L73
             LOG.error('Could not read the server. reason %s', error.reason)
-            agent_error = _AgentError.FATAL
-        except (socket.timeout, OSError) as error:  # temporary error
+            raise K2hr3Exception(
+                f'could not read the server, {error.reason}') from error
+        except (socket.timeout, OSError) as error:
             LOG.error('error(OSError, socket) %s', error)
-            agent_error = _AgentError.TEMP
-        finally:
-            if agent_error == _AgentError.TEMP:
-                self._retries -= 1  # decrement the retries value.
-                if self._retries >= 0:
-                    LOG.warning('sleeping for %s. remaining retries=%s',
-                                self._retry_interval_seconds,
-                                self._retries)
-                    time.sleep(self._retry_interval_seconds)
-                    self.GET(r3api)
-                else:
-                    LOG.error("reached the max retry count.")
-                    agent_error = _AgentError.FATAL
-
-        if agent_error == _AgentError.NONE:
-            LOG.debug('no problem.')
-            return True
-        LOG.debug('problem. See the error log.')
-        return False
-
-    def POST(self, r3api: K2hr3Api) -> bool:  # pylint: disable=invalid-name # noqa
-        """Send requests by using POST Method."""
+            raise K2hr3Exception(
+                f'could not read the server, {error}') from error
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        with res:
+            while True:
+                chunk = res.read(chunk_size)
+                if not chunk:
+                    break
+                text = decoder.decode(chunk)
+                if text:
+                    yield text
+            text = decoder.decode(b'', final=True)
+            if text:
+                yield text
+
+    def _send_api(self, r3api: K2hr3Api, method: K2hr3HTTPMethod) -> bool:
+        """Send a request of the K2hr3Api and set the response to it."""
         self._init_request()
         # 1. Constructs request url using K2hr3Api.path property.
-        r3api_path = r3api._api_path(K2hr3HTTPMethod.POST)  # type: ignore # pylint: disable=protected-access # noqa
+        r3api_path = r3api._prepare(method)  # pylint: disable=protected-access # noqa
+        request = K2hr3Request(method, str(r3api_path), r3api.urlparams,
+                               r3api.headers, r3api.body)
+        req = self._to_urllib_request(request)
         self.url = f"{self._baseurl}/{r3api_path}"
 
         # 2. Constructs url parameters using K2hr3Api.urlparams property.
-        if r3api.headers:
-            content_type = r3api.headers.get('Content-Type')
-        if content_type == "application/json":
-            query = r3api.body
-            if query:
-                query = query.encode('ascii')  # type: ignore
+        if method == K2hr3HTTPMethod.POST:
+            self.urlparams = req.data  # type: ignore
         else:
-            query = urllib.parse.urlencode(r3api.urlparams)  # type: ignore
-            if query:
-                query = query.encode('ascii')  # type: ignore
-        self.urlparams = query
+            self.urlparams = urllib.parse.urlsplit(req.full_url).query or None
 
         # 3. Constructs headers using K2hr3Api.headers property.
-        if self._hdrs:
+        if self._hdrs and r3api.headers:
             self._hdrs.update(r3api.headers)
 
         # 4. Sends a request.
-        req = urllib.request.Request(self.url, data=query,  # type: ignore
-                                     headers=self._hdrs,    # type: ignore  # noqa
-                                     method="POST")
         if req.type not in ('http', 'https'):
             LOG.error('http or https, not %s', req.type)
             return False
         return self._HTTP_REQUEST_METHOD(r3api, req)
 
+    def POST(self, r3api: K2hr3Api) -> bool:  # pylint: disable=invalid-name # noqa
+        """Send requests by using POST Method."""
+        return self._send_api(r3api, K2hr3HTTPMethod.POST)
+
     def PUT(self, r3api: K2hr3Api) -> bool:  # pylint: disable=invalid-name # noqa
         """Send requests by using PUT Method."""
-        self._init_request()
-        # 1. Constructs request url using K2hr3Api.path property.
-        r3api_path = r3api._api_path(K2hr3HTTPMethod.PUT)  # type: ignore # pylint: disable=protected-access # noqa
-        self.url = f"{self._baseurl}/{r3api_path}"
-
-        # 2. Constructs url parameters using K2hr3Api.urlparams property.
-        query = urllib.parse.urlencode(json.loads(r3api.urlparams))  # type: ignore  # noqa
-        self.urlparams = query
-
-        # 3. Constructs headers using K2hr3Api.headers property.
-        if self._hdrs:
-            self._hdrs.update(r3api.headers)
-
-        # 5. Sends a request.
-        req = urllib.request.Request("?".join([self.url, self.urlparams]),
-                                     data=None, headers=self._hdrs,  # type: ignore  # noqa
-                                     method="PUT")
-        if req.type not in ('http', 'https'):
-            LOG.error('http or https, not %s', req.type)
-            return False
-        return self._HTTP_REQUEST_METHOD(r3api, req)
+        return self._send_api(r3api, K2hr3HTTPMethod.PUT)
 
     def GET(self, r3api: K2hr3Api) -> bool:   # pylint: disable=invalid-name # noqa
         """Send requests by using GET Method."""
-        self._init_request()
-        # 1. Constructs request url using K2hr3Api.path property.
-        r3api_path = r3api._api_path(K2hr3HTTPMethod.GET)  # type: ignore # pylint: disable=protected-access # noqa
-        self.url = f"{self._baseurl}/{r3api_path}"
-
-        # 2. Constructs url parameters using K2hr3Api.params property.
-        if r3api.urlparams:
-            if isinstance(r3api.urlparams, dict):
-                query = urllib.parse.urlencode(r3api.urlparams)
-            else:
-                query = urllib.parse.urlencode(json.loads(r3api.urlparams))
-            self.urlparams = query
-        url = self.url
-        if self.urlparams:
-            url = "?".join([self.url, self.urlparams])
-
-        # 3. Constructs headers using K2hr3Api.headers property.
-        if self._hdrs:
-            self._hdrs.update(r3api.headers)
-
-        # 4. Sends a request.
-        req = urllib.request.Request(url, headers=self._hdrs, method="GET")  # type: ignore  # noqa
-        if req.type not in ('http', 'https'):
-            LOG.error('http or https, not %s', req.type)
-            return False
-        return self._HTTP_REQUEST_METHOD(r3api, req)
+        return self._send_api(r3api, K2hr3HTTPMethod.GET)
 
     def HEAD(self, r3api: K2hr3Api) -> bool:   # pylint: disable=invalid-name # noqa
-        """Send requests by using GET Method."""
-        self._init_request()
-        # 1. Constructs request url using K2hr3Api.path property.
-        r3api_path = r3api._api_path(K2hr3HTTPMethod.HEAD)  # type: ignore # pylint: disable=protected-access # noqa
-        self.url = f"{self._baseurl}/{r3api_path}"
-
-        # 2. Constructs url parameters using K2hr3Api.params property.
-        if r3api.urlparams:
-            if isinstance(r3api.urlparams, dict):
-                query = urllib.parse.urlencode(r3api.urlparams)
-            else:
-                query = urllib.parse.urlencode(json.loads(r3api.urlparams))
-            self.urlparams = query
-        url = self.url
-        if self.urlparams:
-            url = "?".join([self.url, self.urlparams])
-
-        # 3. Constructs headers using K2hr3Api.headers property.
-        if self._hdrs:
-            self._hdrs.update(r3api.headers)  # type: ignore
-
-        # 4. Sends a request.
-        # NOTE: headers is expected "MutableMapping[str, str]"
-        req = urllib.request.Request(url, headers=self._hdrs, method="HEAD")  # type: ignore # noqa
-        if req.type not in ('http', 'https'):
-            LOG.error('http or https, not %s', req.type)
-            return False
-        return self._HTTP_REQUEST_METHOD(r3api, req)
+        """Send requests by using HEAD Method."""
+        return self._send_api(r3api, K2hr3HTTPMethod.HEAD)
 
     def DELETE(self, r3api: K2hr3Api) -> bool:   # pylint: disable=invalid-name # noqa
         """Send requests by using DELETE Method."""
-        self._init_request()
-        # 1. Constructs request url using K2hr3Api.path property.
-        r3api_path = r3api._api_path(K2hr3HTTPMethod.DELETE)  # type: ignore # pylint: disable=protected-access # noqa
-        self.url = f"{self._baseurl}/{r3api_path}"
-
-        # 2. Constructs url parameters using K2hr3Api.params property.
-        if r3api.urlparams:
-            if isinstance(r3api.urlparams, dict):
-                query = urllib.parse.urlencode(r3api.urlparams)
-            else:
-                query = urllib.parse.urlencode(json.loads(r3api.urlparams))
-            self.urlparams = query
-        url = self.url
-        if self.urlparams:
-            url = "?".join([self.url, self.urlparams])
-
-        # 3. Constructs headers using K2hr3Api.headers property.
-        if self._hdrs:
-            self._hdrs.update(r3api.headers)  # type: ignore
-
-        # 4. Sends a request.
-        # NOTE: headers is expected "MutableMapping[str, str]"
-        req = urllib.request.Request(url, headers=self._hdrs, method="HEAD")  # type: ignore # noqa
-        if req.type not in ('http', 'https'):
-            LOG.error('http or https, not %s', req.type)
-            return False
-        return self._HTTP_REQUEST_METHOD(r3api, req)
+        return self._send_api(r3api, K2hr3HTTPMethod.DELETE)
 
 #
 # Local variables:
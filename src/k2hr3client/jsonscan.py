@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""K2HR3 Python Client of the incremental JSON scanner.
+
+A JSON document is scanned in chunks and only the values at the given paths
+are decoded. The other values are skipped without being decoded.
+
+.. code-block:: python
+
+    # Import modules from k2hr3client package.
+    from k2hr3client.jsonscan import find_json, iter_json
+
+    body = '{"result": true, "role": {"policies": ["p1"], "hosts": {}}}'
+    find_json([body], ('role', 'policies'))  // ['p1']
+    list(iter_json([body], ('role', 'policies')))  // ['p1']
+
+"""
+
+import json
+import logging
+import re
+from typing import Any, Iterable, Iterator, List, Sequence
+
+from k2hr3client.exception import K2hr3Exception
+
+LOG = logging.getLogger(__name__)
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING_END = re.compile(r'["\\]')
+# NOTE: The unread text that may continue a decoded number.
+_NUMBER_TAIL = re.compile(r'[0-9.eE+\-]*\Z')
+
+# NOTE: The consumed text is dropped from the buffer at this size.
+_COMPACT_SIZE = 65536
+
+
+class _JsonScanner():
+    """Scan a JSON document in chunks."""
+
+    __slots__ = ('_chunks', '_buf', '_pos', '_eof')
+
+    def __init__(self, chunks: Iterable[str]) -> None:
+        self._chunks = iter(chunks)
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read the next chunk. Return False at the end of the document."""
+        if self._eof:
+            return False
+        if self._pos >= _COMPACT_SIZE:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self._buf += chunk
+                return True
+        self._eof = True
+        return False
+
+    def peek(self) -> str:
+        """Skip whitespaces and return the next character."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()  # type: ignore # noqa
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars: str) -> str:
+        """Consume the next character that must be one of the chars."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise K2hr3Exception(
+                f'invalid json, expected {chars!r}, not {char!r}')
+        self._pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next value."""
+        self.peek()
+        while True:
+            try:
+                val, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as error:
+                if not self._more():
+                    raise K2hr3Exception(f'invalid json, {error}') from error
+                continue
+            # NOTE: A number followed only by the characters of a number,
+            # like "1." or "2e", may continue in the next chunk.
+            if isinstance(val, (int, float)) and \
+                    not isinstance(val, bool) and not self._eof and \
+                    _NUMBER_TAIL.match(self._buf, end) and self._more():
+                continue
+            self._pos = end
+            return val
+
+    def _more(self) -> bool:
+        """Read chunks until the unread text is doubled."""
+        size = max(len(self._buf) - self._pos, 1)
+        target = len(self._buf) + size
+        found = False
+        while len(self._buf) < target and self._fill():
+            found = True
+        return found
+
+    def skip(self) -> None:
+        """Skip the next value without decoding it."""
+        char = self.peek()
+        if char not in '[{':
+            self.value()
+            return
+        depth = 0
+        while True:
+            match = _STRUCTURE.search(self._buf, self._pos)
+            if match is None:
+                self._pos = len(self._buf)
+                if not self._fill():
+                    raise K2hr3Exception('invalid json, unexpected end')
+                continue
+            self._pos = match.end()
+            char = match.group()
+            if char == '"':
+                self._skip_string()
+            elif char in '[{':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def _skip_string(self) -> None:
+        """Skip the rest of a string."""
+        while True:
+            match = _STRING_END.search(self._buf, self._pos)
+            if match is None or match.end() == len(self._buf) and \
+                    match.group() == '\\':
+                self._pos = match.start() if match else len(self._buf)
+                if not self._fill():
+                    raise K2hr3Exception('invalid json, unexpected end')
+                continue
+            if match.group() == '\\':
+                self._pos = match.end() + 1
+                continue
+            self._pos = match.end()
+            return
+
+
+def _iter_container(scanner: _JsonScanner,
+                    paths: List[Sequence[str]],
+                    depth: int) -> Iterator[Any]:
+    """Iterate the elements of the container of the paths."""
+    char = scanner.expect('[{')
+    closing = ']' if char == '[' else '}'
+    targets = [path for path in paths if len(path) == depth]
+    if scanner.peek() == closing:
+        scanner.expect(closing)
+        return
+    while True:
+        if char == '{':
+            key = scanner.value()
+            scanner.expect(':')
+            if targets:
+                yield key, scanner.value()
+            else:
+                children = [path for path in paths if path[depth] == key]
+                if children and scanner.peek() in '[{':
+                    yield from _iter_container(scanner, children, depth + 1)
+                else:
+                    scanner.skip()
+        elif targets:
+            yield scanner.value()
+        else:
+            scanner.skip()
+        if scanner.expect(',' + closing) == closing:
+            return
+
+
+def iter_json(chunks: Iterable[str], *paths: Sequence[str]) -> Iterator[Any]:
+    """Iterate the elements of the containers at the paths.
+
+    An element of an array is yielded as is. A member of an object is
+    yielded as a tuple of the key and the value. The elements of several
+    paths are yielded in the order of the document.
+
+    :param chunks: the JSON document by chunks
+    :type chunks: Iterable[str]
+    :param paths: the keys of the objects from the root to the containers
+    :type paths: Sequence[str]
+    :raise K2hr3Exception: if the document is invalid.
+    """
+    if not paths:
+        raise K2hr3Exception('paths should not be empty')
+    scanner = _JsonScanner(chunks)
+    yield from _iter_container(scanner, [tuple(path) for path in paths], 0)
+
+
+def find_json(chunks: Iterable[str], path: Sequence[str],
+              default: Any = None) -> Any:
+    """Return the value at the path without decoding the other values.
+
+    :param chunks: the JSON document by chunks
+    :type chunks: Iterable[str]
+    :param path: the keys of the objects from the root to the value
+    :type path: Sequence[str]
+    :param default: the value returned if the path is not found
+    :raise K2hr3Exception: if the document is invalid.
+    """
+    scanner = _JsonScanner(chunks)
+    for key in path:
+        char = scanner.peek()
+        if not char:
+            raise K2hr3Exception('invalid json, unexpected end')
+        if char != '{':
+            return default
+        scanner.expect('{')
+        if scanner.peek() == '}':
+            return default
+        while True:
+            name = scanner.value()
+            scanner.expect(':')
+            if name == key:
+                break
+            scanner.skip()
+            if scanner.expect(',}') == '}':
+                return default
+    return scanner.value()
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
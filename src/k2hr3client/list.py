@@ -48,7 +48,7 @@
 import logging
 from typing import Optional
 
-from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod
+from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod, json_headers
 from k2hr3client.exception import K2hr3Exception
 
 LOG = logging.getLogger(__name__)
@@ -60,7 +60,7 @@ class K2hr3List(K2hr3Api):  # pylint: disable=too-many-instance-attributes
     See https://k2hr3.antpick.ax/api_list.html
     """
 
-    __slots__ = ('_r3token', '_service', )
+    __slots__ = ('_r3token', '_service', 'expand')
 
     def __init__(self, r3token: str, service: str) -> None:
         """Init the members."""
@@ -69,10 +69,7 @@ class K2hr3List(K2hr3Api):  # pylint: disable=too-many-instance-attributes
         self.service = service
 
         # following attrs are dynamically set later.
-        self.headers = {
-            'Content-Type': 'application/json',
-            'x-auth-token': 'U={}'.format(self._r3token)
-        }
+        self.headers = json_headers(f'U={self._r3token}')
         self.body = None  # type: ignore
         self.urlparams = None
         # ---
@@ -151,6 +148,8 @@ class K2hr3List(K2hr3Api):  # pylint: disable=too-many-instance-attributes
         """Get the request url path."""
         if method == K2hr3HTTPMethod.GET:
             if self.api_id == 1:
+                if self.expand:
+                    self.urlparams = {'expand': True}
                 return f'{self.version}/{self.basepath}/{self.service}'
         if method == K2hr3HTTPMethod.HEAD:
             if self.api_id == 2:
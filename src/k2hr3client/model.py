@@ -0,0 +1,653 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""K2HR3 Python Client of typed response models.
+
+A member of a response is decoded when it is accessed. The response body is
+scanned for the member and the other values in the body are skipped without
+being decoded, so a small member of a large response is cheap. The whole body
+is decoded only if the data is accessed.
+
+.. code-block:: python
+
+    # Import modules from k2hr3client package.
+    from k2hr3client.http import K2hr3Http
+    from k2hr3client.model import K2hr3RoleModel, from_api
+    from k2hr3client.role import K2hr3Role
+
+    myhttp = K2hr3Http("http://127.0.0.1:18080")
+    myrole = K2hr3Role("gAAAAA...")
+    myhttp.GET(myrole.get("myrole", expand=False))
+
+    # Get the typed model of the response.
+    role = K2hr3RoleModel.from_response(myrole.resp)
+    role = from_api(myrole)  // same as above
+    role.policies  // ['yrn:yahoo:::demo:policy:mypolicy']
+    role.hosts[0].host  // 'localhost'
+
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from k2hr3client.acr import K2hr3Acr
+from k2hr3client.api import K2hr3Api, K2hr3ApiResponse
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client.jsonscan import find_json
+from k2hr3client.list import K2hr3List
+from k2hr3client.policy import K2hr3Policy
+from k2hr3client.resource import K2hr3Resource
+from k2hr3client.role import K2hr3Role, K2hr3RoleHost
+from k2hr3client.service import K2hr3Service
+from k2hr3client.tenant import K2hr3Tenant
+from k2hr3client.token import (K2hr3RoleToken, K2hr3RoleTokenIndex,
+                               K2hr3RoleTokenList, K2hr3Token)
+
+LOG = logging.getLogger(__name__)
+
+_NOT_DECODED = object()
+_NOT_FOUND = object()
+
+
+class K2hr3Model():
+    """Base class of all K2HR3 response models.
+
+    A model is built from a response body or from a decoded JSON object.
+    """
+
+    __slots__ = ('_body', '_data', '_members')
+
+    def __init__(self, body: Optional[str] = None, data: Any = _NOT_DECODED):
+        """Init the members."""
+        self._body = body
+        self._data = data
+        self._members = None  # type: Optional[Dict[Tuple[str, ...], Any]]
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return '<' + type(self).__name__ + '>'
+
+    @classmethod
+    def from_response(cls, resp: K2hr3ApiResponse):
+        """Return the model of the response.
+
+        The body is kept as is and the members are decoded when they are
+        accessed.
+
+        :raise K2hr3Exception: if the response is None.
+        """
+        if resp is None:
+            raise K2hr3Exception('no response')
+        return cls(resp.body)
+
+    def _decoded(self) -> Any:
+        """Decode the whole body at the first call."""
+        if self._data is _NOT_DECODED:
+            self._data = json.loads(self._body) if self._body else {}
+        return self._data
+
+    @property
+    def data(self) -> Any:
+        """Return the decoded JSON object."""
+        return self._decoded()
+
+    def _member(self, *path: str, default: Any = None) -> Any:
+        """Return the value at the path of the keys.
+
+        The value is scanned from the body if the body is not decoded.
+
+        :raise K2hr3Exception: if the body is not a JSON document.
+        """
+        if self._data is _NOT_DECODED and self._body:
+            if self._members is None:
+                self._members = {}
+            if path not in self._members:
+                self._members[path] = find_json((self._body,), path,
+                                                _NOT_FOUND)
+            value = self._members[path]
+            return default if value is _NOT_FOUND else value
+        value = self._decoded()
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                return default
+            value = value[key]
+        return value
+
+    def _get(self, key: str, default: Any = None) -> Any:
+        """Return the value of the key in the JSON object."""
+        return self._member(key, default=default)
+
+    @property
+    def result(self) -> bool:
+        """Return the result."""
+        return bool(self._get('result', False))
+
+    @property
+    def message(self) -> Optional[str]:
+        """Return the message."""
+        return self._get('message')
+
+
+class _K2hr3CachedModel(K2hr3Model):
+    """Base class of models that cache the wrapped sub-structures."""
+
+    __slots__ = ('_cache',)
+
+    def __init__(self, body: Optional[str] = None, data: Any = _NOT_DECODED):
+        """Init the members."""
+        super().__init__(body, data)
+        self._cache = None  # type: Optional[Dict[str, Any]]
+
+    def _cached(self, key: str, factory) -> Any:
+        """Return the cached value or make it with the factory."""
+        if self._cache is None:
+            self._cache = {}
+        if key not in self._cache:
+            self._cache[key] = factory()
+        return self._cache[key]
+
+
+class K2hr3TokenModel(K2hr3Model):
+    """Represent the response of K2HR3 TOKEN API."""
+
+    __slots__ = ()
+
+    @property
+    def token(self) -> Optional[str]:
+        """Return the token."""
+        return self._get('token')
+
+    @property
+    def scoped(self) -> bool:
+        """Return True if the token is a scoped token."""
+        return bool(self._get('scoped', False))
+
+    @property
+    def user(self) -> Optional[str]:
+        """Return the user."""
+        return self._get('user')
+
+    @property
+    def tenants(self) -> List[dict]:
+        """Return the tenants of the user."""
+        return self._get('tenants') or []
+
+    @property
+    def expire(self) -> Any:
+        """Return the expire if the server returns it."""
+        return self._get('expire')
+
+
+class K2hr3RoleTokenModel(K2hr3Model):
+    """Represent the response of K2HR3 ROLE TOKEN API."""
+
+    __slots__ = ()
+
+    @property
+    def token(self) -> Optional[str]:
+        """Return the role token."""
+        return self._get('token')
+
+    @property
+    def registerpath(self) -> Optional[str]:
+        """Return the registerpath."""
+        return self._get('registerpath')
+
+
+class K2hr3RoleTokenEntryModel(K2hr3Model):
+    """Represent a role token in the response of ROLE TOKEN LIST API."""
+
+    __slots__ = ('_token',)
+
+    def __init__(self, token: str, data: Any):
+        """Init the members."""
+        super().__init__(data=data if isinstance(data, dict) else {})
+        self._token = token
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3RoleTokenEntryModel _token={self._token!r}>'
+
+    @property
+    def token(self) -> str:
+        """Return the role token."""
+        return self._token
+
+    @property
+    def registerpath(self) -> Optional[str]:
+        """Return the registerpath."""
+        return self._get('registerpath')
+
+    @property
+    def date(self) -> Optional[str]:
+        """Return the created date."""
+        return self._get('date')
+
+    @property
+    def expire(self) -> Optional[str]:
+        """Return the expire date."""
+        return self._get('expire')
+
+    @property
+    def user(self) -> Optional[str]:
+        """Return the user who created the token."""
+        return self._get('user')
+
+    @property
+    def hostname(self) -> Optional[str]:
+        """Return the hostname."""
+        return self._get('hostname')
+
+    @property
+    def ip(self) -> Optional[str]:  # pylint: disable=invalid-name
+        """Return the ip address."""
+        return self._get('ip')
+
+    @property
+    def port(self) -> Any:
+        """Return the port."""
+        return self._get('port')
+
+    @property
+    def cuk(self) -> Optional[str]:
+        """Return the container unique key."""
+        return self._get('cuk')
+
+
+class K2hr3RoleTokenListModel(_K2hr3CachedModel):
+    """Represent the response of K2HR3 ROLE TOKEN LIST API."""
+
+    __slots__ = ()
+
+    @property
+    def tokens(self) -> List[str]:
+        """Return the role tokens."""
+        return list(self._get('tokens') or [])
+
+    def entry(self, token: str) -> Optional[K2hr3RoleTokenEntryModel]:
+        """Return the details of the role token."""
+        entry = self._member('tokens', token, default=_NOT_FOUND)
+        if entry is _NOT_FOUND:
+            return None
+        return K2hr3RoleTokenEntryModel(token, entry)
+
+    @property
+    def index(self) -> K2hr3RoleTokenIndex:
+        """Return the index of the role tokens."""
+        return self._cached(
+            'index', lambda: K2hr3RoleTokenIndex(self._get('tokens')))
+
+    def registerpath(self, token: str) -> Optional[str]:
+        """Return the registerpath of the role token."""
+        return self.index.registerpath(token)
+
+
+def to_role_host(entry: Any) -> K2hr3RoleHost:
+    """Return a K2hr3RoleHost of a host in the response of ROLE API.
+
+    A host is a string like "<host> <port> <cuk> <extra> <tag> <inboundip>
+    <outboundip>" or an object.
+    """
+    fields = ['host', 'port', 'cuk', 'extra', 'tag', 'inboundip',
+              'outboundip']
+    if isinstance(entry, dict):
+        values = [entry.get(key) for key in fields]
+        if values[0] is None:
+            values[0] = entry.get('ip')
+        values = ['' if val is None else str(val) for val in values]
+    else:
+        values = str(entry).split(' ', len(fields) - 1)
+        values.extend([''] * (len(fields) - len(values)))
+    return K2hr3RoleHost(*values)
+
+
+class K2hr3RoleModel(_K2hr3CachedModel):
+    """Represent the response of K2HR3 ROLE API."""
+
+    __slots__ = ()
+
+    @property
+    def policies(self) -> List[str]:
+        """Return the policies."""
+        return self._member('role', 'policies') or []
+
+    @property
+    def aliases(self) -> List[str]:
+        """Return the aliases which are the nested roles."""
+        return self._member('role', 'aliases') or []
+
+    @property
+    def hostnames(self) -> List[Any]:
+        """Return the hosts that are registered by the hostname."""
+        return self._member('role', 'hosts', 'hostnames') or []
+
+    @property
+    def ips(self) -> List[Any]:
+        """Return the hosts that are registered by the ip address."""
+        return self._member('role', 'hosts', 'ips') or []
+
+    @property
+    def hosts(self) -> List[K2hr3RoleHost]:
+        """Return the hosts and ip addresses as K2hr3RoleHost."""
+        return self._cached(
+            'hosts',
+            lambda: [to_role_host(entry)
+                     for entry in self.hostnames + self.ips])
+
+
+class K2hr3ResourceModel(K2hr3Model):
+    """Represent the response of K2HR3 RESOURCE API."""
+
+    __slots__ = ()
+
+    def _resource(self) -> Any:
+        return self._get('resource')
+
+    def _field(self, key: str) -> Any:
+        return self._member('resource', key)
+
+    @property
+    def data(self) -> Any:  # type: ignore[override]
+        """Return the resource data.
+
+        The string data is preferred to the object data.
+        """
+        resource = self._resource()
+        if isinstance(resource, dict) and \
+                ('string' in resource or 'object' in resource):
+            if resource.get('string') is not None:
+                return resource.get('string')
+            return resource.get('object')
+        return resource
+
+    @property
+    def keys(self) -> Dict[str, Any]:
+        """Return the resource keys."""
+        return self._field('keys') or {}
+
+    @property
+    def expire(self) -> Any:
+        """Return the expire."""
+        return self._field('expire')
+
+    @property
+    def aliases(self) -> List[str]:
+        """Return the aliases."""
+        return self._field('aliases') or []
+
+
+class K2hr3PolicyModel(K2hr3Model):
+    """Represent the response of K2HR3 POLICY API."""
+
+    __slots__ = ()
+
+    def _field(self, key: str) -> Any:
+        return self._member('policy', key)
+
+    @property
+    def name(self) -> Optional[str]:
+        """Return the name."""
+        return self._field('name')
+
+    @property
+    def effect(self) -> Optional[str]:
+        """Return the effect."""
+        return self._field('effect')
+
+    @property
+    def action(self) -> List[str]:
+        """Return the actions."""
+        return self._field('action') or []
+
+    @property
+    def resource(self) -> List[str]:
+        """Return the resources."""
+        return self._field('resource') or []
+
+    @property
+    def condition(self) -> Any:
+        """Return the condition."""
+        return self._field('condition')
+
+    @property
+    def aliases(self) -> List[str]:
+        """Return the aliases."""
+        return self._field('alias') or []
+
+
+class K2hr3TenantModel(K2hr3Model):
+    """Represent a tenant in the response of K2HR3 TENANT API."""
+
+    __slots__ = ()
+
+    def _field(self, key: str) -> Any:
+        tenant = self._get('tenant')
+        if isinstance(tenant, dict):
+            return tenant.get(key)
+        return self._get(key)
+
+    @property
+    def name(self) -> Optional[str]:
+        """Return the name."""
+        if isinstance(self._data, str):
+            return self._data
+        return self._field('name')
+
+    @property
+    def id(self) -> Any:  # pylint: disable=invalid-name
+        """Return the id."""
+        return self._field('id')
+
+    @property
+    def desc(self) -> Optional[str]:
+        """Return the description."""
+        return self._field('desc')
+
+    @property
+    def display(self) -> Optional[str]:
+        """Return the display name."""
+        return self._field('display')
+
+    @property
+    def users(self) -> List[str]:
+        """Return the users."""
+        return self._field('users') or []
+
+
+class K2hr3TenantListModel(_K2hr3CachedModel):
+    """Represent the tenant list in the response of K2HR3 TENANT API."""
+
+    __slots__ = ()
+
+    @property
+    def tenants(self) -> List[K2hr3TenantModel]:
+        """Return the tenants."""
+        return self._cached(
+            'tenants',
+            lambda: [K2hr3TenantModel(data=tenant)
+                     for tenant in self._get('tenants') or []])
+
+    @property
+    def names(self) -> List[str]:
+        """Return the tenant names."""
+        return [tenant.name for tenant in self.tenants]  # type: ignore
+
+
+class K2hr3ServiceModel(K2hr3Model):
+    """Represent the response of K2HR3 SERVICE API."""
+
+    __slots__ = ()
+
+    def _field(self, key: str) -> Any:
+        return self._member('service', key)
+
+    @property
+    def name(self) -> Optional[str]:
+        """Return the name."""
+        return self._field('name')
+
+    @property
+    def owner(self) -> Optional[str]:
+        """Return the owner tenant."""
+        return self._field('owner')
+
+    @property
+    def verify(self) -> Any:
+        """Return the verify url or the static resources."""
+        return self._field('verify')
+
+    @property
+    def tenants(self) -> List[str]:
+        """Return the member tenants."""
+        return self._field('tenant') or []
+
+
+class K2hr3AcrResourceModel(K2hr3Model):
+    """Represent a resource in the response of K2HR3 ACR API."""
+
+    __slots__ = ()
+
+    @property
+    def name(self) -> Optional[str]:
+        """Return the name."""
+        return self._get('name')
+
+    @property
+    def expire(self) -> Any:
+        """Return the expire."""
+        return self._get('expire')
+
+    @property
+    def type(self) -> Optional[str]:
+        """Return the data type."""
+        return self._get('type')
+
+    @property
+    def data(self) -> Any:  # type: ignore[override]
+        """Return the resource data."""
+        return self._get('data')
+
+    @property
+    def keys(self) -> Dict[str, Any]:
+        """Return the resource keys."""
+        return self._get('keys') or {}
+
+
+class K2hr3AcrModel(_K2hr3CachedModel):
+    """Represent the response of K2HR3 ACR API."""
+
+    __slots__ = ()
+
+    @property
+    def tokeninfo(self) -> Dict[str, Any]:
+        """Return the credential details."""
+        return self._get('tokeninfo') or {}
+
+    @property
+    def resources(self) -> List[K2hr3AcrResourceModel]:
+        """Return the available resources."""
+        return self._cached(
+            'resources',
+            lambda: [K2hr3AcrResourceModel(data=resource)
+                     for resource in self._get('response') or []])
+
+
+class K2hr3ListModel(_K2hr3CachedModel):
+    """Represent the response of K2HR3 LIST API.
+
+    A child is a YRN path string or an object that has the name and the
+    children.
+    """
+
+    __slots__ = ()
+
+    @property
+    def children(self) -> List['K2hr3ListModel']:
+        """Return the children."""
+        return self._cached(
+            'children',
+            lambda: [K2hr3ListModel(data=child)
+                     for child in self._children()])
+
+    def _children(self) -> List[Any]:
+        return self._get('children') or []
+
+    @property
+    def name(self) -> Optional[str]:
+        """Return the YRN path."""
+        if isinstance(self._data, str):
+            return self._data
+        return self._get('name')
+
+    @property
+    def names(self) -> List[str]:
+        """Return the YRN paths of the children."""
+        return [child.name for child in self.children  # type: ignore
+                if child.name is not None]
+
+    def walk(self):
+        """Iterate the YRN paths of all descendants in depth-first order."""
+        for child in self.children:
+            if child.name is not None:
+                yield child.name
+            yield from child.walk()
+
+
+# NOTE: API class, api_id -> model class. None means any api_id.
+_MODELS = {
+    K2hr3Token: {None: K2hr3TokenModel},
+    K2hr3RoleToken: {None: K2hr3RoleTokenModel},
+    K2hr3RoleTokenList: {None: K2hr3RoleTokenListModel},
+    K2hr3Role: {7: K2hr3RoleTokenListModel, None: K2hr3RoleModel},
+    K2hr3Resource: {None: K2hr3ResourceModel},
+    K2hr3Policy: {None: K2hr3PolicyModel},
+    K2hr3Tenant: {5: K2hr3TenantListModel, None: K2hr3TenantModel},
+    K2hr3Service: {None: K2hr3ServiceModel},
+    K2hr3Acr: {None: K2hr3AcrModel},
+    K2hr3List: {None: K2hr3ListModel},
+}  # type: Dict[type, Dict[Optional[int], type]]
+
+
+def from_api(r3api: K2hr3Api) -> K2hr3Model:
+    """Return the typed model of the response of the API.
+
+    :param r3api: the API instance that has a response
+    :type r3api: K2hr3Api
+    :returns: model
+    :rtype: K2hr3Model
+    :raise K2hr3Exception: if the API has no response.
+    """
+    for klass in type(r3api).__mro__:
+        models = _MODELS.get(klass)
+        if models:
+            model = models.get(r3api.api_id, models[None])
+            return model.from_response(r3api.resp)
+    return K2hr3Model.from_response(r3api.resp)
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
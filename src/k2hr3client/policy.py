@@ -60,7 +60,7 @@ from typing import List, Optional
 import warnings
 
 
-from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod
+from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod, json_headers
 
 LOG = logging.getLogger(__name__)
 
@@ -84,7 +84,8 @@ class K2hr3Policy(K2hr3Api):  # pylint: disable=too-many-instance-attributes
     See https://k2hr3.antpick.ax/api_policy.html for details.
     """
 
-    __slots__ = ('_r3token',)
+    __slots__ = ('_r3token', 'name', 'effect', 'action', 'resource',
+                 'condition', 'alias', 'service', 'tenant')
 
     def __init__(self, r3token: str) -> None:
         """Init the members."""
@@ -93,14 +94,9 @@ class K2hr3Policy(K2hr3Api):  # pylint: disable=too-many-instance-attributes
 
         # following attrs are dynamically set later.
         if r3token:
-            self.headers = {
-                'Content-Type': 'application/json',
-                'x-auth-token': 'U={}'.format(self._r3token)
-            }
+            self.headers = json_headers(f'U={self._r3token}')
         else:
-            self.headers = {
-                'Content-Type': 'application/json',
-            }
+            self.headers = json_headers()
         self.body = None
         self.urlparams = None
         # attributes that are unique to this class
@@ -240,28 +236,28 @@ class K2hr3Policy(K2hr3Api):  # pylint: disable=too-many-instance-attributes
                 return f'{self.version}/{self.basepath}'
         if method == K2hr3HTTPMethod.PUT:
             if self.api_id == 1:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'name': self.name,
                     'effect': self.effect,
                     'action': self.action,
                     'resource': self.resource,
                     'alias': self.alias
-                })
+                }
                 return f'{self.version}/{self.basepath}'
         if method == K2hr3HTTPMethod.GET:
             if self.api_id == 3:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'service': self.service
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.name}'
         if method == K2hr3HTTPMethod.HEAD:
             if self.api_id == 4:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'tenant': self.tenant,
                     'resource': self.resource,
                     'action': self.action,
                     'service': self.service
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.name}'
         if method == K2hr3HTTPMethod.DELETE:
             if self.api_id == 5:
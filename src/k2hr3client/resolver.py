@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""K2HR3 Python Client of the role hierarchy resolver.
+
+The roles are got without the expansion and the nested roles(aliases) are
+expanded in the client. A role is got once while it is cached, so expanding
+several roles that share nested roles costs a small request per role.
+
+.. code-block:: python
+
+    # Import modules from k2hr3client package.
+    from k2hr3client.http import K2hr3Http
+    from k2hr3client.resolver import K2hr3RoleResolver
+
+    myhttp = K2hr3Http("http://127.0.0.1:18080")
+    resolver = K2hr3RoleResolver(myhttp, "gAAAAA...", ttl=60)
+
+    role = resolver.resolve("yrn:yahoo:::demo:role:myrole")
+    // or resolver.resolve("myrole") if the resolver is created with
+    // tenant="demo"
+    role.roles  // ('yrn:yahoo:::demo:role:myrole', 'yrn:...:nested', ...)
+    role.policies  // ('yrn:yahoo:::demo:policy:mypolicy', ...)
+    role.hosts[0].host  // 'localhost'
+
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from k2hr3client.api import K2hr3HTTPMethod
+from k2hr3client.bulk import DEFAULT_MAX_WORKERS, role_host_key, send_api
+from k2hr3client.cache import K2hr3ExpiringCache
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client.http import K2hr3Http
+from k2hr3client.model import K2hr3RoleModel
+from k2hr3client.role import K2hr3Role, K2hr3RoleHost
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_ROLE_TTL_SECONDS = 60
+
+
+class K2hr3RoleNode():
+    """Represent a role that is not expanded."""
+
+    __slots__ = ('name', 'policies', 'aliases', 'hosts')
+
+    def __init__(self, name: str, policies: Iterable[str],
+                 aliases: Iterable[str],
+                 hosts: Iterable[K2hr3RoleHost]) -> None:
+        """Init the members."""
+        self.name = name
+        self.policies = tuple(policies)
+        self.aliases = tuple(aliases)
+        self.hosts = tuple(hosts)
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3RoleNode name={self.name!r} ' \
+               f'aliases={list(self.aliases)!r}>'
+
+
+class K2hr3ResolvedRole():
+    """Represent a role that is expanded with the nested roles.
+
+    The policies and the hosts are unique and ordered as they are found in
+    the depth first order of the roles.
+    """
+
+    __slots__ = ('name', 'roles', 'policies', 'hosts', '_nodes')
+
+    def __init__(self, name: str, roles: Tuple[str, ...],
+                 policies: Tuple[str, ...],
+                 hosts: Tuple[K2hr3RoleHost, ...],
+                 nodes: Dict[str, K2hr3RoleNode]) -> None:
+        """Init the members."""
+        self.name = name
+        self.roles = roles
+        self.policies = policies
+        self.hosts = hosts
+        # NOTE: the nodes that the expansion depends on.
+        self._nodes = nodes
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3ResolvedRole name={self.name!r} ' \
+               f'roles={len(self.roles)} policies={len(self.policies)} ' \
+               f'hosts={len(self.hosts)}>'
+
+
+class K2hr3RoleResolver():
+    """Expand the nested roles in the client.
+
+    The roles are cached for the ttl seconds. The expansion of a role is
+    reused until one of the roles it depends on is got again. The roles of
+    the tenant are keyed by the YRN full paths, so a role name and the YRN
+    full path of it share the cached role.
+    """
+
+    __slots__ = ('_http', '_r3token', '_tenant', '_ttl', '_max_workers',
+                 '_clock', '_maxsize', '_nodes', '_memo', '_lock')
+
+    def __init__(self, r3http: K2hr3Http, r3token: str,  # pylint: disable=too-many-arguments # noqa
+                 ttl: float = DEFAULT_ROLE_TTL_SECONDS,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 maxsize: int = 1024,
+                 clock: Callable[[], float] = time.time,
+                 tenant: Optional[str] = None) -> None:
+        """Init the members.
+
+        :param r3http: the http client of the K2HR3 API server
+        :type r3http: K2hr3Http
+        :param r3token: the K2HR3 token
+        :type r3token: str
+        :param ttl: the seconds a role is cached
+        :type ttl: float
+        :param max_workers: the max number of concurrent requests
+        :type max_workers: int
+        :param maxsize: the max number of cached roles and expansions
+        :type maxsize: int
+        :param tenant: the tenant of the role names that are not YRN full
+                       paths
+        :type tenant: str
+        """
+        self._http = r3http
+        self._r3token = r3token
+        self._tenant = tenant
+        self._ttl = ttl
+        self._max_workers = max_workers
+        self._clock = clock
+        self._maxsize = maxsize
+        self._nodes = K2hr3ExpiringCache(maxsize=maxsize, refresh_ahead=0,
+                                         background=False, clock=clock)
+        self._memo = OrderedDict()  # type: OrderedDict[str, K2hr3ResolvedRole] # noqa
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3RoleResolver roles={len(self._nodes)} ' \
+               f'ttl={self._ttl}>'
+
+    def role_key(self, name: str) -> str:
+        """Return the key of a role.
+
+        A role name is converted to the YRN full path if the tenant is given.
+        """
+        name = name.strip()
+        if self._tenant is None or name.startswith('yrn:'):
+            return name
+        return f'yrn:yahoo:::{self._tenant}:role:{name.strip("/")}'
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Remove a role or all roles if the name is None."""
+        if name is None:
+            self._nodes.invalidate()
+            with self._lock:
+                self._memo.clear()
+            return
+        key = self.role_key(name)
+        self._nodes.invalidate(key)
+        with self._lock:
+            self._memo.pop(key, None)
+
+    def node(self, name: str) -> K2hr3RoleNode:
+        """Return the role that is not expanded.
+
+        :raise K2hr3Exception: if the role could not be got.
+        """
+        key = self.role_key(name)
+        return self._nodes.get(key, lambda: self._load(key))
+
+    def _load(self, name: str) -> Tuple[K2hr3RoleNode, float]:
+        """GET the role without the expansion."""
+        myrole = K2hr3Role(self._r3token).get(name, expand=False)
+        model = K2hr3RoleModel.from_response(
+            send_api(self._http, myrole, K2hr3HTTPMethod.GET))
+        node = K2hr3RoleNode(name, model.policies, model.aliases, model.hosts)
+        return node, self._clock() + self._ttl
+
+    def graph(self, names: Iterable[str]) -> Dict[str, K2hr3RoleNode]:
+        """Return the roles and the nested roles of them.
+
+        The roles of the same depth are got concurrently.
+
+        :raise K2hr3Exception: if a role could not be got.
+        """
+        nodes = {}  # type: Dict[str, K2hr3RoleNode]
+        level = list(dict.fromkeys(self.role_key(name) for name in names))
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            while level:
+                for node in executor.map(self.node, level):
+                    nodes[node.name] = node
+                level = list(dict.fromkeys(
+                    key for name in level
+                    for key in map(self.role_key, nodes[name].aliases)
+                    if key not in nodes))
+        return nodes
+
+    def resolve(self, name: str) -> K2hr3ResolvedRole:
+        """Return the role that is expanded with the nested roles.
+
+        :raise K2hr3Exception: if a role could not be got or the roles
+                               are nested circularly.
+        """
+        return self._resolve(self.role_key(name), self.graph([name]), ())
+
+    def resolve_all(self, names: Iterable[str]
+                    ) -> Dict[str, K2hr3ResolvedRole]:
+        """Return the roles that are expanded with the nested roles.
+
+        The results are keyed by the given names.
+
+        :raise K2hr3Exception: if a role could not be got or the roles
+                               are nested circularly.
+        """
+        names = list(names)
+        nodes = self.graph(names)
+        return {name: self._resolve(self.role_key(name), nodes, ())
+                for name in names}
+
+    def _resolve(self, name: str, nodes: Dict[str, K2hr3RoleNode],
+                 path: Tuple[str, ...]) -> K2hr3ResolvedRole:
+        """Expand a role by the depth first search.
+
+        The name is the key of the role.
+        """
+        if name in path:
+            cycle = ' -> '.join(path[path.index(name):] + (name,))
+            raise K2hr3Exception(f'circular nested roles, {cycle}')
+        with self._lock:
+            resolved = self._memo.get(name)
+            if resolved is not None:
+                self._memo.move_to_end(name)
+        if resolved is not None and all(
+                nodes.get(key) is node
+                for key, node in resolved._nodes.items()):  # pylint: disable=protected-access # noqa
+            return resolved
+
+        node = nodes[name]
+        roles = {name: None}  # type: Dict[str, None]
+        policies = dict.fromkeys(node.policies)  # type: Dict[str, None]
+        hosts = {}  # type: Dict[Tuple[str, str, str], K2hr3RoleHost]
+        for host in node.hosts:
+            hosts.setdefault(role_host_key(host), host)
+        depends = {name: node}
+        for alias in node.aliases:
+            nested = self._resolve(self.role_key(alias), nodes,
+                                   path + (name,))
+            roles.update(dict.fromkeys(nested.roles))
+            policies.update(dict.fromkeys(nested.policies))
+            for host in nested.hosts:
+                hosts.setdefault(role_host_key(host), host)
+            depends.update(nested._nodes)  # pylint: disable=protected-access # noqa
+        resolved = K2hr3ResolvedRole(name, tuple(roles), tuple(policies),
+                                     tuple(hosts.values()), depends)
+        with self._lock:
+            self._memo[name] = resolved
+            self._memo.move_to_end(name)
+            while len(self._memo) > self._maxsize:
+                self._memo.popitem(last=False)
+        return resolved
+
+    def hosts(self, names: Iterable[str]) -> List[K2hr3RoleHost]:
+        """Return the unique hosts of the roles that are expanded."""
+        hosts = {}  # type: Dict[Tuple[str, str, str], K2hr3RoleHost]
+        for resolved in self.resolve_all(names).values():
+            for host in resolved.hosts:
+                hosts.setdefault(role_host_key(host), host)
+        return list(hosts.values())
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
@@ -53,13 +53,24 @@
         )
     myresource.resp.body // {"result":true...
 
+    # POST a large resource data from a file with chunked transfer encoding.
+    myresource = K2hr3Resource(mytoken.token)
+    myhttp.POST(
+        myresource.create_conf_resource(
+            name="test_resource",
+            data_type="string",
+            resource_data=K2hr3ResourceData("/path/to/data")))
+
 """
 
+import codecs
 import json
 import logging
-from typing import Optional
+import os
+from typing import IO, Any, Dict, Iterable, Iterator, Optional, Union
 
-from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod
+from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod, json_headers
+from k2hr3client.exception import K2hr3Exception
 
 LOG = logging.getLogger(__name__)
 
@@ -96,6 +107,103 @@ _RESOURCE_API_CREATE_RESOURCE_WITH_NO_TOKEN = """
     }
 }
 """
+_DEFAULT_CHUNK_SIZE = 65536
+
+
+class K2hr3ResourceData():
+    """Read a large resource data by chunks.
+
+    The source is the path of a file, a file object or an iterable of str or
+    bytes. The bytes are decoded as UTF-8 incrementally. A data of a path can
+    be read again when a request is retried, but a data of a file object or
+    an iterable can be read only once.
+    """
+
+    __slots__ = ('_source', '_chunk_size', '_consumed')
+
+    def __init__(self, source: Union[str, os.PathLike, IO, Iterable],
+                 chunk_size: int = _DEFAULT_CHUNK_SIZE) -> None:
+        """Init the members.
+
+        :param source: the path, the file object or the iterable
+        :param chunk_size: the size of a chunk to read from a file
+        :type chunk_size: int
+        :raise K2hr3Exception: if the chunk size is not positive.
+        """
+        if chunk_size < 1:
+            raise K2hr3Exception(
+                f'chunk_size should be positive, not {chunk_size}')
+        self._source = source
+        self._chunk_size = chunk_size
+        self._consumed = False
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3ResourceData source={self._source!r}>'
+
+    def _read(self, fileobj: IO) -> Iterator[Any]:
+        while True:
+            chunk = fileobj.read(self._chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def chunks(self) -> Iterator[str]:
+        """Iterate the data by chunks of str.
+
+        :raise K2hr3Exception: if a one-time source is read again.
+        """
+        if isinstance(self._source, (str, os.PathLike)):
+            with open(self._source, 'rb') as fileobj:
+                yield from self._decode(self._read(fileobj))
+            return
+        if self._consumed:
+            raise K2hr3Exception(f'{self!r} can be read only once')
+        self._consumed = True
+        if hasattr(self._source, 'read'):
+            yield from self._decode(self._read(self._source))  # type: ignore[arg-type] # noqa
+        else:
+            yield from self._decode(iter(self._source))  # type: ignore[arg-type] # noqa
+
+    @staticmethod
+    def _decode(chunks: Iterator[Any]) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        for chunk in chunks:
+            text = chunk if isinstance(chunk, str) else decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b'', final=True)
+        if text:
+            yield text
+
+
+class _K2hr3ResourceBody():
+    """Iterate the JSON body of a resource by chunks of bytes.
+
+    The data is escaped and encoded by chunks, so the body is never built in
+    memory. An iterable body is sent with chunked transfer encoding.
+    """
+
+    __slots__ = ('_head', '_data')
+
+    def __init__(self, fields: Dict[str, Any],
+                 data: K2hr3ResourceData) -> None:
+        # NOTE: the data is the last member to be streamed.
+        members = ''.join(f'{json.dumps(key)}: {json.dumps(val)}, '
+                          for key, val in fields.items())
+        self._head = f'{{"resource": {{{members}"data": "'.encode('ascii')
+        self._data = data
+
+    def __repr__(self) -> str:
+        return f'<_K2hr3ResourceBody data={self._data!r}>'
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._head
+        for text in self._data.chunks():
+            # NOTE: json.dumps escapes the non-ASCII characters, so the
+            # escaped chunk is ASCII.
+            yield json.dumps(text)[1:-1].encode('ascii')
+        yield b'"}}'
 
 
 class K2hr3Resource(K2hr3Api):  # pylint: disable=too-many-instance-attributes
@@ -104,7 +212,9 @@ class K2hr3Resource(K2hr3Api):  # pylint: disable=too-many-instance-attributes
     See https://k2hr3.antpick.ax/api_resource.html for details.
     """
 
-    __slots__ = ('_r3token', '_roletoken', '_resource_path', )
+    __slots__ = ('_r3token', '_roletoken', '_resource_path', 'resource_data',
+                 'name', 'data_type', 'keys', 'alias', 'expand', 'service',
+                 'port', 'cuk', 'role')
 
     def __init__(self, r3token: Optional[str] = None,
                  roletoken: Optional[str] = None,
@@ -117,19 +227,11 @@ class K2hr3Resource(K2hr3Api):  # pylint: disable=too-many-instance-attributes
 
         # following attrs are dynamically set later.
         if r3token:
-            self.headers = {
-                'Content-Type': 'application/json',
-                'x-auth-token': 'U={}'.format(self._r3token)
-            }
+            self.headers = json_headers(f'U={self._r3token}')
         elif roletoken:
-            self.headers = {
-                'Content-Type': 'application/json',
-                'x-auth-token': 'R={}'.format(self._roletoken)
-            }
+            self.headers = json_headers(f'R={self._roletoken}')
         else:
-            self.headers = {
-                'Content-Type': 'application/json',
-            }
+            self.headers = json_headers()
         self.body = None
         self.urlparams = None
         # attributes that are unique to this class
@@ -170,10 +272,14 @@ class K2hr3Resource(K2hr3Api):  # pylint: disable=too-many-instance-attributes
     # data=resource data
     # keys=json key value object
     #
-    def create_conf_resource(self, name: str, data_type: str, resource_data: str,  # pylint: disable=R0917 # noqa
+    def create_conf_resource(self, name: str, data_type: str,  # pylint: disable=R0917 # noqa
+                             resource_data: Union[str, K2hr3ResourceData],
                              keys: Optional[dict] = None,
                              alias: Optional[list] = None):
-        """Create the resource."""
+        """Create the resource.
+
+        A K2hr3ResourceData is streamed only by POST.
+        """
         self.api_id = 1
         self.name = name  # type: ignore
         self.resource_data = resource_data  # type: ignore
@@ -357,6 +463,14 @@ class K2hr3Resource(K2hr3Api):  # pylint: disable=too-many-instance-attributes
         """Get the request url path."""
         if method == K2hr3HTTPMethod.POST:
             if self.api_id == 1:
+                if isinstance(self.resource_data, K2hr3ResourceData):
+                    self.body = _K2hr3ResourceBody(  # type: ignore[assignment] # noqa
+                        {'name': self.name, 'type': self.data_type,
+                         'keys': self.keys, 'alias': self.alias},
+                        self.resource_data)
+                    if self.r3token:
+                        return f'{self.version}/{self.basepath}'
+                    return f'{self.version}/{self.basepath}/{self.resource_path}'  # noqa
                 python_data = json.loads(_RESOURCE_API_CREATE_RESOURCE)
                 python_data['resource']['name'] = self.name
                 python_data['resource']['type'] = self.data_type
@@ -369,70 +483,73 @@ class K2hr3Resource(K2hr3Api):  # pylint: disable=too-many-instance-attributes
                 return f'{self.version}/{self.basepath}/{self.resource_path}'
         if method == K2hr3HTTPMethod.PUT:
             if self.api_id == 1:
-                self.urlparams = json.dumps({
+                if isinstance(self.resource_data, K2hr3ResourceData):
+                    raise K2hr3Exception(
+                        'K2hr3ResourceData is streamed only by POST')
+                self.urlparams = {
                     'name': self.name,
                     'type': self.data_type,
                     'data': self.resource_data,
                     'keys': self.keys,
                     'alias': self.alias
-                })
+                }
                 if self.r3token:
                     return f'{self.version}/{self.basepath}'
                 return f'{self.version}/{self.basepath}/{self.resource_path}'
         if method == K2hr3HTTPMethod.GET:
             if self.api_id == 3:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'expand': self.expand,
                     'service': self.service
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.resource_path}'
             if self.api_id == 4:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'type': self.data_type,
                     'keys': self.keys,
                     'service': self.service
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.resource_path}'
         if method == K2hr3HTTPMethod.HEAD:
             if self.api_id == 5:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'type': self.data_type,
                     'keys': self.keys,
                     'service': self.service
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.resource_path}'
             if self.api_id == 6:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'port': self.port,
                     'cuk': self.cuk,
                     'role': self.role,
                     'type': self.data_type,
                     'keys': self.keys,
                     'service': self.service
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.resource_path}'
         if method == K2hr3HTTPMethod.DELETE:
             if self.api_id == 7:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'type': self.data_type,
                     'keynames': self.keys,
                     'alias': self.alias
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.resource_path}'
             if self.api_id == 8:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'type': self.data_type,
                     'keynames': self.keys,
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.resource_path}'
             if self.api_id == 9:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'port': self.port,
                     'cuk': self.cuk,
                     'role': self.role,
                     'type': self.data_type,
                     'keynames': self.keys,
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.resource_path}'
         return None
 #
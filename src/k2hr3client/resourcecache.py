@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""K2HR3 Python Client of the read-through resource cache.
+
+.. code-block:: python
+
+    # Import modules from k2hr3client package.
+    from k2hr3client.api import K2hr3HTTPMethod
+    from k2hr3client.http import K2hr3Http
+    from k2hr3client.resource import K2hr3Resource
+    from k2hr3client.resourcecache import K2hr3ResourceCache
+
+    myhttp = K2hr3Http("http://127.0.0.1:18080")
+    mycache = K2hr3ResourceCache(myhttp, ttl=60, maxsize=1024)
+
+    # GET the resource once in 60 seconds.
+    myresource = K2hr3Resource(roletoken="...", resource_path="conf")
+    mycache.get(myresource.get_with_roletoken("string", None)).data
+
+    # A write through the cache evicts the cached reads of the path.
+    myresource = K2hr3Resource("gAAAAA...")
+    mycache.write(myresource.create_conf_resource("conf", "string", "data"),
+                  K2hr3HTTPMethod.PUT)
+
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
+
+from k2hr3client.api import K2hr3ApiResponse, K2hr3HTTPMethod
+from k2hr3client.bulk import send_api
+from k2hr3client.cache import (K2hr3CacheStats, K2hr3ExpiringCache,
+                               token_digest)
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client.http import K2hr3Http
+from k2hr3client.model import K2hr3ResourceModel
+from k2hr3client.resource import K2hr3Resource
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_RESOURCE_TTL_SECONDS = 60
+# NOTE: the api_id of K2hr3Resource.get and get_with_roletoken.
+_READ_API_IDS = (3, 4)
+
+
+def resource_name(r3resource: K2hr3Resource) -> str:
+    """Return the name of the resource that a request reads or writes.
+
+    The name is the part after ":resource:" of a YRN full resource path, so
+    a path and the YRN full path of it have the same name.
+    """
+    path = r3resource.resource_path or r3resource.name or ''
+    return path.rsplit(':resource:', 1)[-1].strip('/')
+
+
+class K2hr3ResourceCache():
+    """Cache the resources that are read by K2HR3 RESOURCE API.
+
+    A resource is cached for each path, data type, keys, service, expansion
+    and token for the ttl seconds. The least recently used one is evicted if
+    the cache is full. The writes through the cache evict all cached reads of
+    the path. The changes of the resources that a resource refers to by the
+    aliases are reflected after the ttl.
+    """
+
+    __slots__ = ('_http', '_ttl', '_clock', '_cache', '_names', '_lock')
+
+    def __init__(self, r3http: K2hr3Http,
+                 ttl: float = DEFAULT_RESOURCE_TTL_SECONDS,
+                 maxsize: int = 1024,
+                 clock: Callable[[], float] = time.time) -> None:
+        """Init the members.
+
+        :param r3http: the http client of the K2HR3 API server
+        :type r3http: K2hr3Http
+        :param ttl: the seconds a resource is cached
+        :type ttl: float
+        :param maxsize: the max number of resources
+        :type maxsize: int
+        """
+        self._http = r3http
+        self._ttl = ttl
+        self._clock = clock
+        self._cache = K2hr3ExpiringCache(maxsize=maxsize, refresh_ahead=0,
+                                         background=False, clock=clock,
+                                         on_evict=self._unregister)
+        # NOTE: the resource name -> the cache keys of the name. A key is
+        # removed when the cache evicts it, so the keys of the old tokens
+        # do not remain.
+        self._names = {}  # type: Dict[str, Set[Hashable]]
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3ResourceCache baseurl={self._http.baseurl!r} ' \
+               f'size={len(self._cache)}>'
+
+    def __len__(self) -> int:
+        """Return the number of the cached resources."""
+        return len(self._cache)
+
+    @property
+    def stats(self) -> K2hr3CacheStats:
+        """Return the cache statistics."""
+        return self._cache.stats
+
+    @staticmethod
+    def _key(r3resource: K2hr3Resource) -> Tuple[Hashable, ...]:
+        """Return the cache key of a read. The tokens are digested."""
+        if r3resource.r3token:
+            identity = ('U', token_digest(r3resource.r3token))
+        elif r3resource.roletoken:
+            identity = ('R', token_digest(r3resource.roletoken))
+        else:
+            identity = ('', '')
+        keys = None if r3resource.keys is None else json.dumps(
+            r3resource.keys, sort_keys=True)
+        return (resource_name(r3resource), r3resource.resource_path,
+                r3resource.api_id, r3resource.data_type, keys,
+                r3resource.service, bool(r3resource.expand)) + identity
+
+    def get(self, r3resource: K2hr3Resource) -> K2hr3ResourceModel:
+        """Return the resource that a read request gets.
+
+        The request is made by K2hr3Resource.get or get_with_roletoken.
+
+        :raise K2hr3Exception: if the request is not a read or the resource
+                               could not be got.
+        """
+        if r3resource.api_id not in _READ_API_IDS:
+            raise K2hr3Exception(
+                f'api_id {r3resource.api_id} of K2hr3Resource is not a read')
+        key = self._key(r3resource)
+        name = str(key[0])
+
+        def loader():
+            resp = send_api(self._http, r3resource, K2hr3HTTPMethod.GET)
+            return (K2hr3ResourceModel.from_response(resp),
+                    self._clock() + self._ttl)
+        # NOTE: The key is registered before the load to be evicted by the
+        # writes during the load, and after the load because the writes
+        # remove the registrations. A key that is not cached after the load
+        # is not registered.
+        self._register(name, key)
+        try:
+            return self._cache.get(key, loader)
+        finally:
+            if self._cache.expires_at(key) is None:
+                self._unregister(key)
+            else:
+                self._register(name, key)
+
+    def _register(self, name: str, key: Hashable) -> None:
+        with self._lock:
+            self._names.setdefault(name, set()).add(key)
+
+    def _unregister(self, key: Tuple[Hashable, ...]) -> None:
+        name = str(key[0])
+        with self._lock:
+            keys = self._names.get(name)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._names[name]
+
+    def write(self, r3resource: K2hr3Resource,
+              method: K2hr3HTTPMethod) -> K2hr3ApiResponse:
+        """Send a request that writes a resource and evict the path.
+
+        The cached reads are evicted even if the request failed.
+
+        :raise K2hr3Exception: if the server returns an error.
+        """
+        try:
+            return send_api(self._http, r3resource, method)
+        finally:
+            self.invalidate(resource_name(r3resource))
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Evict the reads of a resource or all resources if it is None.
+
+        :param name: the resource path or the YRN full resource path
+        :type name: str
+        """
+        if name is None:
+            with self._lock:
+                self._names.clear()
+            self._cache.invalidate()
+            return
+        name = name.rsplit(':resource:', 1)[-1].strip('/')
+        with self._lock:
+            keys = self._names.pop(name, set())
+        for key in keys:
+            self._cache.invalidate(key)
+        LOG.debug('evicted %s reads of %s', len(keys), name)
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
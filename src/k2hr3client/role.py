@@ -228,11 +228,11 @@
 from enum import Enum
 import json
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 import warnings
 
 
-from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod
+from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod, json_headers
 
 LOG = logging.getLogger(__name__)
 
@@ -297,6 +297,9 @@ class K2hr3RoleHost:  # pylint disable=too-few-public-methods
     NOTE(hiwakaba): This class exists only for backward compatibility.
     """
 
+    __slots__ = ('host', 'port', 'cuk', 'extra', 'tag', 'inboundip',
+                 'outboundip')
+
     def __init__(self, host: str, port: str, cuk: str, extra: str, tag: str,  # pylint: disable=R0917 # noqa
                  inboundip: str, outboundip: str):
         """Init the members."""
@@ -309,6 +312,11 @@ class K2hr3RoleHost:  # pylint disable=too-few-public-methods
         self.outboundip = outboundip
 
 
+def role_host_to_dict(host: K2hr3RoleHost) -> Dict[str, Any]:
+    """Return the members of a K2hr3RoleHost as a dict."""
+    return {attr: getattr(host, attr) for attr in K2hr3RoleHost.__slots__}
+
+
 class K2hr3RoleHostList:  # pylint disable=too-few-public-methods
     # pylint: disable=too-few-public-methods
     """Represent a list of hosts of a role.
@@ -316,6 +324,8 @@ class K2hr3RoleHostList:  # pylint disable=too-few-public-methods
     NOTE(hiwakaba): This class exists only for backward compatibility.
     """
 
+    __slots__ = ('hostlist',)
+
     def __init__(self):
         """Init the members."""
         self.hostlist = []
@@ -340,7 +350,10 @@ class K2hr3Role(K2hr3Api):  # pylint: disable=too-many-instance-attributes
     See https://k2hr3.antpick.ax/api_role.html
     """
 
-    __slots__ = ('_r3token',)
+    __slots__ = ('_r3token', 'name', 'policies', 'alias', 'host',
+                 'clear_hostname', 'clear_ips', 'hosts', 'port', 'cuk',
+                 'extra', 'tag', 'inboundip', 'outboundip', 'expand',
+                 'role_token_string')
 
     def __init__(self, r3token: str, token_type=K2hr3TokenType.SCOPED_TOKEN):
         """Init the members."""
@@ -349,19 +362,11 @@ class K2hr3Role(K2hr3Api):  # pylint: disable=too-many-instance-attributes
 
         # following attrs are dynamically set later.
         if token_type == K2hr3TokenType.SCOPED_TOKEN:
-            self.headers = {
-                'Content-Type': 'application/json',
-                'x-auth-token': 'U={}'.format(self._r3token)
-            }
+            self.headers = json_headers(f'U={self._r3token}')
         elif token_type == K2hr3TokenType.ROLE_TOKEN:
-            self.headers = {
-                'Content-Type': 'application/json',
-                'x-auth-token': 'R={}'.format(self._r3token)
-            }
+            self.headers = json_headers(f'R={self._r3token}')
         elif token_type == K2hr3TokenType.NO_TOKEN:
-            self.headers = {
-                'Content-Type': 'application/json'
-            }
+            self.headers = json_headers()
         self.body = None
         self.urlparams = None
         # attributes that are unique to this class
@@ -422,10 +427,13 @@ class K2hr3Role(K2hr3Api):  # pylint: disable=too-many-instance-attributes
             self.name = role_name
         return self
 
-    def add_members(self, name: str, hosts: str,  # pylint: disable=R0917
+    def add_members(self, name: str, hosts,  # pylint: disable=R0917
                     clear_hostname: bool, clear_ips: str,
                     role_name: Optional[str] = None):
-        """Add members to the role."""
+        """Add members to the role.
+
+        The hosts are a K2hr3RoleHostList or an iterable of K2hr3RoleHost.
+        """
         self.api_id = 4
         self.name = name  # type: ignore
         self.hosts = hosts  # type: ignore
@@ -441,6 +449,13 @@ class K2hr3Role(K2hr3Api):  # pylint: disable=too-many-instance-attributes
             self.name = role_name
         return self
 
+    def _host_list(self) -> List[Dict[str, Any]]:
+        """Return the hosts of add_members as a list of dicts."""
+        hosts = self.hosts
+        if isinstance(hosts, K2hr3RoleHostList):
+            hosts = hosts.hostlist
+        return [role_host_to_dict(host) for host in hosts or []]
+
     # PUT(Add HOST to ROLE)
     # http(s)://API SERVER:PORT/v1/role/role path?urlarg
     # http(s)://API SERVER:PORT/v1/role/yrn full path to role?urlarg
@@ -636,37 +651,41 @@ class K2hr3Role(K2hr3Api):  # pylint: disable=too-many-instance-attributes
                 python_data['host']['tag'] = self.host.tag  # type: ignore[attr-defined]  # noqa
                 python_data['host']['inboundip'] = self.host.inboundip  # type: ignore[attr-defined]  # noqa # pylint: disable=line-too-long
                 python_data['host']['outboundip'] = self.host.outboundip  # type: ignore[attr-defined]  # noqa # pylint: disable=line-too-long
+                python_data['clear_hostname'] = bool(self.clear_hostname)
+                python_data['clear_ips'] = bool(self.clear_ips)
+                self.body = json.dumps(python_data)
+                # http(s)://API SERVER:PORT/v1/role/role path
+                return f'{self.version}/{self.basepath}/{self.name}'
+            if self.api_id == 4:
+                python_data = json.loads(_ROLE_API_ADD_MEMBERS)
+                python_data['host'] = self._host_list()
+                python_data['clear_hostname'] = bool(self.clear_hostname)
+                python_data['clear_ips'] = bool(self.clear_ips)
                 self.body = json.dumps(python_data)
                 # http(s)://API SERVER:PORT/v1/role/role path
                 return f'{self.version}/{self.basepath}/{self.name}'
-            # elif (self.api_id == 4):
-            #     python_data = json.loads(_ROLE_API_ADD_MEMBERS)
-            #     # TODO(hiwakaba) Not implemented
-            #     self.body = json.dumps(python_data)
-            #     # http(s)://API SERVER:PORT/v1/role/role path
-            #     return f'{self.basepath}/{self.name}'
             if self.api_id == 5:
                 python_data = json.loads(_ROLE_API_ADD_MEMBER_USING_ROLETOKEN)
-                python_data['host']['port'] = self.host.port  # type: ignore[attr-defined]  # noqa
-                python_data['host']['cuk'] = self.host.cuk  # type: ignore[attr-defined]  # noqa
-                python_data['host']['extra'] = self.host.extra  # type: ignore[attr-defined]  # noqa
-                python_data['host']['tag'] = self.host.tag  # type: ignore[attr-defined]  # noqa
-                python_data['host']['inboundip'] = self.host.inboundip  # type: ignore[attr-defined]  # noqa # pylint: disable=line-too-long
-                python_data['host']['outboundip'] = self.host.outboundip  # type: ignore[attr-defined]  # noqa # pylint: disable=line-too-long
+                python_data['host']['port'] = self.port
+                python_data['host']['cuk'] = self.cuk
+                python_data['host']['extra'] = self.extra
+                python_data['host']['tag'] = self.tag
+                python_data['host']['inboundip'] = self.inboundip
+                python_data['host']['outboundip'] = self.outboundip
                 self.body = json.dumps(python_data)
                 # http(s)://API SERVER:PORT/v1/role/role path
                 return f'{self.version}/{self.basepath}/{self.name}'
         if method == K2hr3HTTPMethod.PUT:
             if self.api_id == 1:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'name': self.name,
                     'policies': self.policies,
                     'alias': self.alias
-                })
+                }
                 # POST http(s)://API SERVER:PORT/v1/role
                 return f'{self.version}/{self.basepath}'
             if self.api_id == 3:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'host': self.host.host,  # type: ignore[attr-defined]
                     'port': self.host.port,  # type: ignore[attr-defined]
                     'cuk': self.host.cuk,  # type: ignore[attr-defined]
@@ -674,38 +693,41 @@ class K2hr3Role(K2hr3Api):  # pylint: disable=too-many-instance-attributes
                     'tag': self.host.tag,  # type: ignore[attr-defined]
                     'inboundip': self.host.inboundip,  # type: ignore[attr-defined]  # noqa
                     'outboundip': self.host.outboundip  # type: ignore[attr-defined]  # noqa
-                })
+                }
                 # http(s)://API SERVER:PORT/v1/role/role path
                 return f'{self.version}/{self.basepath}/{self.name}'
             if self.api_id == 4:
-                # TODO(hiwakaba) Not implemented
-                self.urlparams = json.dumps({
-                })
+                # NOTE: The list of the hosts is encoded in JSON.
+                self.urlparams = {
+                    'host': self._host_list(),
+                    'clear_hostname': bool(self.clear_hostname),
+                    'clear_ips': bool(self.clear_ips)
+                }
                 # http(s)://API SERVER:PORT/v1/role/role path
                 return f'{self.version}/{self.basepath}/{self.name}'
             if self.api_id == 5:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'port': self.port,
                     'cuk': self.cuk,
                     'extra': self.extra,
                     'tag': self.tag,
                     'inboundip': self.inboundip,
                     'outboundip': self.outboundip
-                })
+                }
                 # http(s)://API SERVER:PORT/v1/role/role path
                 return f'{self.version}/{self.basepath}/{self.name}'
         if method == K2hr3HTTPMethod.GET:
             if self.api_id == 6:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'expand': self.expand
-                })
+                }
                 # GET(Show ROLE details)
                 # http(s)://API SERVER:PORT/v1/role/role path or yrn full role path?urlarg # noqa
                 return f'{self.version}/{self.basepath}/{self.name}'
             if self.api_id == 7:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'expand': self.expand
-                })
+                }
                 # http(s)://APISERVER:PORT/v1/role/token/list/role path or yrn full role path # noqa
                 return f'{self.version}/{self.basepath}/token/list/' \
                        f'{self.name}'
@@ -724,26 +746,26 @@ class K2hr3Role(K2hr3Api):  # pylint: disable=too-many-instance-attributes
             if self.api_id == 10:
                 # DELETE(Hostname/IP address deletion-role specification)
                 # http(s)://API SERVER:PORT/v1/role/role path or yrn full role path # noqa
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'host': self.host,
                     'port': self.port,
                     'cuk': self.cuk
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.name}'
             if self.api_id == 11:
                 # DELETE(Hostname/IP address deletion-role specification)
                 # http(s)://API SERVER:PORT/v1/role/role path or yrn full role path # noqa
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'cuk': self.cuk
-                })
+                }
                 return f'{self.version}/{self.basepath}'
             if self.api_id == 12:
                 # DELETE (RoleToken deletion - Role specified)
                 # http(s)://API SERVER:PORT/v1/role/role path or yrn full role path # noqa
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'port': self.port,
                     'cuk': self.cuk
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.name}'
             if self.api_id == 13:
                 # DELETE(Delete RoleToken - Role not specified)
@@ -53,7 +53,7 @@ import logging
 from typing import Optional
 
 
-from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod
+from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod, json_headers
 
 LOG = logging.getLogger(__name__)
 
@@ -83,7 +83,7 @@ class K2hr3Service(K2hr3Api):  # pylint: disable=too-many-instance-attributes
     See https://k2hr3.antpick.ax/api_service.html for details.
     """
 
-    __slots__ = ('_r3token',)
+    __slots__ = ('_r3token', 'name', 'verify_url', 'tenant', 'clear_tenant')
 
     def __init__(self, r3token: str, service_name: str):
         """Init the members."""
@@ -92,10 +92,7 @@ class K2hr3Service(K2hr3Api):  # pylint: disable=too-many-instance-attributes
         self.name = service_name
 
         # following attrs are dynamically set later.
-        self.headers = {
-            'Content-Type': 'application/json',
-            'x-auth-token': 'U={}'.format(self._r3token)
-        }
+        self.headers = json_headers(f'U={self._r3token}')
         self.body = None
         self.urlparams = None
         # attributes that are unique to this class
@@ -220,27 +217,27 @@ class K2hr3Service(K2hr3Api):  # pylint: disable=too-many-instance-attributes
                 # "clear_tenant": true/false or undefined
                 # "verify":  <verify url>
                 # }
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'name': self.name,
                     'verify': self.verify_url
-                })
+                }
             elif self.api_id == 2:
                 # {
                 # "name":    <service name>
                 # "verify":  <verify url>
                 # }
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'tenant': self.tenant,
                     'clear_tenant': self.clear_tenant
-                })
+                }
             elif self.api_id == 3:
                 # {
                 # "name":    <service name>
                 # "verify":  <verify url>
                 # }
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'verify': self.verify_url
-                })
+                }
             return f'{self.version}/{self.basepath}'
         if method == K2hr3HTTPMethod.GET:
             if self.api_id == 4:
@@ -252,9 +249,9 @@ class K2hr3Service(K2hr3Api):  # pylint: disable=too-many-instance-attributes
             if self.api_id == 6:
                 return f'{self.version}/{self.basepath}/{self.name}'
             if self.api_id == 7:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'tenant': self.tenant
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.name}'
         return None
 #
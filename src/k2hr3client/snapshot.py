@@ -0,0 +1,408 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""K2HR3 Python Client of the offline resource snapshot.
+
+The resources of a tenant are exported to a sqlite file, so an agent can
+start from the local file and refresh only the resources that are changed.
+
+.. code-block:: python
+
+    # Import modules from k2hr3client package.
+    from k2hr3client.http import K2hr3Http
+    from k2hr3client.snapshot import (K2hr3ResourceSnapshot,
+                                      export_resources, refresh_snapshot)
+
+    myhttp = K2hr3Http("http://127.0.0.1:18080")
+    export_resources(myhttp, "gAAAAA...", "/var/lib/agent/resources.db")
+
+    # Read the resources without the network.
+    with K2hr3ResourceSnapshot("/var/lib/agent/resources.db",
+                               readonly=True) as snapshot:
+        snapshot.get("yrn:yahoo:::demo:resource:conf").data
+
+    # Get again only the resources that are new or older than 300 seconds.
+    with K2hr3ResourceSnapshot("/var/lib/agent/resources.db") as snapshot:
+        refresh_snapshot(snapshot, myhttp, "gAAAAA...", max_age=300)
+
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple, Union)
+
+from k2hr3client.api import K2hr3HTTPMethod
+from k2hr3client.bulk import (DEFAULT_MAX_WORKERS, K2hr3BulkResult,
+                              resource_get_api, run_bulk, send_api)
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client.http import K2hr3Http
+from k2hr3client.list import K2hr3List
+from k2hr3client.model import K2hr3ListModel, K2hr3ResourceModel
+
+LOG = logging.getLogger(__name__)
+
+_SNAPSHOT_VERSION = 1
+_SCHEMA = """
+CREATE TABLE resources (
+    path    TEXT PRIMARY KEY,
+    name    TEXT NOT NULL,
+    type    TEXT NOT NULL,
+    data    TEXT NOT NULL,
+    keys    TEXT NOT NULL,
+    alias   TEXT NOT NULL,
+    digest  TEXT NOT NULL,
+    fetched REAL NOT NULL
+) WITHOUT ROWID
+"""
+_COLUMNS = 'path, name, type, data, keys, alias, digest, fetched'
+
+
+def _dumps(val: Any) -> str:
+    return json.dumps(val, sort_keys=True, separators=(',', ':'))
+
+
+class K2hr3SnapshotEntry():
+    """Represent a resource in a snapshot.
+
+    The digest is the sha256 of the type, the data, the keys and the alias,
+    so an unchanged resource has the same digest.
+    """
+
+    __slots__ = ('path', 'name', 'data_type', 'data', 'keys', 'alias',
+                 'digest', 'fetched')
+
+    def __init__(self, path: str, data_type: str, data: Any,  # pylint: disable=too-many-arguments # noqa
+                 keys: Optional[Dict[str, Any]] = None,
+                 alias: Optional[List[str]] = None,
+                 fetched: float = 0.0) -> None:
+        """Init the members."""
+        self.path = path
+        self.name = path.rsplit(':resource:', 1)[-1].strip('/')
+        self.data_type = data_type
+        self.data = data
+        self.keys = keys or {}
+        self.alias = alias or []
+        self.digest = hashlib.sha256(_dumps(
+            [data_type, data, self.keys, self.alias]).encode('utf-8')
+        ).hexdigest()
+        self.fetched = fetched
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3SnapshotEntry path={self.path!r} ' \
+               f'type={self.data_type!r}>'
+
+    @classmethod
+    def from_model(cls, path: str, model: K2hr3ResourceModel,
+                   fetched: float) -> 'K2hr3SnapshotEntry':
+        """Return the entry of a resource that K2HR3 RESOURCE API returns."""
+        data = model.data
+        return cls(path, 'string' if isinstance(data, str) else 'object',
+                   data, model.keys, model.aliases, fetched)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the entry as a JSON serializable dict."""
+        return {'path': self.path, 'name': self.name,
+                'type': self.data_type, 'data': self.data,
+                'keys': self.keys, 'alias': self.alias}
+
+
+class K2hr3ResourceSnapshot():
+    """Store the resources in a sqlite file keyed by the YRN full paths.
+
+    A lookup by a path uses the primary key of the file, so the resources
+    are not loaded into memory. An instance can be shared by threads.
+    """
+
+    __slots__ = ('_path', '_conn', '_lock')
+
+    def __init__(self, path: Union[str, Path],
+                 readonly: bool = False) -> None:
+        """Open the file and create the table if it is new.
+
+        :param path: the file path
+        :type path: str or Path
+        :param readonly: open the file that must exist read-only if True
+        :type readonly: bool
+        :raise K2hr3Exception: if the file could not be opened or the file
+                               is not a snapshot.
+        """
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            if readonly:
+                self._conn = sqlite3.connect(
+                    self._path.resolve().as_uri() + '?mode=ro', uri=True,
+                    check_same_thread=False)
+            else:
+                self._conn = sqlite3.connect(str(self._path),
+                                             check_same_thread=False)
+            version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+            if version == 0 and not readonly:
+                with self._conn:
+                    self._conn.execute(_SCHEMA)
+                    self._conn.execute(
+                        f'PRAGMA user_version = {_SNAPSHOT_VERSION}')
+                version = _SNAPSHOT_VERSION
+        except sqlite3.Error as error:
+            raise K2hr3Exception(
+                f'could not open the snapshot {self._path}, {error}') \
+                from error
+        if version != _SNAPSHOT_VERSION:
+            self._conn.close()
+            raise K2hr3Exception(
+                f'{self._path} is not a snapshot of version '
+                f'{_SNAPSHOT_VERSION}, {version}')
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3ResourceSnapshot path={str(self._path)!r}>'
+
+    def __enter__(self) -> 'K2hr3ResourceSnapshot':
+        """Return the instance."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the file."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of the resources."""
+        return self._query('SELECT COUNT(*) FROM resources')[0][0]
+
+    def __contains__(self, path: object) -> bool:
+        """Return True if the resource is in the snapshot."""
+        return bool(self._query('SELECT 1 FROM resources WHERE path = ?',
+                                (path,)))
+
+    @property
+    def path(self) -> Path:
+        """Return the file path."""
+        return self._path
+
+    def close(self) -> None:
+        """Close the file."""
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Any]:
+        try:
+            with self._lock:
+                return self._conn.execute(sql, params).fetchall()
+        except sqlite3.Error as error:
+            raise K2hr3Exception(
+                f'could not read the snapshot {self._path}, {error}') \
+                from error
+
+    @staticmethod
+    def _entry(row: Tuple[Any, ...]) -> K2hr3SnapshotEntry:
+        # NOTE: the stored digest is used as is, not computed again.
+        entry = K2hr3SnapshotEntry.__new__(K2hr3SnapshotEntry)
+        entry.path, entry.name, entry.data_type = row[0], row[1], row[2]
+        entry.data, entry.keys, entry.alias = (json.loads(row[3]),
+                                               json.loads(row[4]),
+                                               json.loads(row[5]))
+        entry.digest, entry.fetched = row[6], row[7]
+        return entry
+
+    def get(self, path: str) -> Optional[K2hr3SnapshotEntry]:
+        """Return the resource of the YRN full path or None."""
+        rows = self._query(
+            f'SELECT {_COLUMNS} FROM resources WHERE path = ?', (path,))
+        return self._entry(rows[0]) if rows else None
+
+    def entries(self) -> Iterator[K2hr3SnapshotEntry]:
+        """Iterate the resources ordered by the paths."""
+        for row in self._query(
+                f'SELECT {_COLUMNS} FROM resources ORDER BY path'):
+            yield self._entry(row)
+
+    def digests(self) -> Dict[str, Tuple[str, float]]:
+        """Return the digests and the fetched epoch seconds by the paths."""
+        return {path: (digest, fetched) for path, digest, fetched
+                in self._query('SELECT path, digest, fetched FROM resources')}
+
+    def put(self, entries: Iterable[K2hr3SnapshotEntry]) -> None:
+        """Add or replace the resources in a transaction.
+
+        :raise K2hr3Exception: if the file could not be written.
+        """
+        rows = [(entry.path, entry.name, entry.data_type,
+                 _dumps(entry.data), _dumps(entry.keys), _dumps(entry.alias),
+                 entry.digest, entry.fetched) for entry in entries]
+        self._write(f'INSERT OR REPLACE INTO resources ({_COLUMNS}) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def touch(self, paths: Iterable[str], fetched: float) -> None:
+        """Update the fetched epoch seconds of the unchanged resources."""
+        self._write('UPDATE resources SET fetched = ? WHERE path = ?',
+                    [(fetched, path) for path in paths])
+
+    def remove(self, paths: Iterable[str]) -> None:
+        """Remove the resources in a transaction."""
+        self._write('DELETE FROM resources WHERE path = ?',
+                    [(path,) for path in paths])
+
+    def _write(self, sql: str, rows: List[Tuple[Any, ...]]) -> None:
+        if not rows:
+            return
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(sql, rows)
+        except sqlite3.Error as error:
+            raise K2hr3Exception(
+                f'could not write the snapshot {self._path}, {error}') \
+                from error
+
+
+def list_resources(r3http: K2hr3Http, r3token: str,
+                   list_path: str = 'resource') -> List[str]:
+    """Return the YRN full paths of the resources of K2HR3 LIST API.
+
+    :raise K2hr3Exception: if the resources could not be listed.
+    """
+    mylist = K2hr3List(r3token, list_path).get(expand=True)
+    resp = send_api(r3http, mylist, K2hr3HTTPMethod.GET)
+    return list(dict.fromkeys(K2hr3ListModel.from_response(resp).walk()))
+
+
+def refresh_snapshot(snapshot: K2hr3ResourceSnapshot, r3http: K2hr3Http,  # pylint: disable=too-many-arguments,too-many-locals # noqa
+                     r3token: str, paths: Optional[Iterable[str]] = None,
+                     list_path: str = 'resource',
+                     max_age: Optional[float] = None,
+                     max_workers: int = DEFAULT_MAX_WORKERS,
+                     clock: Callable[[], float] = time.time
+                     ) -> K2hr3BulkResult:
+    """Get the resources concurrently and store the changed ones.
+
+    The resources are listed by K2HR3 LIST API if the paths are None, and
+    the resources that are not listed are removed from the snapshot. The
+    resources that are new or were got more than max_age seconds ago are
+    got. All resources are got if max_age is None. The aliases are not
+    expanded. A resource that could not be got is kept as is.
+
+    :param snapshot: the snapshot to update
+    :type snapshot: K2hr3ResourceSnapshot
+    :param r3http: the http client of the K2HR3 API server
+    :type r3http: K2hr3Http
+    :param r3token: the K2HR3 token
+    :type r3token: str
+    :param paths: the YRN full paths of the resources
+    :param list_path: the path of K2HR3 LIST API, like "myservice/resource"
+    :type list_path: str
+    :param max_age: the seconds a resource is regarded as unchanged
+    :type max_age: float
+    :returns: the result keyed by the paths that are got, True if changed
+    :rtype: K2hr3BulkResult
+    :raise K2hr3Exception: if the resources could not be listed or the
+                           snapshot could not be written.
+    """
+    digests = snapshot.digests()
+    if paths is None:
+        listed = list_resources(r3http, r3token, list_path)
+        listed_set = set(listed)
+        snapshot.remove([path for path in digests if path not in listed_set])
+    else:
+        listed = list(dict.fromkeys(paths))
+    now = clock()
+    if max_age is not None:
+        listed = [path for path in listed if path not in digests
+                  or now - digests[path][1] > max_age]
+
+    def fetch(path):
+        resp = send_api(r3http, resource_get_api(path, r3token),
+                        K2hr3HTTPMethod.GET)
+        return K2hr3SnapshotEntry.from_model(
+            path, K2hr3ResourceModel.from_response(resp), now)
+
+    result = run_bulk(listed, fetch, max_workers)
+    changed = {path for path, entry in result.succeeded.items()
+               if path not in digests or digests[path][0] != entry.digest}  # type: ignore[union-attr] # noqa
+    snapshot.put(result.succeeded[path] for path in changed)
+    snapshot.touch([path for path in result.succeeded
+                    if path not in changed], now)
+    for path in result.succeeded:
+        result.succeeded[path] = path in changed
+    LOG.debug('refreshed %s resources, %s changed, %s failed',
+              len(result.succeeded), len(changed), len(result.failed))
+    return result
+
+
+def export_resources(r3http: K2hr3Http, r3token: str,  # pylint: disable=too-many-arguments # noqa
+                     path: Union[str, Path],
+                     paths: Optional[Iterable[str]] = None,
+                     list_path: str = 'resource',
+                     max_workers: int = DEFAULT_MAX_WORKERS,
+                     clock: Callable[[], float] = time.time
+                     ) -> K2hr3BulkResult:
+    """Export the resources to a new snapshot file.
+
+    The file is written to a temporary file and replaces the file atomically
+    only if all resources are got, so the readers never see a partial one.
+    The file is readable only by the owner.
+
+    :returns: the result keyed by the paths
+    :rtype: K2hr3BulkResult
+    :raise K2hr3Exception: if the resources could not be listed or the file
+                           could not be written.
+    """
+    path = Path(path)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent,
+                                        prefix=path.name + '.')
+        os.fchmod(fd, 0o600)
+        os.close(fd)
+    except OSError as error:
+        raise K2hr3Exception(
+            f'could not write the snapshot {path}, {error}') from error
+    try:
+        with K2hr3ResourceSnapshot(tmp_path) as snapshot:
+            result = refresh_snapshot(snapshot, r3http, r3token, paths,
+                                      list_path, None, max_workers, clock)
+        if result.ok:
+            os.replace(tmp_path, path)
+    except OSError as error:
+        raise K2hr3Exception(
+            f'could not write the snapshot {path}, {error}') from error
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    if not result.ok:
+        LOG.error('could not export the snapshot %s, %s resources failed',
+                  path, len(result.failed))
+    return result
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
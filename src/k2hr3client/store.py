@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""K2HR3 Python Client of the on-disk token store.
+
+Tokens are shared by processes through a file that only the owner can read.
+The store uses fcntl to lock the file, so it is available on POSIX only.
+
+.. code-block:: python
+
+    # Import modules from k2hr3client package.
+    from k2hr3client.auth import K2hr3TokenManager
+    from k2hr3client.http import K2hr3Http
+    from k2hr3client.store import K2hr3TokenStore
+
+    myhttp = K2hr3Http("http://127.0.0.1:18080")
+    manager = K2hr3TokenManager(myhttp, store=K2hr3TokenStore())
+
+    # A valid token that another process stored is reused.
+    r3token = manager.get_token("demo", iaas_token="gAAAAA...")
+
+"""
+
+from contextlib import contextmanager
+import json
+import logging
+import os
+from pathlib import Path
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore # pylint: disable=invalid-name
+
+from k2hr3client.exception import K2hr3Exception
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_STORE_PATH = Path.home() / '.k2hr3client_tokens.json'
+_STORE_VERSION = 1
+
+
+class K2hr3TokenStore():
+    """Store tokens in a file.
+
+    A token is stored for each endpoint, project, user and kind with the
+    epoch seconds when it expires. Expired tokens are not returned and are
+    removed at the next write.
+    """
+
+    __slots__ = ('_path', '_lock_path', '_clock')
+
+    def __init__(self, path: Optional[Union[str, Path]] = None,
+                 clock: Callable[[], float] = time.time) -> None:
+        """Init the members.
+
+        :param path: the file path, default is ~/.k2hr3client_tokens.json
+        :type path: str or Path
+        :raise K2hr3Exception: if the platform has no fcntl.
+        """
+        if fcntl is None:
+            raise K2hr3Exception('the token store requires fcntl')
+        self._path = Path(path) if path else DEFAULT_TOKEN_STORE_PATH
+        self._lock_path = self._path.with_name(self._path.name + '.lock')
+        self._clock = clock
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3TokenStore path={str(self._path)!r}>'
+
+    @property
+    def path(self) -> Path:
+        """Return the file path."""
+        return self._path
+
+    @staticmethod
+    def _key(endpoint: str, project: str, user: Optional[str],
+             kind: str) -> str:
+        return json.dumps([endpoint, project, user or '', kind])
+
+    @contextmanager
+    def _lock(self, exclusive: bool) -> Iterator[None]:
+        """Lock the store between processes.
+
+        :raise K2hr3Exception: if the lock file could not be opened.
+        """
+        try:
+            self._path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError as error:
+            raise K2hr3Exception(
+                f'could not lock the token store, {error}') from error
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            except OSError as error:
+                raise K2hr3Exception(
+                    f'could not lock the token store, {error}') from error
+            yield
+        finally:
+            os.close(fd)  # NOTE: closing the file releases the lock.
+
+    def _read(self) -> Dict[str, Any]:
+        """Read the tokens. The lock must be held.
+
+        A file that other users can write or read is ignored.
+        """
+        try:
+            with open(self._path, encoding='utf-8') as file:
+                stat = os.fstat(file.fileno())
+                if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+                    LOG.warning('ignored the token store %s that other users '
+                                'can access', self._path)
+                    return {}
+                data = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as error:
+            LOG.warning('ignored the broken token store %s, %s',
+                        self._path, error)
+            return {}
+        if not isinstance(data, dict) or \
+                data.get('version') != _STORE_VERSION:
+            return {}
+        tokens = data.get('tokens')
+        return tokens if isinstance(tokens, dict) else {}
+
+    def _write(self, tokens: Dict[str, Any]) -> None:
+        """Replace the tokens atomically. The exclusive lock must be held."""
+        now = self._clock()
+        tokens = {key: entry for key, entry in tokens.items()
+                  if entry.get('expires_at', 0) > now}
+        fd, tmp_path = tempfile.mkstemp(dir=self._path.parent,
+                                        prefix=self._path.name + '.')
+        try:
+            os.fchmod(fd, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump({'version': _STORE_VERSION, 'tokens': tokens}, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self._path)
+        except OSError as error:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise K2hr3Exception(
+                f'could not write the token store, {error}') from error
+
+    def get(self, endpoint: str, project: str, user: Optional[str] = None,
+            kind: str = 'token',
+            min_ttl: float = 0) -> Optional[Tuple[Any, float]]:
+        """Return a valid token and the epoch seconds when it expires.
+
+        :param min_ttl: the seconds the token must be valid for at least
+        :type min_ttl: float
+        :returns: the token and the expiry or None if not found
+        """
+        with self._lock(exclusive=False):
+            entry = self._read().get(self._key(endpoint, project, user, kind))
+        if not isinstance(entry, dict):
+            return None
+        expires_at = entry.get('expires_at', 0)
+        if expires_at - min_ttl <= self._clock():
+            return None
+        return entry.get('value'), expires_at
+
+    def put(self, endpoint: str, project: str, user: Optional[str],
+            value: Any, expires_at: float, kind: str = 'token') -> None:
+        """Store a JSON serializable token that expires at the epoch seconds.
+
+        :raise K2hr3Exception: if the store could not be written.
+        """
+        with self._lock(exclusive=True):
+            tokens = self._read()
+            tokens[self._key(endpoint, project, user, kind)] = {
+                'value': value, 'expires_at': expires_at}
+            self._write(tokens)
+
+    def delete(self, endpoint: str, project: str, user: Optional[str] = None,
+               kind: str = 'token') -> None:
+        """Remove a token."""
+        with self._lock(exclusive=True):
+            tokens = self._read()
+            if tokens.pop(self._key(endpoint, project, user, kind), None):
+                self._write(tokens)
+
+    def clear(self) -> None:
+        """Remove all tokens."""
+        with self._lock(exclusive=True):
+            self._write({})
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
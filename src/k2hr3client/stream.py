@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""K2HR3 Python Client of streaming responses.
+
+A large response is parsed incrementally and the elements are yielded one by
+one, so the memory usage is bounded by the size of an element.
+
+.. code-block:: python
+
+    # Import modules from k2hr3client package.
+    from k2hr3client.http import K2hr3Http
+    from k2hr3client.list import K2hr3List
+    from k2hr3client import stream
+
+    myhttp = K2hr3Http("http://127.0.0.1:18080")
+    mylist = K2hr3List("gAAAAA...", "service")
+    for yrn in stream.iter_list_yrns(myhttp, mylist.get(expand=True)):
+        print(yrn)  // yrn:yahoo:::demo:role:...
+
+"""
+
+import logging
+from typing import Any, Iterator, Optional
+
+from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod
+from k2hr3client.http import K2hr3Http
+from k2hr3client.jsonscan import iter_json
+from k2hr3client.model import K2hr3RoleTokenEntryModel, to_role_host
+from k2hr3client.role import K2hr3RoleHost
+
+LOG = logging.getLogger(__name__)
+
+
+def _stream(r3http: K2hr3Http, r3api: K2hr3Api,
+            chunk_size: Optional[int]) -> Iterator[str]:
+    """Send a GET request of the API and iterate the response by chunks."""
+    request = r3api.build_request(K2hr3HTTPMethod.GET)
+    if chunk_size:
+        return r3http.stream(request, chunk_size)
+    return r3http.stream(request)
+
+
+def _walk_children(child: Any) -> Iterator[str]:
+    """Iterate the YRN paths of a child of K2HR3 LIST API."""
+    if isinstance(child, str):
+        yield child
+    elif isinstance(child, dict):
+        if child.get('name') is not None:
+            yield child['name']
+        for grandchild in child.get('children') or []:
+            yield from _walk_children(grandchild)
+
+
+def iter_list_yrns(r3http: K2hr3Http, r3api: K2hr3Api,
+                   chunk_size: Optional[int] = None) -> Iterator[str]:
+    """Iterate the YRN paths in the response of K2HR3 LIST API."""
+    for child in iter_json(_stream(r3http, r3api, chunk_size), ('children',)):
+        yield from _walk_children(child)
+
+
+def iter_tenants(r3http: K2hr3Http, r3api: K2hr3Api,
+                 chunk_size: Optional[int] = None) -> Iterator[Any]:
+    """Iterate the tenants in the response of K2HR3 TENANT API."""
+    return iter_json(_stream(r3http, r3api, chunk_size), ('tenants',))
+
+
+def iter_role_tokens(r3http: K2hr3Http, r3api: K2hr3Api,
+                     chunk_size: Optional[int] = None
+                     ) -> Iterator[K2hr3RoleTokenEntryModel]:
+    """Iterate the role tokens in the response of ROLE TOKEN LIST API."""
+    for token in iter_json(_stream(r3http, r3api, chunk_size), ('tokens',)):
+        if isinstance(token, tuple):
+            yield K2hr3RoleTokenEntryModel(*token)
+        else:
+            yield K2hr3RoleTokenEntryModel(token, {})
+
+
+def iter_role_hosts(r3http: K2hr3Http, r3api: K2hr3Api,
+                    chunk_size: Optional[int] = None
+                    ) -> Iterator[K2hr3RoleHost]:
+    """Iterate the hosts in the response of K2HR3 ROLE API."""
+    for host in iter_json(_stream(r3http, r3api, chunk_size),
+                          ('role', 'hosts', 'hostnames'),
+                          ('role', 'hosts', 'ips')):
+        yield to_role_host(host)
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
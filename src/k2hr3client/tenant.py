@@ -56,7 +56,7 @@ import logging
 from typing import List, Optional
 
 
-from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod
+from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod, json_headers
 
 LOG = logging.getLogger(__name__)
 
@@ -89,7 +89,8 @@ class K2hr3Tenant(K2hr3Api):  # pylint: disable=too-many-instance-attributes
     See https://k2hr3.antpick.ax/api_tenant.html for details.
     """
 
-    __slots__ = ('_r3token',)
+    __slots__ = ('_r3token', 'tenant_name', 'users', 'desc', 'display',
+                 'tenant_id', 'expand')
 
     def __init__(self, r3token: str):
         """Init the members."""
@@ -97,10 +98,7 @@ class K2hr3Tenant(K2hr3Api):  # pylint: disable=too-many-instance-attributes
         self.r3token = r3token
 
         # following attrs are dynamically set later.
-        self.headers = {
-            'Content-Type': 'application/json',
-            'x-auth-token': 'U={}'.format(self._r3token)
-        }
+        self.headers = json_headers(f'U={self._r3token}')
         self.body = None
         self.urlparams = None
         # attributes that are unique to this class
@@ -238,28 +236,28 @@ class K2hr3Tenant(K2hr3Api):  # pylint: disable=too-many-instance-attributes
         if method == K2hr3HTTPMethod.PUT:
             if self.api_id == 1:
                 python_data = json.loads(_TENANT_API_CREATE_TENANT)
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'name': self.tenant_name,
                     'users': self.users,
                     'desc': self.desc,
                     'display': self.display
-                })
+                }
                 return f'{self.version}/{self.basepath}'
             if self.api_id == 3:
                 python_data = json.loads(_TENANT_API_UPDATE_TENANT)
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'id': self.tenant_id,
                     'users': self.users,
                     'desc': self.desc,
                     'display': self.display
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.tenant_name}'
 
         if method == K2hr3HTTPMethod.GET:
             if self.api_id == 5:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'expand': self.expand
-                })
+                }
                 return f'{self.version}/{self.basepath}'
             if self.api_id == 6:
                 return f'{self.version}/{self.basepath}/{self.tenant_name}'
@@ -270,15 +268,15 @@ class K2hr3Tenant(K2hr3Api):  # pylint: disable=too-many-instance-attributes
 
         if method == K2hr3HTTPMethod.DELETE:
             if self.api_id == 8:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'tenant': self.tenant_name,
                     'id': self.tenant_id
-                })
+                }
                 return f'{self.version}/{self.basepath}'
             if self.api_id == 9:
-                self.urlparams = json.dumps({
+                self.urlparams = {
                     'id': self.tenant_id
-                })
+                }
                 return f'{self.version}/{self.basepath}/{self.tenant_name}'
         return None
 #
@@ -183,16 +183,25 @@
 
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+import functools
+import hashlib
+import heapq
 import json
 import logging
-from typing import Optional
+import ssl
+import time
+from typing import Any, Dict, List, Optional, Tuple
 import urllib.parse
 import urllib.request
 
 
-from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod
+from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod, json_headers
+from k2hr3client.cache import K2hr3ExpiringCache, parse_expire
 from k2hr3client.exception import K2hr3Exception
+from k2hr3client.http import K2hr3ConnectionPool
+from k2hr3client import CONFIG
 
 LOG = logging.getLogger(__name__)
 
@@ -257,6 +266,12 @@ IDENTITY_V3_TOKEN_AUTH_JSON_DATA = """
 """
 
 
+# NOTE: Keystone returns the expires_at of a token. This is a fallback.
+_UNSCOPED_TOKEN_TTL_SECONDS = 3600
+_UNSCOPED_TOKENS = K2hr3ExpiringCache(maxsize=64)
+_IDENTITY_POOL = K2hr3ConnectionPool()
+
+
 class K2hr3AuthType(Enum):
     """Represent the type of authentication."""
 
@@ -270,7 +285,7 @@ class K2hr3Token(K2hr3Api):  # pylint: disable=too-many-instance-attributes
     See https://k2hr3.antpick.ax/api_token.html for details.
     """
 
-    __slots__ = ('_tenant', '_openstack_token', )
+    __slots__ = ('_tenant', '_openstack_token', 'user', 'password')
 
     def __init__(self, iaas_project, iaas_token,
                  auth_type=K2hr3AuthType.TOKEN,
@@ -287,14 +302,9 @@ class K2hr3Token(K2hr3Api):  # pylint: disable=too-many-instance-attributes
 
         # following attrs are dynamically set later.
         if auth_type == K2hr3AuthType.TOKEN:
-            self.headers = {
-                'Content-Type': 'application/json',
-                'x-auth-token': 'U={}'.format(self._openstack_token)
-            }
+            self.headers = json_headers(f'U={self._openstack_token}')
         elif auth_type == K2hr3AuthType.CREDENTIAL:
-            self.headers = {
-                'Content-Type': 'application/json'
-            }
+            self.headers = json_headers()
         self.body = None
         self.urlparams = None
 
@@ -387,15 +397,15 @@ class K2hr3Token(K2hr3Api):  # pylint: disable=too-many-instance-attributes
         if method == K2hr3HTTPMethod.PUT:
             if self.api_id == 1:
                 if self.user and self.password:
-                    self.urlparams = json.dumps({
+                    self.urlparams = {
                         'user': self.user,
                         'password': self.password,
                         'tenantname': self.iaas_project
-                    })
+                    }
                 else:
-                    self.urlparams = json.dumps({
+                    self.urlparams = {
                         'tenantname': self.iaas_project
-                    })
+                    }
                 return f'{self.version}/{self.basepath}'
         if method == K2hr3HTTPMethod.GET:
             if self.api_id == 2:
@@ -409,42 +419,116 @@ class K2hr3Token(K2hr3Api):  # pylint: disable=too-many-instance-attributes
     # the other methods
     #
     @staticmethod
-    def get_openstack_token(identity_url, user, password, project):
-        """Get the openstack token."""
+    def get_openstack_token(identity_url, user, password, project,
+                            pool=None):
+        """Get the openstack token.
+
+        The unscoped token of the user is cached until it expires and is
+        reused to get the scoped tokens of any project.
+
+        :raise K2hr3Exception: if the identity server returns an error.
+        """
+        pool = pool or _IDENTITY_POOL
+        unscoped_token_id = _get_unscoped_token(identity_url, user, password,
+                                                pool)
+        if not unscoped_token_id:
+            return None
+        return _get_scoped_token(identity_url, unscoped_token_id, project,
+                                 pool)
+
+    @staticmethod
+    def get_openstack_tokens(identity_url, user, password, projects,
+                             max_workers=8, pool=None):
+        """Get the openstack tokens of the projects concurrently.
+
+        The unscoped token is got once and the connections are reused.
+
+        :returns: the scoped token of each project or None if it failed
+        :rtype: dict
+        :raise K2hr3Exception: if the unscoped token could not be got.
+        """
+        pool = pool or _IDENTITY_POOL
+        tokens = {}  # type: Dict[str, Optional[str]]
+        unscoped_token_id = _get_unscoped_token(identity_url, user, password,
+                                                pool)
+        if not unscoped_token_id:
+            return {project: None for project in projects}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_get_scoped_token, identity_url,
+                                unscoped_token_id, project, pool): project
+                for project in projects}
+            for future, project in futures.items():
+                try:
+                    tokens[project] = future.result()
+                except (K2hr3Exception, OSError) as error:
+                    LOG.error('could not get a token of %s, %s',
+                              project, error)
+                    tokens[project] = None
+        return tokens
+
+
+@functools.lru_cache(maxsize=None)
+def _identity_ssl_context():
+    """Return the ssl context that verifies the identity server."""
+    return ssl.create_default_context()
+
+
+def _identity_post(identity_url, python_data, pool):
+    """POST a request to the identity server and return the response."""
+    headers = {
+        'User-Agent': 'k2hr3client-python',
+        'Content-Type': 'application/json'
+    }
+    req = urllib.request.Request(identity_url,
+                                 json.dumps(python_data).encode('ascii'),
+                                 headers, method="POST")
+    # NOTE: the requests carry the credentials, so the certificate of the
+    # identity server is always verified whatever allow_self_signed_cert is.
+    resp = pool.urlopen(req, CONFIG['http'].getint('timeout_seconds'),
+                        _identity_ssl_context())
+    if resp.code >= 400:
+        raise K2hr3Exception(
+            f'identity server returned an error, code {resp.code}')
+    return resp
+
+
+def _get_unscoped_token(identity_url, user, password, pool):
+    """Return the cached or a new unscoped token."""
+    def loader():
         # unscoped token-id
         # https://docs.openstack.org/api-ref/identity/v3/index.html#password-authentication-with-unscoped-authorization
         python_data = json.loads(IDENTITY_V3_PASSWORD_AUTH_JSON_DATA)
         python_data['auth']['identity']['password']['user']['name'] = user
         python_data['auth']['identity']['password']['user']['password'] = password  # noqa
-        headers = {
-            'User-Agent': 'k2hr3client-python',
-            'Content-Type': 'application/json'
-        }
-        req = urllib.request.Request(identity_url,
-                                     json.dumps(python_data).encode('ascii'),
-                                     headers, method="POST")
-        unscoped_token_id = ""
-        with urllib.request.urlopen(req) as res:
-            unscoped_token_id = dict(res.info()).get('X-Subject-Token')
-        if not unscoped_token_id:
-            return None
-
-        # scoped token-id
-        # https://docs.openstack.org/api-ref/identity/v3/index.html?expanded=#token-authentication-with-scoped-authorization
-        python_data = json.loads(IDENTITY_V3_TOKEN_AUTH_JSON_DATA)
-        python_data['auth']['identity']['token']['id'] = unscoped_token_id
-        python_data['auth']['scope']['project']['name'] = project
-        headers = {
-            'User-Agent': 'k2hr3client-python',
-            'Content-Type': 'application/json'
-        }
-        req = urllib.request.Request(identity_url,
-                                     json.dumps(python_data).encode('ascii'),
-                                     headers, method="POST")
-        with urllib.request.urlopen(req) as res:
-            scoped_token_id = dict(res.info()).get('X-Subject-Token')
-            return scoped_token_id
-        return None
+        now = time.time()
+        resp = _identity_post(identity_url, python_data, pool)
+        token_id = resp.hdrs.get('X-Subject-Token')
+        if not token_id:
+            # NOTE: None expires now, so it is not cached.
+            return None, now
+        expires_at = None
+        try:
+            expires_at = parse_expire(
+                json.loads(resp.body)['token']['expires_at'])
+        except (ValueError, KeyError, TypeError):
+            LOG.debug('no expires_at of the unscoped token')
+        return token_id, expires_at or now + _UNSCOPED_TOKEN_TTL_SECONDS
+
+    key = (identity_url, user,
+           hashlib.sha256(password.encode('utf-8')).hexdigest())
+    return _UNSCOPED_TOKENS.get(key, loader)
+
+
+def _get_scoped_token(identity_url, unscoped_token_id, project, pool):
+    """Return a new scoped token of the project."""
+    # scoped token-id
+    # https://docs.openstack.org/api-ref/identity/v3/index.html?expanded=#token-authentication-with-scoped-authorization
+    python_data = json.loads(IDENTITY_V3_TOKEN_AUTH_JSON_DATA)
+    python_data['auth']['identity']['token']['id'] = unscoped_token_id
+    python_data['auth']['scope']['project']['name'] = project
+    resp = _identity_post(identity_url, python_data, pool)
+    return resp.hdrs.get('X-Subject-Token')
 
 
 class K2hr3RoleToken(K2hr3Api):  # pylint: disable=too-many-instance-attributes
@@ -453,7 +537,7 @@ class K2hr3RoleToken(K2hr3Api):  # pylint: disable=too-many-instance-attributes
     See https://k2hr3.antpick.ax/api_role.html for details.
     """
 
-    __slots__ = ('_r3token', '_role', '_expand')
+    __slots__ = ('_r3token', '_role', '_expire', 'path')
 
     def __init__(self, r3token, role, expire):
         """Init the members."""
@@ -463,17 +547,13 @@ class K2hr3RoleToken(K2hr3Api):  # pylint: disable=too-many-instance-attributes
         # path should be "role/token/$roletoken".
         self.path = "/".join([self.basepath, self.role])
         self.expire = expire
-        self.params = json.dumps({'expire': self._expire})
-        self.headers = {
-            'Content-Type': 'application/json',
-            'x-auth-token': 'U={}'.format(self._r3token)
-        }
+        self.headers = json_headers(f'U={self._r3token}')
 
     def __repr__(self):
         """Represent the instance."""
         attrs = []
         values = ""
-        for attr in ['_r3token', '_role', '_expand']:
+        for attr in ['_r3token', '_role', '_expire']:
             val = getattr(self, attr, None)
             if val:
                 attrs.append((attr, repr(val)))
@@ -529,17 +609,96 @@ class K2hr3RoleToken(K2hr3Api):  # pylint: disable=too-many-instance-attributes
     def _api_path(self, method: K2hr3HTTPMethod) -> Optional[str]:
         """Get the request url path."""
         if method == K2hr3HTTPMethod.GET:
+            self.urlparams = {'expire': self._expire}
             return f'{self.version}/{self.path}'
         return None
 
 
+class K2hr3RoleTokenIndex():
+    """Index the role tokens in a response of ROLE TOKEN LIST API.
+
+    The index is built once and looks up a role token by the token string or
+    by the registerpath. The role tokens are ordered by the expiry in a heap.
+    """
+
+    __slots__ = ('_entries', '_by_registerpath', '_heap')
+
+    def __init__(self, tokens: Any) -> None:
+        """Init the members.
+
+        :param tokens: the tokens member of the response
+        :type tokens: dict or list
+        """
+        if isinstance(tokens, dict):
+            self._entries = {token: entry if isinstance(entry, dict) else {}
+                             for token, entry in tokens.items()}
+        else:
+            self._entries = {token: {} for token in tokens or []}
+        self._by_registerpath = {}  # type: Dict[str, str]
+        self._heap = []  # type: List[Tuple[float, str]]
+        for token, entry in self._entries.items():
+            if entry.get('registerpath'):
+                self._by_registerpath[entry['registerpath']] = token
+            expires_at = parse_expire(entry.get('expire'))
+            if expires_at is not None:
+                self._heap.append((expires_at, token))
+        heapq.heapify(self._heap)
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3RoleTokenIndex size={len(self._entries)}>'
+
+    def __len__(self) -> int:
+        """Return the number of role tokens."""
+        return len(self._entries)
+
+    def __contains__(self, token: object) -> bool:
+        """Return True if the role token exists."""
+        return token in self._entries
+
+    def __iter__(self):
+        """Iterate the role tokens."""
+        return iter(self._entries)
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the details of a role token."""
+        return self._entries.get(token)
+
+    def registerpath(self, token: str) -> Optional[str]:
+        """Return the registerpath of a role token."""
+        entry = self._entries.get(token)
+        return entry.get('registerpath') if entry else None
+
+    def token(self, registerpath: str) -> Optional[str]:
+        """Return the role token of a registerpath."""
+        return self._by_registerpath.get(registerpath)
+
+    def next_expiry(self) -> Optional[float]:
+        """Return the epoch seconds when the first role token expires."""
+        return self._heap[0][0] if self._heap else None
+
+    def expired(self, now: Optional[float] = None) -> List[str]:
+        """Return the role tokens that have expired, the oldest first."""
+        now = time.time() if now is None else now
+        found = []
+        # NOTE: children of a node in a heap expire after the node.
+        stack = [0] if self._heap and self._heap[0][0] <= now else []
+        while stack:
+            pos = stack.pop()
+            found.append(self._heap[pos])
+            for child in (2 * pos + 1, 2 * pos + 2):
+                if child < len(self._heap) and self._heap[child][0] <= now:
+                    stack.append(child)
+        return [token for _, token in sorted(found)]
+
+
 class K2hr3RoleTokenList(K2hr3Api):  # pylint: disable=too-many-instance-attributes # noqa
     """Represent K2hr3 ROLE TOKEN LIST API.
 
     See https://k2hr3.antpick.ax/api_role.html for details.
     """
 
-    __slots__ = ('_r3token', '_role', '_expand')
+    __slots__ = ('_r3token', '_role', '_expand', 'path', '_index')
 
     def __init__(self, r3token, role, expand):
         """Init the members."""
@@ -549,12 +708,11 @@ class K2hr3RoleTokenList(K2hr3Api):  # pylint: disable=too-many-instance-attribu
         self.expand = expand
 
         # headers should include r3token
-        self.headers = {
-            'Content-Type': 'application/json',
-            'x-auth-token': 'U={}'.format(self._r3token)
-        }
+        self.headers = json_headers(f'U={self._r3token}')
         # path should be "role/token/$roletoken".
         self.path = "/".join([self.basepath, self.role])
+        # NOTE: the index is built once for a response.
+        self._index = None  # type: Optional[Tuple[Any, K2hr3RoleTokenIndex]]
 
     def __repr__(self):
         """Represent the instance."""
@@ -604,10 +762,22 @@ class K2hr3RoleTokenList(K2hr3Api):  # pylint: disable=too-many-instance-attribu
         if getattr(self, '_r3token', None) is None:
             self._r3token = val
 
+    @property
+    def index(self) -> K2hr3RoleTokenIndex:
+        """Return the index of the role tokens in the response."""
+        resp = self.resp
+        if self._index is None or self._index[0] is not resp:
+            python_data = json.loads(resp.body)
+            self._index = (resp, K2hr3RoleTokenIndex(python_data['tokens']))
+        return self._index[1]
+
     def registerpath(self, roletoken):
         """Set the registerpath."""
-        python_data = json.loads(self.resp.body)
-        return python_data['tokens'][roletoken]['registerpath']
+        registerpath = self.index.registerpath(roletoken)
+        if registerpath is None:
+            # NOTE: KeyError is raised for backward compatibility.
+            raise KeyError(roletoken)
+        return registerpath
 
     #
     # abstract methos that must be implemented in subclasses
@@ -615,6 +785,7 @@ class K2hr3RoleTokenList(K2hr3Api):  # pylint: disable=too-many-instance-attribu
     def _api_path(self, method: K2hr3HTTPMethod) -> Optional[str]:
         """Get the request url path."""
         if method == K2hr3HTTPMethod.GET:
+            self.urlparams = {'expand': self._expand}
             return f'{self.version}/{self.path}'
         return None
 
@@ -38,6 +38,7 @@
 
 """
 import logging
+from types import MappingProxyType
 from typing import Optional
 
 
@@ -46,6 +47,11 @@ from k2hr3client.exception import K2hr3Exception
 
 LOG = logging.getLogger(__name__)
 
+_USERDATA_HEADERS = MappingProxyType({
+    'Content-Type': 'application/octet-stream',
+    'User-Agent': 'Cloud-Init 0.7.9',
+})
+
 
 class K2hr3Userdata(K2hr3Api):  # pylint: disable=too-many-instance-attributes # noqa
     """Relationship with K2HR3 USERDATA API.
@@ -62,10 +68,7 @@ class K2hr3Userdata(K2hr3Api):  # pylint: disable=too-many-instance-attributes #
         self.userdatapath = userdatapath
 
         # following attrs are dynamically set later.
-        self.headers = {
-            'Content-Type': 'application/octet-stream',
-            'User-Agent': 'Cloud-Init 0.7.9',
-        }
+        self.headers = _USERDATA_HEADERS
         self.body = None
         self.urlparams = None
 
@@ -39,7 +39,7 @@ import logging
 from typing import Optional
 
 
-from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod
+from k2hr3client.api import K2hr3Api, K2hr3HTTPMethod, json_headers
 
 LOG = logging.getLogger(__name__)
 
@@ -50,7 +50,7 @@ class K2hr3Version(K2hr3Api):  # pylint: disable=too-many-instance-attributes
     See https://k2hr3.antpick.ax/api_version.html for details.
     """
 
-    __slots__ = ('_name',)
+    __slots__ = ('name',)
 
     def __init__(self, version=""):
         """Init the members."""
@@ -58,9 +58,7 @@ class K2hr3Version(K2hr3Api):  # pylint: disable=too-many-instance-attributes
         self.name = version
 
         # following attrs are dynamically set later.
-        self.headers = {
-            'Content-Type': 'application/json',
-        }
+        self.headers = json_headers()
         self.body = None
         self.urlparams = None
 
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+#
+"""K2HR3 Python Client of the resource watcher.
+
+The resources are polled and the callbacks are called only with the changes.
+A resource that is not changed is polled less often.
+
+.. code-block:: python
+
+    # Import modules from k2hr3client package.
+    import threading
+    from k2hr3client.http import K2hr3Http
+    from k2hr3client.watcher import K2hr3ResourceWatcher
+
+    myhttp = K2hr3Http("http://127.0.0.1:18080")
+    def on_error(path, message):
+        print(path, message)  // renew the token if it expired
+
+    watcher = K2hr3ResourceWatcher(myhttp, r3token="gAAAAA...",
+                                   min_interval=5, max_interval=300,
+                                   on_error=on_error)
+
+    def on_change(change):
+        if change.data_changed:
+            print(change.path, change.data)
+        print(change.keys, change.removed_keys)
+
+    watcher.watch("conf", on_change)
+    stop = threading.Event()
+    watcher.run(stop)  // polls until stop is set
+
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from k2hr3client.api import K2hr3HTTPMethod, K2hr3Request
+from k2hr3client.bulk import (DEFAULT_MAX_WORKERS, resource_get_api,
+                              run_bulk)
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client.http import K2hr3Http
+from k2hr3client.model import K2hr3ResourceModel
+
+LOG = logging.getLogger(__name__)
+
+_NOT_MODIFIED = 304
+_NOT_FOUND = 404
+
+
+class K2hr3ResourceChange():
+    """Represent a change of a resource.
+
+    The keys are the keys that are added or changed with the new values.
+    """
+
+    __slots__ = ('path', 'data', 'previous', 'data_changed', 'keys',
+                 'removed_keys', 'deleted')
+
+    def __init__(self, path: str, data: Any, previous: Any,  # pylint: disable=too-many-arguments # noqa
+                 data_changed: bool, keys: Dict[str, Any],
+                 removed_keys: FrozenSet[str], deleted: bool = False) -> None:
+        """Init the members."""
+        self.path = path
+        self.data = data
+        self.previous = previous
+        self.data_changed = data_changed
+        self.keys = keys
+        self.removed_keys = removed_keys
+        self.deleted = deleted
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3ResourceChange path={self.path!r} ' \
+               f'data_changed={self.data_changed} ' \
+               f'keys={sorted(self.keys)!r} ' \
+               f'removed_keys={sorted(self.removed_keys)!r} ' \
+               f'deleted={self.deleted}>'
+
+
+class _K2hr3WatchEntry():
+    """Hold the mirror of a resource."""
+
+    __slots__ = ('callbacks', 'digest', 'etag', 'data', 'keys', 'interval',
+                 'next_poll')
+
+    def __init__(self, interval: float, next_poll: float) -> None:
+        self.callbacks = []  # type: List[Callable[[K2hr3ResourceChange], Any]] # noqa
+        self.digest = None  # type: Optional[str]
+        self.etag = None  # type: Optional[str]
+        self.data = None  # type: Any
+        self.keys = {}  # type: Dict[str, Any]
+        self.interval = interval
+        self.next_poll = next_poll
+
+
+class K2hr3ResourceWatcher():
+    """Poll the resources and call the callbacks with the changes.
+
+    A response is compared with the previous one by the ETag if the server
+    returns it or by the digest of the body, so an unchanged resource is not
+    decoded. The interval of a resource is doubled up to the max interval
+    while it is not changed and is reset to the min interval when it is
+    changed. The interval is kept if the resource could not be got, and the
+    on_error callback is called with the path and the error message.
+    """
+
+    __slots__ = ('_http', '_options', '_min_interval', '_max_interval',
+                 '_max_workers', '_clock', '_entries', '_lock', '_on_error')
+
+    def __init__(self, r3http: K2hr3Http, r3token: Optional[str] = None,  # pylint: disable=too-many-arguments # noqa
+                 roletoken: Optional[str] = None,
+                 min_interval: float = 5.0, max_interval: float = 300.0,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 clock: Callable[[], float] = time.monotonic,
+                 on_error: Optional[Callable[[str, str], Any]] = None,
+                 **options: Any) -> None:
+        """Init the members.
+
+        :param r3http: the http client of the K2HR3 API server
+        :type r3http: K2hr3Http
+        :param r3token: the K2HR3 token
+        :type r3token: str
+        :param roletoken: the role token used if no K2HR3 token is given
+        :type roletoken: str
+        :param min_interval: the min seconds between the polls of a resource
+        :type min_interval: float
+        :param max_interval: the max seconds between the polls of a resource
+        :type max_interval: float
+        :param on_error: the function that is called with the path and the
+                         error message of a resource that could not be got
+        :param options: the expand, the service, the data_type and the keys
+                        of bulk.resource_get_api
+        :raise K2hr3Exception: if no token is given.
+        """
+        if not (r3token or roletoken):
+            raise K2hr3Exception('r3token or roletoken required')
+        self._http = r3http
+        self._options = dict(options, r3token=r3token, roletoken=roletoken)
+        self._min_interval = min_interval
+        self._max_interval = max(min_interval, max_interval)
+        self._max_workers = max_workers
+        self._clock = clock
+        self._entries = {}  # type: Dict[str, _K2hr3WatchEntry]
+        self._lock = threading.Lock()
+        self._on_error = on_error
+
+    def __repr__(self) -> str:
+        """Represent the instance."""
+        return f'<K2hr3ResourceWatcher paths={sorted(self._entries)!r}>'
+
+    @property
+    def paths(self) -> List[str]:
+        """Return the watched paths."""
+        with self._lock:
+            return list(self._entries)
+
+    def watch(self, path: str,
+              callback: Optional[Callable[[K2hr3ResourceChange], Any]] = None
+              ) -> None:
+        """Watch a resource and call the callback with the changes.
+
+        The first poll of a resource is a change from nothing.
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                entry = _K2hr3WatchEntry(self._min_interval, self._clock())
+                self._entries[path] = entry
+            if callback is not None:
+                entry.callbacks.append(callback)
+
+    def unwatch(self, path: str) -> None:
+        """Stop watching a resource."""
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def mirror(self, path: str) -> Any:
+        """Return the data of a resource in the local mirror."""
+        with self._lock:
+            entry = self._entries.get(path)
+            return None if entry is None else entry.data
+
+    def next_poll(self) -> Optional[float]:
+        """Return the time when a resource is polled next."""
+        with self._lock:
+            return min((entry.next_poll for entry in self._entries.values()),
+                       default=None)
+
+    def _fetch(self, path: str, etag: Optional[str]) -> Tuple[int, Any, Any]:
+        """GET a resource and return the code, the ETag and the body."""
+        request = resource_get_api(path, **self._options).build_request(
+            K2hr3HTTPMethod.GET)
+        if etag:
+            request = K2hr3Request(request.method, request.path,
+                                   request.urlparams,
+                                   dict(request.headers,
+                                        **{'If-None-Match': etag}),
+                                   request.body)
+        resp = self._http.send(request)
+        if resp.code >= 400 and resp.code != _NOT_FOUND:
+            raise K2hr3Exception(f'could not get {path}, code {resp.code}')
+        return resp.code, resp.hdrs.get('ETag'), resp.body
+
+    def poll(self, force: bool = False) -> List[K2hr3ResourceChange]:
+        """Poll the resources that are due and call the callbacks.
+
+        :param force: poll all resources if True
+        :type force: bool
+        :returns: the changes
+        :rtype: list
+        """
+        now = self._clock()
+        with self._lock:
+            due = {path: entry.etag for path, entry in self._entries.items()
+                   if force or entry.next_poll <= now}
+        result = run_bulk(due, lambda path: self._fetch(path, due[path]),
+                          self._max_workers)
+
+        changes = []
+        with self._lock:
+            for path in due:
+                entry = self._entries.get(path)
+                if entry is None:
+                    continue
+                if path not in result.succeeded:
+                    # NOTE: a failure is not regarded as no change.
+                    entry.next_poll = now + entry.interval
+                    continue
+                change = self._update(path, entry, *result.succeeded[path])
+                if change is None:
+                    entry.interval = min(entry.interval * 2,
+                                         self._max_interval)
+                else:
+                    entry.interval = self._min_interval
+                    changes.append((change, list(entry.callbacks)))
+                entry.next_poll = now + entry.interval
+        for change, callbacks in changes:
+            for callback in callbacks:
+                try:
+                    callback(change)
+                except Exception:  # pylint: disable=broad-except
+                    LOG.exception('callback of %s failed', change.path)
+        for path, message in result.failed.items():
+            LOG.warning('could not poll %s, %s', path, message)
+            if self._on_error is not None:
+                try:
+                    self._on_error(path, message)  # type: ignore[arg-type]
+                except Exception:  # pylint: disable=broad-except
+                    LOG.exception('error callback of %s failed', path)
+        return [change for change, _ in changes]
+
+    @staticmethod
+    def _update(path: str, entry: _K2hr3WatchEntry, code: int,  # pylint: disable=too-many-arguments # noqa
+                etag: Optional[str],
+                body: Any) -> Optional[K2hr3ResourceChange]:
+        """Update the mirror and return the change or None."""
+        if code == _NOT_MODIFIED:
+            return None
+        if code == _NOT_FOUND:
+            if entry.digest is None:
+                return None
+            change = K2hr3ResourceChange(path, None, entry.data,
+                                         entry.data is not None, {},
+                                         frozenset(entry.keys), True)
+            entry.digest, entry.etag, entry.data, entry.keys = \
+                None, None, None, {}
+            return change
+        digest = hashlib.sha256((body or '').encode('utf-8')).hexdigest()
+        entry.etag = etag
+        if digest == entry.digest:
+            return None
+        model = K2hr3ResourceModel(body or None)
+        data, keys = model.data, dict(model.keys)
+        changed_keys = {key: val for key, val in keys.items()
+                        if key not in entry.keys or entry.keys[key] != val}
+        removed_keys = frozenset(key for key in entry.keys
+                                 if key not in keys)
+        change = K2hr3ResourceChange(
+            path, data, entry.data,
+            entry.digest is None or data != entry.data, changed_keys,
+            removed_keys)
+        entry.digest, entry.data, entry.keys = digest, data, keys
+        if not (change.data_changed or changed_keys or removed_keys):
+            return None
+        return change
+
+    def run(self, stop: threading.Event) -> None:
+        """Poll the resources until the stop is set."""
+        while not stop.is_set():
+            self.poll()
+            next_poll = self.next_poll()
+            wait = self._min_interval if next_poll is None else \
+                max(next_poll - self._clock(), 0)
+            stop.wait(wait)
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
@@ -24,7 +24,6 @@ import json
 import logging
 import unittest
 from unittest.mock import patch
-import urllib.parse
 
 from k2hr3client import http as khttp
 from k2hr3client import acr as kacr
@@ -111,8 +110,8 @@ class TestK2hr3Acr(unittest.TestCase):
         self.assertEqual(httpreq.url, f"{self.base_url}/v1/acr/{self.service}")
         # 2. assert URL params
         s_s_urlparams = {'tenant': self.newtenant}
-        self.assertEqual(myacr.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myacr.urlparams, s_s_urlparams)
+        s_urlparams = 'tenant=newtenant'
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -188,8 +187,10 @@ class TestK2hr3Acr(unittest.TestCase):
         # 1. assert URL
         self.assertEqual(httpreq.url, f"{self.base_url}/v1/acr/{self.service}")
         # 2. assert URL params
-        self.assertEqual(myacr.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myacr.urlparams, s_s_urlparams)
+        s_urlparams = (
+            'cip=mycip&cport=mycport&crole=mycrole&ccuk=myccuk&sport=mysport&'
+            'srole=mysrole&scuk=myscuk')
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -218,8 +219,8 @@ class TestK2hr3Acr(unittest.TestCase):
         self.assertEqual(httpreq.url, f"{self.base_url}/v1/acr/{self.service}")
         # 2. assert URL params
         s_s_urlparams = {'tenant': self.newtenant}
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
-        self.assertEqual(myacr.urlparams, json.dumps(s_s_urlparams))
+        s_urlparams = 'tenant=newtenant'
+        self.assertEqual(myacr.urlparams, s_s_urlparams)
         self.assertEqual(httpreq.urlparams, s_urlparams)
         # 3. assert Request headers
         headers = {
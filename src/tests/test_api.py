@@ -24,7 +24,10 @@ import logging
 import unittest
 from http.client import HTTPMessage
 
-from k2hr3client.api import K2hr3ApiResponse
+from k2hr3client.api import (K2hr3ApiResponse, K2hr3HTTPMethod, K2hr3Request,
+                             K2hr3ResponseHeaders, json_headers)
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client import role as krole
 
 LOG = logging.getLogger(__name__)
 
@@ -59,6 +62,123 @@ class TestK2hr3ApiResponse(unittest.TestCase):
         # Note: The order of _error and _code is unknown!
         self.assertRegex(repr(response), '<K2hr3ApiResponse .*>')
 
+    def test_k2hr3apiresponse_compact_headers(self):
+        """Stores the headers in a K2hr3ResponseHeaders instance."""
+        hdrs = HTTPMessage()
+        hdrs['X-Subject-Token'] = 'testtoken'
+        hdrs['Set-Cookie'] = 'a=1'
+        hdrs['Set-Cookie'] = 'b=2'
+        response = K2hr3ApiResponse(code=200, url="http://localhost:18080", hdrs=hdrs, body=None)
+        self.assertIsInstance(response.hdrs, K2hr3ResponseHeaders)
+        self.assertEqual(response.hdrs.get('x-subject-token'), 'testtoken')
+        self.assertEqual(response.hdrs.get_all('set-cookie'), ['a=1', 'b=2'])
+        self.assertEqual(len(response.hdrs), 3)
+        self.assertFalse(hasattr(response.hdrs, '__dict__'))
+
+
+class TestK2hr3ApiSlots(unittest.TestCase):
+    """Tests the memory layout of the K2hr3Api classes."""
+
+    def test_no_instance_dict(self):
+        """Creates no __dict__ in the K2hr3Api instances."""
+        from k2hr3client import acr, extdata, list as klist, policy
+        from k2hr3client import resource, service, tenant, token
+        from k2hr3client import userdata, version
+        for obj in [acr.K2hr3Acr("token", "service"),
+                    extdata.K2hr3Extdata("uri", "path", "ua"),
+                    klist.K2hr3List("token", "service"),
+                    policy.K2hr3Policy("token"),
+                    resource.K2hr3Resource("token"),
+                    krole.K2hr3Role("token"),
+                    krole.K2hr3RoleHost("host", "8020", "cuk", "", "",
+                                        "", ""),
+                    krole.K2hr3RoleHostList(),
+                    service.K2hr3Service("token", "service"),
+                    tenant.K2hr3Tenant("token"),
+                    token.K2hr3Token("project", "token"),
+                    token.K2hr3RoleToken("token", "role", 0),
+                    token.K2hr3RoleTokenList("token", "role", True),
+                    userdata.K2hr3Userdata("path"),
+                    version.K2hr3Version()]:
+            self.assertFalse(hasattr(obj, '__dict__'), type(obj).__name__)
+
+    def test_json_headers_are_read_only(self):
+        """Returns the read-only headers that are not cached."""
+        myrole = krole.K2hr3Role("token")
+        request = myrole.get("role").build_request(K2hr3HTTPMethod.GET)
+        self.assertIs(request.headers, myrole.headers)
+        self.assertIsNot(json_headers("U=token"), json_headers("U=token"))
+        self.assertEqual(json_headers("U=token"),
+                         {'Content-Type': 'application/json',
+                          'x-auth-token': 'U=token'})
+        self.assertEqual(json_headers(),
+                         {'Content-Type': 'application/json'})
+        with self.assertRaises(TypeError):
+            json_headers("U=token")['x-auth-token'] = 'U=other'
+
+
+class TestK2hr3Request(unittest.TestCase):
+    """Tests the K2hr3Request class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_api.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.token = "testtoken"
+        self.name = "testrole"
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def test_k2hr3request_readonly(self):
+        """Changes no members of a K2hr3Request instance."""
+        params = {'expand': True}
+        request = K2hr3Request(K2hr3HTTPMethod.GET, "v1/role", params)
+        params['expand'] = False
+        self.assertEqual(request.urlparams, {'expand': True})
+        with self.assertRaises(AttributeError):
+            request.path = "v1/policy"
+        with self.assertRaises(TypeError):
+            request.urlparams['expand'] = False
+        self.assertRegex(repr(request), '<K2hr3Request .*>')
+
+    def test_build_request_clears_previous_call(self):
+        """Builds requests of different calls by using an instance."""
+        myrole = krole.K2hr3Role(self.token)
+        request = myrole.get(self.name, False).build_request(
+            K2hr3HTTPMethod.GET)
+        self.assertEqual(request.path, f"v1/role/{self.name}")
+        self.assertEqual(request.urlparams, {'expand': False})
+        request = myrole.validate_role(self.name).build_request(
+            K2hr3HTTPMethod.HEAD)
+        self.assertEqual(request.path, f"v1/role/{self.name}")
+        self.assertEqual(request.urlparams, None)
+        self.assertEqual(request.headers['x-auth-token'], f"U={self.token}")
+
+    def test_build_request_unsupported_method(self):
+        """Raises an exception if the call does not support the method."""
+        myrole = krole.K2hr3Role(self.token)
+        with self.assertRaises(K2hr3Exception):
+            myrole.validate_role(self.name).build_request(
+                K2hr3HTTPMethod.GET)
+
+    def test_copy(self):
+        """Copies a K2hr3Api instance without the response."""
+        myrole = krole.K2hr3Role(self.token)
+        hdrs = HTTPMessage()
+        hdrs['mime-version'] = '1.0'
+        myrole.resp = K2hr3ApiResponse(code=200, url="http://localhost",
+                                       hdrs=hdrs, body="{}")
+        mycopy = myrole.copy()
+        self.assertIsInstance(mycopy, krole.K2hr3Role)
+        self.assertIs(mycopy.headers, myrole.headers)
+        self.assertEqual(mycopy.resp, None)
+        self.assertEqual(mycopy.r3token, self.token)
+
 
 #
 # Local variables:
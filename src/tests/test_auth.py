@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers 
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+"""Test Package for K2hr3 Python Client."""
+
+import json
+import logging
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from k2hr3client.api import K2hr3ApiResponse, K2hr3HTTPMethod
+from k2hr3client import role as krole
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client import auth as kauth
+from k2hr3client import http as khttp
+
+LOG = logging.getLogger(__name__)
+
+
+def _response(body, code=201):
+    return K2hr3ApiResponse(code=code, url="http://127.0.0.1:18080",
+                            hdrs={'Content-Type': 'application/json'},
+                            body=json.dumps(body))
+
+
+class _Clock():
+    """Fake clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestK2hr3TokenManager(unittest.TestCase):
+    """Tests the K2hr3TokenManager class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_auth.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.base_url = "http://127.0.0.1:18080"
+        self.clock = _Clock()
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def test_get_token_cached(self):
+        """Creates a token once for the project."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        manager = kauth.K2hr3TokenManager(myhttp, clock=self.clock)
+        with patch.object(khttp.K2hr3Http, 'send', return_value=_response(
+                {"result": True, "scoped": True, "token": "r3token"})
+                ) as mock_send:
+            self.assertEqual(manager.get_token("demo", "iaas"), "r3token")
+            self.assertEqual(manager.get_token("demo", "iaas"), "r3token")
+        self.assertEqual(mock_send.call_count, 1)
+        request = mock_send.call_args[0][0]
+        self.assertEqual(request.method, K2hr3HTTPMethod.POST)
+        self.assertEqual(request.headers['x-auth-token'], 'U=iaas')
+        self.assertEqual(manager.stats.hits, 1)
+
+    def test_get_token_expire(self):
+        """Uses the expire in the response and refreshes the token."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        manager = kauth.K2hr3TokenManager(myhttp, refresh_ahead=0,
+                                          clock=self.clock)
+        with patch.object(khttp.K2hr3Http, 'send', return_value=_response(
+                {"result": True, "token": "r3token", "expire": 1010})
+                ) as mock_send:
+            manager.get_token("demo", lambda: "iaas")
+            self.clock.now = 1010
+            manager.get_token("demo", lambda: "iaas")
+        self.assertEqual(mock_send.call_count, 2)
+
+    def test_get_token_credential(self):
+        """Creates a token by the user and the password."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        manager = kauth.K2hr3TokenManager(myhttp, clock=self.clock)
+        with patch.object(khttp.K2hr3Http, 'send', return_value=_response(
+                {"result": True, "token": "r3token"})) as mock_send:
+            manager.get_token("demo", user="user", password="pass")
+        body = json.loads(mock_send.call_args[0][0].body)
+        self.assertEqual(body['auth']['user'], 'user')
+        self.assertNotIn('x-auth-token', mock_send.call_args[0][0].headers)
+
+    def test_get_token_error(self):
+        """Raises an exception if no token is created."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        manager = kauth.K2hr3TokenManager(myhttp, clock=self.clock)
+        with self.assertRaises(K2hr3Exception):
+            manager.get_token("demo")
+        with patch.object(khttp.K2hr3Http, 'send', return_value=_response(
+                {"result": False}, code=401)):
+            with self.assertRaises(K2hr3Exception):
+                manager.get_token("demo", "iaas")
+
+    def test_invalidate(self):
+        """Creates a token again after the invalidation."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        manager = kauth.K2hr3TokenManager(myhttp, clock=self.clock)
+        with patch.object(khttp.K2hr3Http, 'send', return_value=_response(
+                {"result": True, "token": "r3token"})) as mock_send:
+            manager.get_token("demo", "iaas")
+            manager.invalidate("demo")
+            manager.get_token("demo", "iaas")
+        self.assertEqual(mock_send.call_count, 2)
+
+    def test_get_token_identity(self):
+        """Caches the tokens of different OpenStack tokens separately."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        manager = kauth.K2hr3TokenManager(myhttp, clock=self.clock)
+
+        def send(request):
+            return _response({"result": True, "token":
+                              "r3" + request.headers['x-auth-token']})
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=send):
+            self.assertEqual(manager.get_token("demo", "iaas1"), "r3U=iaas1")
+            self.assertEqual(manager.get_token("demo", "iaas2"), "r3U=iaas2")
+            self.assertEqual(manager.get_token("demo", "iaas1"), "r3U=iaas1")
+            self.assertEqual(manager.get_token("demo", lambda: "iaas3"),
+                             "r3U=iaas3")
+            # Only the token of the OpenStack token is invalidated.
+            with patch.object(khttp.K2hr3Http, 'send',
+                              side_effect=send) as mock_send:
+                manager.renew_token("demo", "iaas1")
+                manager.get_token("demo", "iaas2")
+        self.assertEqual(mock_send.call_count, 1)
+
+
+class TestK2hr3RoleTokenCache(unittest.TestCase):
+    """Tests the K2hr3RoleTokenCache class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_auth.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.base_url = "http://127.0.0.1:18080"
+        self.clock = _Clock()
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def test_get_role_token_cached(self):
+        """Gets a role token once for the role and the expire."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        roletokens = kauth.K2hr3RoleTokenCache(myhttp, clock=self.clock)
+        with patch.object(khttp.K2hr3Http, 'send', return_value=_response(
+                {"result": True, "token": "roletoken",
+                 "registerpath": "path"}, code=200)) as mock_send:
+            self.assertEqual(
+                roletokens.get_role_token("r3token", "role", 600),
+                "roletoken")
+            self.assertEqual(
+                roletokens.get_registerpath("r3token", "role", 600), "path")
+            roletokens.get_role_token("r3token", "role", 60)
+        self.assertEqual(mock_send.call_count, 2)
+        request = mock_send.call_args_list[0][0][0]
+        self.assertEqual(request.path, "v1/role/token/role")
+        self.assertEqual(request.urlparams, {'expire': 600})
+        self.assertEqual(roletokens.stats.hits, 1)
+        self.assertEqual(roletokens.stats.misses, 2)
+        self.assertNotIn("r3token", repr(roletokens._cache._entries))
+
+    def test_get_role_token_expire(self):
+        """Gets a role token again after the requested expire."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        roletokens = kauth.K2hr3RoleTokenCache(myhttp, refresh_ahead=0,
+                                               clock=self.clock)
+        with patch.object(khttp.K2hr3Http, 'send', return_value=_response(
+                {"result": True, "token": "roletoken"}, code=200)
+                ) as mock_send:
+            roletokens.get_role_token("r3token", "role", 60)
+            self.clock.now += 59
+            roletokens.get_role_token("r3token", "role", 60)
+            self.clock.now += 1
+            roletokens.get_role_token("r3token", "role", 60)
+            roletokens.invalidate("r3token", "role", 60)
+            roletokens.get_role_token("r3token", "role", 60)
+        self.assertEqual(mock_send.call_count, 3)
+
+    def test_get_role_token_error(self):
+        """Raises an exception if the server returns an error."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        roletokens = kauth.K2hr3RoleTokenCache(myhttp, clock=self.clock)
+        with patch.object(khttp.K2hr3Http, 'send', return_value=_response(
+                {"result": False}, code=403)):
+            with self.assertRaises(K2hr3Exception):
+                roletokens.get_role_token("r3token", "role")
+        self.assertEqual(roletokens.stats.errors, 1)
+
+
+class TestK2hr3TokenValidator(unittest.TestCase):
+    """Tests the K2hr3TokenValidator class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_auth.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.base_url = "http://127.0.0.1:18080"
+        self.clock = _Clock()
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def test_is_valid_cached(self):
+        """Caches the valid and the invalid results."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        validator = kauth.K2hr3TokenValidator(myhttp, valid_ttl=60,
+                                              invalid_ttl=10,
+                                              clock=self.clock)
+
+        def send(request):
+            code = 204 if request.headers['x-auth-token'] == 'U=good' \
+                else 401
+            return _response({}, code=code)
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=send) as mock_send:
+            self.assertTrue(validator.is_valid("good"))
+            self.assertTrue(validator.is_valid("good"))
+            self.assertFalse(validator.is_valid("bad"))
+            self.assertFalse(validator.is_valid("bad"))
+            self.assertEqual(mock_send.call_count, 2)
+            self.clock.now += 10
+            self.assertFalse(validator.is_valid("bad"))
+            self.assertTrue(validator.is_valid("good"))
+            self.assertEqual(mock_send.call_count, 3)
+        request = mock_send.call_args[0][0]
+        self.assertEqual(request.method, K2hr3HTTPMethod.HEAD)
+        self.assertEqual(request.path, "v1/user/tokens")
+        self.assertEqual(validator.hit_rate, 0.5)
+        self.assertNotIn("good", repr(validator._cache._entries))
+
+    def test_revoke_invalidate(self):
+        """Revokes and invalidates a token."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        validator = kauth.K2hr3TokenValidator(myhttp, clock=self.clock)
+        with patch.object(khttp.K2hr3Http, 'send',
+                          return_value=_response({}, code=204)) as mock_send:
+            self.assertTrue(validator.is_valid("good"))
+            validator.revoke("good")
+            self.assertFalse(validator.is_valid("good"))
+            validator.invalidate("good")
+            self.assertTrue(validator.is_valid("good"))
+        self.assertEqual(mock_send.call_count, 2)
+
+    def test_is_valid_error(self):
+        """Raises an exception and caches nothing if the server fails."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        validator = kauth.K2hr3TokenValidator(myhttp, clock=self.clock)
+        with patch.object(khttp.K2hr3Http, 'send',
+                          return_value=_response({}, code=503)):
+            with self.assertRaises(K2hr3Exception):
+                validator.is_valid("token")
+        self.assertEqual(len(validator._cache), 0)
+
+
+class TestK2hr3AuthMiddleware(unittest.TestCase):
+    """Tests the K2hr3AuthMiddleware class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_auth.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.base_url = "http://127.0.0.1:18080"
+        self.valid = "token1"
+        self.lock = threading.Lock()
+        self.renewed = 0
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def _send(self, request):
+        time.sleep(0.01)
+        if request.headers.get('x-auth-token') == f'U={self.valid}':
+            return _response({"result": True}, code=200)
+        return _response({"result": False}, code=401)
+
+    def _renew(self):
+        with self.lock:
+            self.renewed += 1
+        time.sleep(0.05)
+        return self.valid
+
+    def _request(self, token="stale"):
+        return krole.K2hr3Role(token).get("role").build_request(
+            K2hr3HTTPMethod.GET)
+
+    def test_send_rewrites_token(self):
+        """Sends a request with the current token."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        middleware = kauth.K2hr3AuthMiddleware(myhttp, lambda: self.valid)
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=self._send) as mock_send:
+            self.assertEqual(middleware.send(self._request()).code, 200)
+        self.assertEqual(mock_send.call_count, 1)
+        self.assertEqual(mock_send.call_args[0][0].headers['x-auth-token'],
+                         'U=token1')
+
+    def test_send_renews_once(self):
+        """Gets one new token for the concurrent rejected requests."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        middleware = kauth.K2hr3AuthMiddleware(myhttp, lambda: "expired",
+                                               self._renew)
+        codes = []
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            threads = [threading.Thread(
+                target=lambda: codes.append(
+                    middleware.send(self._request()).code))
+                for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(codes, [200] * 8)
+        self.assertEqual(self.renewed, 1)
+
+    def test_send_rejected_again(self):
+        """Returns the response if the new token is rejected too."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        middleware = kauth.K2hr3AuthMiddleware(myhttp, lambda: "expired")
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=self._send) as mock_send:
+            self.assertEqual(middleware.send(self._request()).code, 401)
+        self.assertEqual(mock_send.call_count, 2)
+
+    def test_send_streamed_body(self):
+        """Does not send a streamed body again."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        middleware = kauth.K2hr3AuthMiddleware(myhttp, lambda: "expired",
+                                               self._renew)
+        request = self._request()
+        request = kauth.K2hr3Request(K2hr3HTTPMethod.PUT, request.path, None,
+                                     request.headers, iter([b'data']))
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=self._send) as mock_send:
+            with self.assertLogs('k2hr3client.auth', level='WARNING'):
+                self.assertEqual(middleware.send(request).code, 401)
+            self.assertEqual(mock_send.call_count, 1)
+            self.assertEqual(self.renewed, 1)
+            # The next request is sent with the new token.
+            self.assertEqual(middleware.send(self._request()).code, 200)
+
+    def test_send_forbidden(self):
+        """Does not renew a valid token that is forbidden."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        validator = kauth.K2hr3TokenValidator(myhttp)
+        middleware = kauth.K2hr3AuthMiddleware(
+            myhttp, lambda: self.valid, self._renew, validator)
+
+        def send(request):
+            if request.method == K2hr3HTTPMethod.HEAD:
+                return _response({}, code=204)
+            return _response({}, code=403)
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=send):
+            self.assertEqual(middleware.send(self._request()).code, 403)
+        self.assertEqual(self.renewed, 0)
+
+    def test_send_without_scoped_token(self):
+        """Sends a request without a scoped token as is."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        middleware = kauth.K2hr3AuthMiddleware(myhttp, self._renew)
+        request = krole.K2hr3Role("token").get("role").build_request(
+            K2hr3HTTPMethod.GET)
+        request = kauth.K2hr3Request(request.method, request.path, None,
+                                     {'x-auth-token': 'R=roletoken'}, None)
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=self._send) as mock_send:
+            self.assertEqual(middleware.send(request).code, 401)
+        self.assertIs(mock_send.call_args[0][0], request)
+        self.assertEqual(self.renewed, 0)
+
+    def test_renew_error(self):
+        """Raises the error of the renewal."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+
+        def renew():
+            raise K2hr3Exception('identity server is down')
+        middleware = kauth.K2hr3AuthMiddleware(myhttp, lambda: "expired",
+                                               renew)
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            with self.assertRaises(K2hr3Exception):
+                middleware.send(self._request())
+
+    def test_token_manager_renew_token(self):
+        """Creates a new token even if a token is cached."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        manager = kauth.K2hr3TokenManager(myhttp)
+        with patch.object(khttp.K2hr3Http, 'send', return_value=_response(
+                {"result": True, "token": "r3token"})) as mock_send:
+            manager.get_token("demo", "iaas")
+            manager.renew_token("demo", "iaas")
+        self.assertEqual(mock_send.call_count, 2)
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
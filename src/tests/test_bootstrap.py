@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers 
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+"""Test Package for K2hr3 Python Client."""
+
+import json
+import logging
+import unittest
+from unittest.mock import patch
+
+from k2hr3client.api import K2hr3ApiResponse
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client import bootstrap as kbootstrap
+from k2hr3client import http as khttp
+from k2hr3client import token as ktoken
+
+LOG = logging.getLogger(__name__)
+
+
+def _send(request):
+    """Return the response of a request."""
+    if request.path == 'v1/user/tokens':
+        body = {"result": True, "token": "r3token"}
+    elif request.path.startswith('v1/role/token/list/'):
+        role = request.path.rsplit('/', 1)[1]
+        body = {"result": True, "tokens": {
+            f"rt_{role}": {"registerpath": f"path_{role}"}}}
+    else:
+        role = request.path.rsplit('/', 1)[1]
+        if role == 'error':
+            return K2hr3ApiResponse(code=403, url=request.path,
+                                    hdrs={'Content-Type': 'text/plain'},
+                                    body='')
+        body = {"result": True, "token": f"rt_{role}"}
+    return K2hr3ApiResponse(code=200, url=request.path,
+                            hdrs={'Content-Type': 'application/json'},
+                            body=json.dumps(body))
+
+
+class TestK2hr3Bootstrap(unittest.TestCase):
+    """Tests the K2hr3Bootstrap class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_bootstrap.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.base_url = "http://127.0.0.1:18080"
+        self.identity_url = "http://127.0.0.1/identity/v3/auth/tokens"
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def test_run(self):
+        """Gets the tokens of the roles."""
+        bootstrap = kbootstrap.K2hr3Bootstrap(self.base_url,
+                                              self.identity_url)
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=_send) as mock_send, \
+                patch.object(ktoken.K2hr3Token, 'get_openstack_token',
+                             return_value="iaas") as mock_identity:
+            result = bootstrap.run("demo", ["r1", "r2", "r3"],
+                                   user="user", password="pass")
+        self.assertEqual(mock_identity.call_args[0],
+                         (self.identity_url, "user", "pass", "demo"))
+        self.assertEqual(mock_send.call_count, 7)
+        self.assertEqual(result.openstack_token, "iaas")
+        self.assertEqual(result.r3token, "r3token")
+        self.assertEqual(result.role_tokens["r2"].token, "rt_r2")
+        self.assertEqual(result.registerpath("r2"), "path_r2")
+        self.assertIsNone(result.registerpath("none"))
+        self.assertEqual(sorted(result.timings),
+                         ['k2hr3_token', 'openstack_token',
+                          'role_token_lists', 'role_tokens'])
+        bootstrap.close()
+
+    def test_run_without_token_list(self):
+        """Gets the role tokens only."""
+        bootstrap = kbootstrap.K2hr3Bootstrap(self.base_url)
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=_send) as mock_send:
+            result = bootstrap.run("demo", ["r1"], iaas_token="iaas",
+                                   token_list=False)
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertEqual(result.token_lists, {})
+        self.assertNotIn('openstack_token', result.timings)
+
+    def test_run_error(self):
+        """Raises an exception if a role token could not be got."""
+        bootstrap = kbootstrap.K2hr3Bootstrap(self.base_url)
+        with self.assertRaises(K2hr3Exception):
+            bootstrap.run("demo", ["r1"])
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=_send):
+            with self.assertRaises(K2hr3Exception):
+                bootstrap.run("demo", ["r1", "error"], iaas_token="iaas")
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
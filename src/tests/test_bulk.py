@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers 
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+"""Test Package for K2hr3 Python Client."""
+
+import json
+import logging
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from k2hr3client.api import K2hr3ApiResponse, K2hr3HTTPMethod
+from k2hr3client import bulk as kbulk
+from k2hr3client import http as khttp
+from k2hr3client import model as kmodel
+from k2hr3client import role as krole
+from k2hr3client import token as ktoken
+
+LOG = logging.getLogger(__name__)
+
+
+def _response(code=204, body=''):
+    return K2hr3ApiResponse(code=code, url="http://127.0.0.1:18080",
+                            hdrs={'Content-Type': 'application/json'},
+                            body=body)
+
+
+class TestK2hr3Bulk(unittest.TestCase):
+    """Tests the bulk operations.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_bulk.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.base_url = "http://127.0.0.1:18080"
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def test_run_bulk(self):
+        """Orders the results as the items."""
+        def func(item):
+            if item == 3:
+                raise kbulk.K2hr3Exception('error')
+            return item * 2
+        result = kbulk.run_bulk(range(6), func, max_workers=3)
+        self.assertEqual(list(result.succeeded.items()),
+                         [(0, 0), (1, 2), (2, 4), (4, 8), (5, 10)])
+        self.assertEqual(result.failed, {3: 'error'})
+        self.assertFalse(result.ok)
+
+    def test_run_bulk_unexpected_error(self):
+        """Keeps the other results if a call raises an unexpected error."""
+        bodies = {"r1": '{"resource": "data"}', "r2": '{"resource": ',
+                  "r3": '{"resource": "data3"}'}
+
+        def func(item):
+            return kmodel.K2hr3ResourceModel(bodies[item]).data
+        with self.assertLogs('k2hr3client.bulk', level='ERROR'):
+            result = kbulk.run_bulk(["r1", "r2", "r3", "r4"], func,
+                                    max_workers=2)
+        self.assertEqual(result.succeeded, {"r1": "data", "r3": "data3"})
+        self.assertTrue(result.failed["r2"].startswith('invalid json'))
+        self.assertEqual(result.failed["r4"], "KeyError: 'r4'")
+
+    def test_run_bulk_timeout(self):
+        """Fails the items that are not done in the timeout."""
+        event = threading.Event()
+
+        def func(item):
+            if item == 1:
+                event.wait(5)
+            return item
+        started = time.monotonic()
+        result = kbulk.run_bulk(range(4), func, max_workers=1, timeout=0.2)
+        event.set()
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(list(result.succeeded), [0])
+        self.assertEqual(result.failed, {1: 'deadline exceeded',
+                                         2: 'deadline exceeded',
+                                         3: 'deadline exceeded'})
+
+    def test_get_resources(self):
+        """Gets the unique resources ordered as the paths."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+
+        def send(request):
+            path = request.path.rsplit('/', 1)[-1]
+            if path == "missing":
+                return _response(404)
+            return _response(200, json.dumps({
+                "result": True, "message": None, "resource": f"data-{path}"}))
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=send) as mock_send:
+            resources = kbulk.get_resources(
+                myhttp, ["r2", "missing", "r1", "r2"], r3token="r3token",
+                expand=True)
+        self.assertEqual(mock_send.call_count, 3)
+        self.assertEqual(mock_send.call_args[0][0].urlparams,
+                         {'expand': True, 'service': None})
+        self.assertEqual(list(resources), ["r2", "missing", "r1"])
+        self.assertEqual(resources["r2"].data, "data-r2")
+        self.assertIsInstance(resources["missing"], kbulk.K2hr3Exception)
+        with self.assertRaises(kbulk.K2hr3Exception):
+            kbulk.get_resources(myhttp, ["r1"])
+
+    def test_get_resources_roletoken(self):
+        """Gets the resources with the role token."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        body = json.dumps({"result": True, "resource": "data"})
+        with patch.object(khttp.K2hr3Http, 'send',
+                          return_value=_response(200, body)) as mock_send:
+            resources = kbulk.get_resources(
+                myhttp, ["r1"], roletoken="roletoken", data_type="string",
+                keys={"a": 1})
+        request = mock_send.call_args[0][0]
+        self.assertEqual(request.headers['x-auth-token'], 'R=roletoken')
+        self.assertEqual(request.urlparams,
+                         {'type': 'string', 'keys': {"a": 1},
+                          'service': None})
+        self.assertEqual(resources["r1"].data, "data")
+
+    def test_prune_role_tokens(self):
+        """Deletes the expired role tokens."""
+        index = ktoken.K2hr3RoleTokenIndex({
+            "rt1": {"expire": 10}, "rt2": {"expire": 20},
+            "rt3": {"expire": 30}, "rt4": {}})
+        myhttp = khttp.K2hr3Http(self.base_url)
+
+        def send(request):
+            return _response(404 if request.path.endswith('rt2') else 204)
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=send) as mock_send:
+            result = kbulk.prune_role_tokens(myhttp, "r3token", index,
+                                             now=25)
+        self.assertTrue(result.ok)
+        self.assertEqual(list(result.succeeded), ["rt1", "rt2"])
+        requests = sorted(call[0][0].path for call in mock_send.call_args_list)
+        self.assertEqual(requests, ["v1/role/token/rt1", "v1/role/token/rt2"])
+        self.assertEqual(mock_send.call_args[0][0].method,
+                         K2hr3HTTPMethod.DELETE)
+
+    def test_prune_role_tokens_error(self):
+        """Reports the role tokens that could not be deleted."""
+        index = ktoken.K2hr3RoleTokenIndex({"rt1": {"expire": 10}})
+        myhttp = khttp.K2hr3Http(self.base_url)
+        with patch.object(khttp.K2hr3Http, 'send',
+                          return_value=_response(403)):
+            result = kbulk.prune_role_tokens(myhttp, "r3token", index,
+                                             now=25)
+        self.assertEqual(list(result.failed), ["rt1"])
+
+    def test_add_role_members(self):
+        """Adds the unique hosts by the chunks."""
+        hosts = [krole.K2hr3RoleHost(f'10.0.0.{i % 5}', '0', '', '', '', '',
+                                     '') for i in range(10)]
+        myhttp = khttp.K2hr3Http(self.base_url)
+
+        def send(request):
+            body = json.loads(request.body)
+            if body['host'][0]['host'] == '10.0.0.4':
+                return _response(400)
+            return _response(201)
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=send) as mock_send:
+            result = kbulk.add_role_members(myhttp, "r3token", "myrole",
+                                            hosts, chunk_size=2)
+        self.assertEqual(mock_send.call_count, 3)
+        request = mock_send.call_args_list[0][0][0]
+        self.assertEqual(request.method, K2hr3HTTPMethod.POST)
+        self.assertEqual(request.path, "v1/role/myrole")
+        self.assertEqual(list(result.succeeded),
+                         [('10.0.0.0', '0', ''), ('10.0.0.1', '0', ''),
+                          ('10.0.0.2', '0', ''), ('10.0.0.3', '0', '')])
+        self.assertEqual(list(result.failed), [('10.0.0.4', '0', '')])
+
+    def _role_response(self):
+        return _response(200, json.dumps({
+            "result": True, "message": None,
+            "role": {"policies": [], "aliases": [], "hosts": {
+                "hostnames": ["host1 0 ", "host2 8080 cuk2 extra"],
+                "ips": ["10.0.0.1 0 "]}}}))
+
+    def _desired_hosts(self):
+        return [krole.K2hr3RoleHost('host1', 0, None, '', '', '', ''),
+                krole.K2hr3RoleHost('10.0.0.2', '0', '', '', '', '', ''),
+                krole.K2hr3RoleHost('10.0.0.1', '0', '', 'new', '', '', '')]
+
+    def test_reconcile_role_members_dry_run(self):
+        """Plans the changes without changing the role."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        with patch.object(khttp.K2hr3Http, 'send',
+                          return_value=self._role_response()) as mock_send:
+            plan = kbulk.reconcile_role_members(
+                myhttp, "r3token", "myrole", self._desired_hosts(),
+                dry_run=True)
+        self.assertEqual(mock_send.call_count, 1)
+        request = mock_send.call_args[0][0]
+        self.assertEqual(request.method, K2hr3HTTPMethod.GET)
+        self.assertEqual(request.urlparams, {'expand': False})
+        self.assertIsNone(plan.result)
+        self.assertEqual(plan.as_dict(), {
+            'role': 'myrole',
+            'add': [{'host': '10.0.0.2', 'port': '0', 'cuk': '',
+                     'extra': '', 'tag': '', 'inboundip': '',
+                     'outboundip': ''}],
+            'remove': [{'host': 'host2', 'port': '8080', 'cuk': 'cuk2',
+                        'extra': 'extra', 'tag': '', 'inboundip': '',
+                        'outboundip': ''}],
+            'keep': 2})
+
+    def test_reconcile_role_members(self):
+        """Adds and deletes only the changed hosts."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        responses = {K2hr3HTTPMethod.GET: self._role_response(),
+                     K2hr3HTTPMethod.PUT: _response(200),
+                     K2hr3HTTPMethod.DELETE: _response(404)}
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=lambda request: responses[
+                              request.method]) as mock_send:
+            plan = kbulk.reconcile_role_members(
+                myhttp, "r3token", "myrole", self._desired_hosts())
+        self.assertEqual(mock_send.call_count, 3)
+        requests = {call[0][0].method: call[0][0]
+                    for call in mock_send.call_args_list}
+        self.assertEqual(requests[K2hr3HTTPMethod.PUT].urlparams['host'],
+                         '10.0.0.2')
+        self.assertEqual(requests[K2hr3HTTPMethod.DELETE].urlparams,
+                         {'host': 'host2', 'port': '8080', 'cuk': 'cuk2'})
+        self.assertTrue(plan.result.ok)
+        self.assertEqual(list(plan.result.succeeded),
+                         [('10.0.0.2', '0', ''), ('host2', '8080', 'cuk2')])
+
+    def test_issue_role_tokens(self):
+        """Issues the role tokens and registers the containers."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+
+        def send(request):
+            if request.method == K2hr3HTTPMethod.GET:
+                role = request.path.rsplit('/', 1)[-1]
+                return _response(200, json.dumps({
+                    "result": True, "message": None,
+                    "token": f"rt-{role}", "registerpath": f"rp-{role}"}))
+            if request.method == K2hr3HTTPMethod.PUT:
+                self.assertEqual(request.headers['x-auth-token'],
+                                 f"R=rt-{request.path.rsplit('/', 1)[-1]}")
+                if request.urlparams['cuk'] == 'c3':
+                    return _response(403)
+                return _response(200)
+            return _response(204)
+        specs = [("r1", 8080, "c1", "", "", "", ""),
+                 kbulk.K2hr3ContainerSpec("r2", cuk="c2"),
+                 ("r1", 8080, "c1"),
+                 ("r1", 0, "c3")]
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=send) as mock_send:
+            result = kbulk.issue_role_tokens(myhttp, "r3token", specs,
+                                             max_workers=2)
+        self.assertEqual(list(result.succeeded), [("r1", "c1"), ("r2", "c2")])
+        self.assertEqual(list(result.failed), [("r1", "c3")])
+        # The role token of the failed container is deleted.
+        deleted = [call[0][0] for call in mock_send.call_args_list
+                   if call[0][0].method == K2hr3HTTPMethod.DELETE]
+        self.assertEqual([request.path for request in deleted],
+                         ["v1/role/token/rt-r1"])
+
+        config = kbulk.role_tokens_cloud_config(result.succeeded.values())
+        files = config['write_files']
+        self.assertEqual(files[0]['path'], kbulk.DEFAULT_ROLE_TOKENS_PATH)
+        self.assertEqual(files[0]['permissions'], '0600')
+        self.assertEqual(json.loads(files[0]['content']), [
+            {"role": "r1", "cuk": "c1", "roletoken": "rt-r1",
+             "registerpath": "rp-r1"},
+            {"role": "r2", "cuk": "c2", "roletoken": "rt-r2",
+             "registerpath": "rp-r2"}])
+
+    def test_add_role_members_chunk_size(self):
+        """Raises an exception if the chunk size is not positive."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        with self.assertRaises(kbulk.K2hr3Exception):
+            kbulk.add_role_members(myhttp, "r3token", "myrole", [],
+                                   chunk_size=0)
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
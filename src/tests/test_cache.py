@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers 
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+"""Test Package for K2hr3 Python Client."""
+
+import logging
+import threading
+import time
+import unittest
+
+from k2hr3client import cache as kcache
+
+LOG = logging.getLogger(__name__)
+
+
+class _Clock():
+    """Fake clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestK2hr3ExpiringCache(unittest.TestCase):
+    """Tests the K2hr3ExpiringCache class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_cache.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.clock = _Clock()
+        self.calls = 0
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def _loader(self, value='value', ttl=100):
+        def loader():
+            self.calls += 1
+            return value, self.clock() + ttl
+        return loader
+
+    def test_get_hit_miss(self):
+        """Loads a value once until it expires."""
+        mycache = kcache.K2hr3ExpiringCache(refresh_ahead=0, clock=self.clock)
+        self.assertEqual(mycache.get('key', self._loader()), 'value')
+        self.assertEqual(mycache.get('key', self._loader()), 'value')
+        self.assertEqual(self.calls, 1)
+        self.clock.now += 100
+        self.assertEqual(mycache.get('key', self._loader()), 'value')
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(mycache.stats.hits, 1)
+        self.assertEqual(mycache.stats.misses, 2)
+        self.assertAlmostEqual(mycache.stats.hit_rate, 1 / 3)
+
+    def test_refresh_ahead(self):
+        """Refreshes a value in background before it expires."""
+        mycache = kcache.K2hr3ExpiringCache(refresh_ahead=10,
+                                            clock=self.clock)
+        mycache.get('key', self._loader('old'))
+        self.clock.now += 95
+        self.assertEqual(mycache.get('key', self._loader('new')), 'old')
+        for _ in range(100):
+            if mycache.stats.refreshes:
+                break
+            time.sleep(0.01)
+        self.assertEqual(mycache.peek('key'), 'new')
+        self.assertEqual(mycache.expires_at('key'), self.clock.now + 100)
+
+    def test_refresh_error_keeps_value(self):
+        """Keeps the current value if the refresh fails."""
+        mycache = kcache.K2hr3ExpiringCache(refresh_ahead=10,
+                                            clock=self.clock)
+        mycache.get('key', self._loader('old'))
+        self.clock.now += 95
+
+        def loader():
+            raise ValueError('error')
+        self.assertEqual(mycache.get('key', loader), 'old')
+        for _ in range(100):
+            if mycache.stats.errors:
+                break
+            time.sleep(0.01)
+        self.assertEqual(mycache.peek('key'), 'old')
+
+    def test_single_flight(self):
+        """Collapses concurrent loads into one."""
+        mycache = kcache.K2hr3ExpiringCache(clock=self.clock)
+        event = threading.Event()
+
+        def loader():
+            event.wait(1)
+            self.calls += 1
+            return 'value', self.clock() + 100
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(mycache.get('key', loader)))
+            for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        event.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ['value'] * 8)
+        self.assertEqual(self.calls, 1)
+
+    def test_loader_error(self):
+        """Raises the error of the loader."""
+        mycache = kcache.K2hr3ExpiringCache(clock=self.clock)
+
+        def loader():
+            raise ValueError('error')
+        with self.assertRaises(ValueError):
+            mycache.get('key', loader)
+        self.assertEqual(mycache.get('key', self._loader()), 'value')
+
+    def test_evict_invalidate(self):
+        """Evicts the least recently used value and invalidates values."""
+        evicted = []
+        mycache = kcache.K2hr3ExpiringCache(maxsize=2, clock=self.clock,
+                                            on_evict=evicted.append)
+        mycache.put('a', 1, self.clock() + 100)
+        mycache.put('b', 2, self.clock() + 100)
+        mycache.get('a', self._loader())
+        mycache.put('c', 3, self.clock() + 100)
+        self.assertIsNone(mycache.peek('b'))
+        self.assertEqual(mycache.peek('a'), 1)
+        self.assertEqual(mycache.stats.evictions, 1)
+        self.assertEqual(evicted, ['b'])
+        mycache.invalidate('a')
+        self.assertIsNone(mycache.peek('a'))
+        mycache.invalidate()
+        self.assertEqual(len(mycache), 0)
+
+    def test_parse_expire(self):
+        """Parses the expire values."""
+        self.assertEqual(kcache.parse_expire(10), 10.0)
+        self.assertEqual(kcache.parse_expire('1970-01-01T00:01:00Z'), 60.0)
+        self.assertEqual(kcache.parse_expire('1970-01-01T00:01:00'), 60.0)
+        self.assertIsNone(kcache.parse_expire('unknown'))
+        self.assertIsNone(kcache.parse_expire(None))
+        self.assertIsNone(kcache.parse_expire(True))
+
+    def test_token_digest(self):
+        """Digests a token not to keep it in cache keys."""
+        digest = kcache.token_digest("token")
+        self.assertEqual(len(digest), 64)
+        self.assertNotIn("token", digest)
+        self.assertEqual(kcache.token_digest("token"), digest)
+        self.assertNotEqual(kcache.token_digest("token2"), digest)
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
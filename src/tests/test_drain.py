@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers 
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+"""Test Package for K2hr3 Python Client."""
+
+import json
+import logging
+import unittest
+from unittest.mock import patch
+
+from k2hr3client.api import K2hr3ApiResponse, K2hr3HTTPMethod
+from k2hr3client import drain as kdrain
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client import hostindex as khostindex
+from k2hr3client import http as khttp
+
+LOG = logging.getLogger(__name__)
+
+
+def _response(code=200, body=None):
+    return K2hr3ApiResponse(code=code, url="http://127.0.0.1:18080",
+                            hdrs={'Content-Type': 'application/json'},
+                            body='' if body is None else json.dumps(body))
+
+
+class TestK2hr3Drain(unittest.TestCase):
+    """Tests the drain of hosts.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_drain.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.base_url = "http://127.0.0.1:18080"
+        self.myhttp = khttp.K2hr3Http(self.base_url)
+        self.roles = {
+            "r1": ["10.0.0.1 0 c1", "10.0.0.2 0 c2 extra hv1"],
+            "r2": ["10.0.0.3 0 c3"],
+        }
+        self.tokens = {
+            "r1": {"rt1": {"ip": "10.0.0.1", "cuk": "c1"},
+                   "rt2": {"ip": "10.0.0.9", "cuk": "c9"}},
+            "r2": {},
+        }
+        self.deleted = []
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def _send(self, request):
+        if request.method == K2hr3HTTPMethod.DELETE:
+            self.deleted.append((request.path, request.urlparams))
+            if request.urlparams and request.urlparams.get('cuk') == 'c2':
+                return _response(404)
+            name = request.path.rsplit('/', 1)[-1]
+            if request.urlparams and name in self.roles:
+                self.roles[name] = [
+                    entry for entry in self.roles[name]
+                    if entry.split(' ')[2] != request.urlparams['cuk']]
+            return _response(204)
+        if request.path == "v1/list/role":
+            return _response(body={"result": True, "children": [
+                {"name": name, "children": []} for name in self.roles]})
+        name = request.path.rsplit('/', 1)[-1]
+        if name not in self.roles:
+            return _response(404)
+        if "/token/list/" in request.path:
+            return _response(body={"result": True,
+                                   "tokens": self.tokens[name]})
+        return _response(body={"result": True, "role": {
+            "policies": [], "aliases": [],
+            "hosts": {"hostnames": [], "ips": self.roles[name]}}})
+
+    def test_drain_hosts(self):
+        """Deletes the selected members and role tokens."""
+        selector = kdrain.K2hr3HostSelector(ips=["10.0.0.1"], tags=["hv1"])
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            summary = kdrain.drain_hosts(self.myhttp, "r3token", selector,
+                                         roles=["r1", "r2", "gone"])
+        self.assertTrue(summary.ok)
+        self.assertEqual(summary.as_dict(), {
+            'roles': 3, 'members': 2, 'roletokens': 1, 'failed': {}})
+        self.assertEqual(sorted(path for path, _ in self.deleted),
+                         ["v1/role/r1", "v1/role/r1", "v1/role/token/rt1"])
+        self.assertIn(('member', 'r1', '10.0.0.2', '0', 'c2'),
+                      summary.result.succeeded)
+
+    def test_drain_hosts_index(self):
+        """Finds the roles in the index and updates the index."""
+        index = khostindex.K2hr3HostIndex(self.myhttp, "r3token")
+        selector = kdrain.K2hr3HostSelector(cuks=["c3"])
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            index.refresh()
+            self.assertEqual(index.roles_by_cuk("c3"), {"r2"})
+            summary = kdrain.drain_hosts(self.myhttp, "r3token", selector,
+                                         index=index, roletokens=False)
+            self.assertEqual(summary.roles, ["r2"])
+            self.assertEqual(summary.members, 1)
+            self.assertEqual(self.deleted[-1],
+                             ("v1/role/r2",
+                              {'host': '10.0.0.3', 'port': '0', 'cuk': 'c3'}))
+            self.assertEqual(index.roles_by_cuk("c3"), frozenset())
+            # A retry finds nothing to delete.
+            summary = kdrain.drain_hosts(self.myhttp, "r3token", selector,
+                                         roles=["r2"], roletokens=False)
+        self.assertTrue(summary.ok)
+        self.assertEqual(summary.members, 0)
+
+    def test_drain_hosts_error(self):
+        """Reports the roles that could not be searched."""
+        selector = kdrain.K2hr3HostSelector(ips=["10.0.0.1"])
+        with patch.object(khttp.K2hr3Http, 'send',
+                          return_value=_response(403)):
+            summary = kdrain.drain_hosts(self.myhttp, "r3token", selector,
+                                         roles=["r1"])
+        self.assertFalse(summary.ok)
+        self.assertEqual(list(summary.as_dict()['failed']), ["role/r1"])
+        with self.assertRaises(K2hr3Exception):
+            kdrain.drain_hosts(self.myhttp, "r3token",
+                               kdrain.K2hr3HostSelector(), roles=["r1"])
+        with self.assertRaises(K2hr3Exception):
+            kdrain.drain_hosts(self.myhttp, "r3token", selector)
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers 
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+"""Test Package for K2hr3 Python Client."""
+
+import json
+import logging
+import unittest
+from unittest.mock import patch
+
+from k2hr3client.api import K2hr3ApiResponse
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client import hostindex as khostindex
+from k2hr3client import http as khttp
+
+LOG = logging.getLogger(__name__)
+
+
+class TestK2hr3HostIndex(unittest.TestCase):
+    """Tests the K2hr3HostIndex class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_hostindex.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.base_url = "http://127.0.0.1:18080"
+        self.now = 1000.0
+        self.roles = {
+            "r1": {"hostnames": ["host1 0 cuk1 extra tag1"],
+                   "ips": ["10.0.0.1 0 cuk2"]},
+            "r2": {"hostnames": [], "ips": ["10.0.0.1 8080 "]},
+        }
+        self.index = khostindex.K2hr3HostIndex(
+            khttp.K2hr3Http(self.base_url), "r3token",
+            clock=lambda: self.now)
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def _send(self, request):
+        if request.path == "v1/list/role":
+            self.assertEqual(request.urlparams, {'expand': True})
+            body = {"result": True, "message": None,
+                    "children": [{"name": name, "children": []}
+                                 for name in self.roles]}
+        else:
+            name = request.path.rsplit('/', 1)[-1]
+            if name not in self.roles:
+                return K2hr3ApiResponse(code=403, url=self.base_url,
+                                        hdrs={'Content-Type': 'text/plain'},
+                                        body='')
+            body = {"result": True, "message": None,
+                    "role": {"policies": [], "aliases": [],
+                             "hosts": self.roles[name]}}
+        return K2hr3ApiResponse(code=200, url=self.base_url,
+                                hdrs={'Content-Type': 'application/json'},
+                                body=json.dumps(body))
+
+    def test_refresh(self):
+        """Maps the hosts to the roles."""
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            result = self.index.refresh()
+        self.assertTrue(result.ok)
+        self.assertEqual(self.index.roles, ["r1", "r2"])
+        self.assertEqual(self.index.roles_by_host("host1"), {"r1"})
+        self.assertEqual(self.index.roles_by_ip("10.0.0.1"), {"r1", "r2"})
+        self.assertEqual(self.index.roles_by_cuk("cuk2"), {"r1"})
+        self.assertEqual(self.index.roles_by_tag("tag1"), {"r1"})
+        self.assertEqual(self.index.roles_by_ip("10.0.0.2"), frozenset())
+
+    def test_refresh_max_age(self):
+        """Gets only the roles that are new or old."""
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            self.index.refresh()
+            self.now += 10
+            self.roles["r3"] = {"hostnames": [], "ips": ["10.0.0.3 0 "]}
+            del self.roles["r2"]
+            with patch.object(khttp.K2hr3Http, 'send',
+                              side_effect=self._send) as mock_send:
+                result = self.index.refresh(max_age=60)
+        self.assertEqual(list(result.succeeded), ["r3"])
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertEqual(self.index.roles_by_ip("10.0.0.1"), {"r1"})
+        self.assertEqual(self.index.roles_by_ip("10.0.0.3"), {"r3"})
+        self.assertNotIn("r2", self.index)
+
+    def test_refresh_changed(self):
+        """Indexes again only the roles whose responses are changed."""
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            self.index.refresh()
+            self.roles["r1"] = {"hostnames": [], "ips": ["10.0.0.9 0 "]}
+            with patch.object(khostindex.K2hr3HostIndex, '_store',
+                              autospec=True,
+                              side_effect=khostindex.K2hr3HostIndex._store
+                              ) as mock_store:
+                result = self.index.refresh()
+        self.assertEqual(result.succeeded, {"r1": True, "r2": False})
+        self.assertEqual(mock_store.call_count, 1)
+        self.assertEqual(self.index.roles_by_ip("10.0.0.9"), {"r1"})
+        self.assertEqual(self.index.roles_by_ip("10.0.0.1"), {"r2"})
+
+    def test_update(self):
+        """Replaces the entries of the changed roles."""
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            self.index.refresh()
+            self.roles["r1"] = {"hostnames": [], "ips": ["10.0.0.9 0 "]}
+            self.index.update(["r1"])
+            result = self.index.update(["missing"])
+        self.assertEqual(self.index.roles_by_host("host1"), frozenset())
+        self.assertEqual(self.index.roles_by_ip("10.0.0.9"), {"r1"})
+        self.assertEqual(self.index.roles_by_ip("10.0.0.1"), {"r2"})
+        self.assertEqual(list(result.failed), ["missing"])
+
+    def test_refresh_list_error(self):
+        """Raises an exception if the roles could not be listed."""
+        response = K2hr3ApiResponse(code=401, url=self.base_url,
+                                    hdrs={'Content-Type': 'text/plain'},
+                                    body='')
+        with patch.object(khttp.K2hr3Http, 'send', return_value=response):
+            with self.assertRaises(K2hr3Exception):
+                self.index.refresh()
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers 
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+"""Test Package for K2hr3 Python Client."""
+
+import logging
+import unittest
+
+from k2hr3client import hosttable as khosttable
+from k2hr3client import role as krole
+
+LOG = logging.getLogger(__name__)
+
+
+class TestK2hr3RoleHostTable(unittest.TestCase):
+    """Tests the K2hr3RoleHostTable class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_hosttable.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.hosts = [
+            krole.K2hr3RoleHost('10.0.0.1', '0', 'c1', '', 'web', '', ''),
+            krole.K2hr3RoleHost('10.0.1.1', '8080', 'c2', 'ex', 'web',
+                                '172.16.0.1', ''),
+            krole.K2hr3RoleHost('fd00::1', '0', '', '', 'db', '', ''),
+            krole.K2hr3RoleHost('host1', '0', '', '', 'web', '', ''),
+            krole.K2hr3RoleHost('FD00::2', '0', '', '', 'db', '', ''),
+        ]
+        self.table = khosttable.K2hr3RoleHostTable.from_role_hosts(
+            self.hosts)
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def test_round_trip(self):
+        """Converts the hosts to the table and back."""
+        self.assertEqual(len(self.table), 5)
+        for host, row in zip(self.hosts, self.table):
+            self.assertEqual(row, host)
+        hostlist = self.table.to_host_list()
+        self.assertIsInstance(hostlist, krole.K2hr3RoleHostList)
+        self.assertEqual([host.host for host in hostlist.hostlist],
+                         ['10.0.0.1', '10.0.1.1', 'fd00::1', 'host1',
+                          'FD00::2'])
+        table = khosttable.K2hr3RoleHostTable.from_host_list(hostlist)
+        self.assertEqual(table[-1].host, 'FD00::2')
+        self.assertEqual(table[1].inboundip, '172.16.0.1')
+        with self.assertRaises(IndexError):
+            table[5]  # pylint: disable=pointless-statement
+
+    def test_interned(self):
+        """Stores the same strings once."""
+        # '', 'c1', 'web', '0', '8080', 'c2', 'ex', '172.16.0.1', 'db',
+        # 'host1', 'FD00::2'
+        self.assertEqual(len(self.table.pool), 11)
+        self.assertIs(self.table[0].tag, self.table[3].tag)
+
+    def test_filter(self):
+        """Filters the hosts."""
+        web = self.table.filter_tag('web')
+        self.assertEqual([row.host for row in web],
+                         ['10.0.0.1', '10.0.1.1', 'host1'])
+        self.assertEqual([row.host for row in web.filter_port(8080)],
+                         ['10.0.1.1'])
+        self.assertEqual(
+            [row.host for row in self.table.filter_network('10.0.0.0/24')],
+            ['10.0.0.1'])
+        self.assertEqual(
+            [row.host for row in self.table.filter_network('10.0.0.0/16')],
+            ['10.0.0.1', '10.0.1.1'])
+        self.assertEqual(
+            [row.host for row in self.table.filter_network('fd00::/16')],
+            ['fd00::1', 'FD00::2'])
+        self.assertEqual(len(self.table.filter_tag('none')), 0)
+        self.assertEqual(len(self.table.filter_cuk('c2')), 1)
+
+    def test_contains(self):
+        """Finds the hosts by the hostname or ip address, port and cuk."""
+        self.assertIn(krole.K2hr3RoleHost('10.0.1.1', 8080, 'c2', '', '',
+                                          '', ''), self.table)
+        self.assertNotIn(krole.K2hr3RoleHost('10.0.1.1', 0, 'c2', '', '',
+                                             '', ''), self.table)
+        self.assertNotIn('10.0.0.1', self.table)
+        host = krole.K2hr3RoleHost('10.0.9.9', '0', '', '', '', '', '')
+        self.assertNotIn(host, self.table)
+        self.table.append('10.0.9.9', '0')
+        self.assertIn(host, self.table)
+        self.assertEqual(self.table.find(host).to_role_host().host,
+                         '10.0.9.9')
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
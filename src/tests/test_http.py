@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers 
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+"""Test Package for K2hr3 Python Client."""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import json
+import logging
+import ssl
+import threading
+import unittest
+from unittest.mock import patch
+from urllib.error import HTTPError
+import urllib.request
+
+from http.client import HTTPMessage
+
+from k2hr3client.api import K2hr3ApiResponse, K2hr3HTTPMethod
+from k2hr3client import http as khttp
+from k2hr3client import resource as kresource
+from k2hr3client import role as krole
+from k2hr3client import token as ktoken
+
+LOG = logging.getLogger(__name__)
+
+
+class TestK2hr3Http(unittest.TestCase):
+    """Tests the K2hr3Http class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_http.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.base_url = "http://127.0.0.1:18080"
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def test_encode_urlparams_none(self):
+        """Encodes empty url parameters."""
+        self.assertEqual(khttp._encode_urlparams(None), None)
+        self.assertEqual(khttp._encode_urlparams({}), None)
+        self.assertEqual(khttp._encode_urlparams({'service': None}), None)
+
+    def test_encode_urlparams_scalar(self):
+        """Encodes scalar url parameters."""
+        self.assertEqual(
+            khttp._encode_urlparams({'port': 8020, 'cuk': 'a b',
+                                     'service': None}),
+            'port=8020&cuk=a+b')
+
+    def test_encode_urlparams_json(self):
+        """Encodes bool, list and dict url parameters in JSON."""
+        self.assertEqual(
+            khttp._encode_urlparams({'expand': True}), 'expand=true')
+        self.assertEqual(
+            khttp._encode_urlparams({'alias': ['a', 'b']}),
+            'alias=%5B%22a%22%2C%22b%22%5D')
+        self.assertEqual(
+            khttp._encode_urlparams({'keys': {'k': 'v'}}),
+            'keys=%7B%22k%22%3A%22v%22%7D')
+
+    def test_encode_urlparams_legacy_json_string(self):
+        """Encodes url parameters given as a JSON string."""
+        self.assertEqual(
+            khttp._encode_urlparams('{"expand": false}'), 'expand=false')
+
+    @patch('k2hr3client.http.K2hr3Http._HTTP_REQUEST_METHOD')
+    def test_roletoken_expire_using_get(self, mock_HTTP_REQUEST_METHOD):
+        """Sends the expire of a role token as a url parameter."""
+        myroletoken = ktoken.K2hr3RoleToken("token", "testrole", 3600)
+        httpreq = khttp.K2hr3Http(self.base_url)
+        self.assertTrue(httpreq.GET(myroletoken))
+        self.assertEqual(httpreq.url,
+                         f"{self.base_url}/v1/role/token/testrole")
+        self.assertEqual(httpreq.urlparams, 'expire=3600')
+
+    @patch('k2hr3client.http.K2hr3Http._HTTP_REQUEST_METHOD')
+    def test_delete_uses_delete_method(self, mock_HTTP_REQUEST_METHOD):
+        """Sends a DELETE request by using the DELETE method."""
+        myrole = krole.K2hr3Role("token")
+        httpreq = khttp.K2hr3Http(self.base_url)
+        self.assertTrue(httpreq.DELETE(myrole.delete("testrole")))
+        req = mock_HTTP_REQUEST_METHOD.call_args[0][1]
+        self.assertEqual(req.get_method(), "DELETE")
+
+    @patch('k2hr3client.http.K2hr3Http._urlopen')
+    def test_send(self, mock_urlopen):
+        """Sends requests without changing the members."""
+        hdrs = HTTPMessage()
+        hdrs['mime-version'] = '1.0'
+        mock_urlopen.return_value = K2hr3ApiResponse(
+            code=200, url=self.base_url, hdrs=hdrs, body='{"result":true}')
+        myrole = krole.K2hr3Role("token")
+        httpreq = khttp.K2hr3Http(self.base_url)
+        resp = httpreq.send(
+            myrole.copy().get("testrole", True).build_request(
+                K2hr3HTTPMethod.GET))
+        self.assertEqual(resp.body, '{"result":true}')
+        req = mock_urlopen.call_args[0][0]
+        self.assertEqual(req.full_url,
+                         f"{self.base_url}/v1/role/testrole?expand=true")
+        self.assertEqual(req.get_method(), "GET")
+        self.assertEqual(req.get_header('X-auth-token'), 'U=token')
+        self.assertEqual(httpreq.url, None)
+        self.assertEqual(myrole.resp, None)
+
+        resp = httpreq.send(
+            myrole.copy().create("testrole", [], []).build_request(
+                K2hr3HTTPMethod.POST))
+        req = mock_urlopen.call_args[0][0]
+        self.assertEqual(req.full_url, f"{self.base_url}/v1/role")
+        self.assertEqual(req.get_method(), "POST")
+        self.assertIn(b'"testrole"', req.data)
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """Handle requests on keep-alive connections."""
+
+    protocol_version = 'HTTP/1.1'
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        body = b'{"result":true}'
+        self.send_response(200 if self.path.startswith('/v1') else 404)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        # NOTE: echo the chunked body with the transfer encoding.
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().strip(), 16)
+            chunk = self.rfile.read(size + 2)[:size]
+            if not size:
+                break
+            chunks.append(chunk)
+        body = json.dumps({
+            "encoding": self.headers.get('Transfer-Encoding'),
+            "body": b''.join(chunks).decode('ascii')}).encode('ascii')
+        self.send_response(201)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class TestK2hr3ConnectionPool(unittest.TestCase):
+    """Tests the K2hr3ConnectionPool class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_http.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        _KeepAliveHandler.connections = 0
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _KeepAliveHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        """Tears down a test case."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_send_reuse_connection(self):
+        """Sends requests on one connection."""
+        pool = khttp.K2hr3ConnectionPool()
+        myhttp = khttp.K2hr3Http(self.base_url, pool)
+        myrole = krole.K2hr3Role("token")
+        for _ in range(3):
+            resp = myhttp.send(myrole.get("role").build_request(
+                K2hr3HTTPMethod.GET))
+            self.assertEqual(resp.code, 200)
+            self.assertEqual(resp.body, '{"result":true}')
+        self.assertTrue(myhttp.GET(myrole.get("role")))
+        pool.close()
+        self.assertEqual(_KeepAliveHandler.connections, 1)
+
+    def test_pool_verified_connections(self):
+        """Does not share the connections that verify the certificates."""
+        pool = khttp.K2hr3ConnectionPool()
+        unverified = ssl.create_default_context()
+        unverified.check_hostname = False
+        unverified.verify_mode = ssl.CERT_NONE
+        keys = []
+
+        def acquire(key, timeout, context):
+            keys.append(key)
+            raise OSError('not connected')
+        with patch.object(khttp.K2hr3ConnectionPool, '_acquire',
+                          side_effect=acquire):
+            for context in (unverified, ssl.create_default_context()):
+                req = urllib.request.Request("https://127.0.0.1/v1")
+                with self.assertRaises(OSError):
+                    pool.urlopen(req, context=context)
+        self.assertEqual(keys, [('https', '127.0.0.1', False),
+                                ('https', '127.0.0.1', True)])
+
+    def test_send_http_error(self):
+        """Returns the response of a http error."""
+        pool = khttp.K2hr3ConnectionPool()
+        myhttp = khttp.K2hr3Http(self.base_url, pool)
+        myrole = krole.K2hr3Role("token")
+        request = myrole.get("role").build_request(K2hr3HTTPMethod.GET)
+        with patch.object(type(request), 'path', 'error'):
+            resp = myhttp.send(request)
+        self.assertEqual(resp.code, 404)
+        pool.close()
+
+    @patch('urllib.request.urlopen')
+    def test_send_not_modified(self, mock_urlopen):
+        """Does not log the response of a conditional request as an error."""
+        hdrs = HTTPMessage()
+        hdrs['ETag'] = '"1"'
+        mock_urlopen.side_effect = HTTPError(
+            self.base_url, 304, 'Not Modified', hdrs, io.BytesIO())
+        myhttp = khttp.K2hr3Http(self.base_url)
+        myrole = krole.K2hr3Role("token")
+        request = myrole.get("role").build_request(K2hr3HTTPMethod.GET)
+        with self.assertLogs('k2hr3client.http', level='DEBUG') as logs:
+            resp = myhttp.send(request)
+        self.assertEqual(resp.code, 304)
+        self.assertEqual([record.levelname for record in logs.records],
+                         ['DEBUG'])
+
+    def test_send_stream(self):
+        """Sends a resource data with chunked transfer encoding."""
+        data = ''.join(f'{i}"\u3042\n' for i in range(1000))
+        for pool in (None, khttp.K2hr3ConnectionPool()):
+            myhttp = khttp.K2hr3Http(self.base_url, pool)
+            myresource = kresource.K2hr3Resource("token")
+            myresource.create_conf_resource(
+                "conf", "string",
+                kresource.K2hr3ResourceData(iter(data.encode('utf-8').split(
+                    b'\n'))))
+            resp = myhttp.send(myresource.build_request(K2hr3HTTPMethod.POST))
+            self.assertEqual(resp.code, 201)
+            echo = json.loads(resp.body)
+            self.assertEqual(echo["encoding"], "chunked")
+            self.assertEqual(json.loads(echo["body"])["resource"]["data"],
+                             data.replace('\n', ''))
+            if pool is not None:
+                pool.close()
+
+    def test_reconnect_closed_connection(self):
+        """Reconnects an idle connection whose socket is closed."""
+        pool = khttp.K2hr3ConnectionPool()
+        myhttp = khttp.K2hr3Http(self.base_url, pool)
+        myrole = krole.K2hr3Role("token")
+        request = myrole.get("role").build_request(K2hr3HTTPMethod.GET)
+        myhttp.send(request)
+        for conns in pool._idle.values():
+            for conn in conns:
+                conn.sock.close()
+                conn.sock = None
+        self.assertEqual(myhttp.send(request).code, 200)
+        pool.close()
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
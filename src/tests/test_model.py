@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers 
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+"""Test Package for K2hr3 Python Client."""
+
+import json
+import logging
+import unittest
+
+from http.client import HTTPMessage
+
+from k2hr3client.api import K2hr3ApiResponse
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client import model as kmodel
+from k2hr3client import list as klist
+from k2hr3client import role as krole
+from k2hr3client import tenant as ktenant
+from k2hr3client import token as ktoken
+
+LOG = logging.getLogger(__name__)
+
+
+def _response(body):
+    hdrs = HTTPMessage()
+    hdrs['Content-Type'] = 'application/json'
+    return K2hr3ApiResponse(code=200, url="http://127.0.0.1:18080",
+                            hdrs=hdrs, body=json.dumps(body))
+
+
+class TestK2hr3Model(unittest.TestCase):
+    """Tests the response model classes.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_model.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def test_model_decode_lazily(self):
+        """Decodes the members that are accessed only."""
+        mymodel = kmodel.K2hr3TokenModel('{"result":true,"token":"abc"}')
+        self.assertFalse(hasattr(mymodel, '__dict__'))
+        self.assertIs(mymodel._data, kmodel._NOT_DECODED)
+        self.assertEqual(mymodel.token, "abc")
+        self.assertTrue(mymodel.result)
+        self.assertIs(mymodel._data, kmodel._NOT_DECODED)
+        self.assertEqual(mymodel.data, {"result": True, "token": "abc"})
+
+    def test_model_decode_members(self):
+        """Skips the values that are not accessed."""
+        others = json.dumps({"k": [{"v": i} for i in range(1000)]})
+        body = '{"others": ' + others + ', "role": {"policies": ["p1"], ' \
+            '"others": ' + others + ', "hosts": {"ips": ["10.0.0.1 0 "]}}}'
+        mymodel = kmodel.K2hr3RoleModel(body)
+        self.assertEqual(mymodel.policies, ["p1"])
+        self.assertEqual(mymodel.hostnames, [])
+        self.assertEqual([host.host for host in mymodel.hosts], ["10.0.0.1"])
+        self.assertEqual(mymodel.aliases, [])
+        self.assertIs(mymodel._data, kmodel._NOT_DECODED)
+        with self.assertRaises(K2hr3Exception):
+            kmodel.K2hr3RoleModel('{"role": ').policies
+
+    def test_model_no_response(self):
+        """Raises an exception if no response."""
+        with self.assertRaises(K2hr3Exception):
+            kmodel.K2hr3TokenModel.from_response(None)
+
+    def test_role_model(self):
+        """Parses the hosts of a role lazily."""
+        mymodel = kmodel.K2hr3RoleModel.from_response(_response({
+            "result": True, "message": None,
+            "role": {
+                "policies": ["yrn:yahoo:::demo:policy:test_policy"],
+                "aliases": [],
+                "hosts": {
+                    "hostnames": ["localhost 8080 cuk1 extra tag"],
+                    "ips": [{"ip": "127.0.0.1", "port": 0}]
+                }
+            }}))
+        self.assertEqual(mymodel.policies,
+                         ["yrn:yahoo:::demo:policy:test_policy"])
+        self.assertIsNone(mymodel._cache)
+        hosts = mymodel.hosts
+        self.assertIs(hosts, mymodel.hosts)
+        self.assertEqual(len(hosts), 2)
+        self.assertEqual(hosts[0].host, "localhost")
+        self.assertEqual(hosts[0].port, "8080")
+        self.assertEqual(hosts[0].cuk, "cuk1")
+        self.assertEqual(hosts[0].tag, "tag")
+        self.assertEqual(hosts[0].inboundip, "")
+        self.assertEqual(hosts[1].host, "127.0.0.1")
+        self.assertEqual(hosts[1].port, "0")
+
+    def test_role_token_list_model(self):
+        """Returns the registerpath of a role token."""
+        mymodel = kmodel.K2hr3RoleTokenListModel(json.dumps({
+            "result": True,
+            "tokens": {
+                "token1": {"date": "2020-09-14", "expire": "2020-09-15",
+                           "user": "demo", "registerpath": "path1"},
+            }}))
+        self.assertEqual(mymodel.tokens, ["token1"])
+        self.assertEqual(mymodel.registerpath("token1"), "path1")
+        self.assertIsNone(mymodel.registerpath("token2"))
+        self.assertEqual(mymodel.entry("token1").user, "demo")
+
+    def test_resource_model(self):
+        """Returns the resource data."""
+        mymodel = kmodel.K2hr3ResourceModel(json.dumps({
+            "result": True,
+            "resource": {"string": "data", "object": None,
+                         "keys": {"k": "v"}, "expire": 0,
+                         "aliases": ["yrn:yahoo:::demo:resource:r"]}}))
+        self.assertEqual(mymodel.data, "data")
+        self.assertEqual(mymodel.keys, {"k": "v"})
+        self.assertEqual(mymodel.aliases, ["yrn:yahoo:::demo:resource:r"])
+        mymodel = kmodel.K2hr3ResourceModel(
+            '{"result":true,"resource":"scalar"}')
+        self.assertEqual(mymodel.data, "scalar")
+        self.assertEqual(mymodel.keys, {})
+
+    def test_list_model(self):
+        """Walks the nested children."""
+        mymodel = kmodel.K2hr3ListModel(json.dumps({
+            "result": True,
+            "children": [
+                {"name": "yrn:yahoo:::demo:role:a",
+                 "children": [{"name": "yrn:yahoo:::demo:role:a/b",
+                               "children": []}]},
+                "yrn:yahoo:::demo:role:c"]}))
+        self.assertEqual(mymodel.names, ["yrn:yahoo:::demo:role:a",
+                                         "yrn:yahoo:::demo:role:c"])
+        self.assertEqual(list(mymodel.walk()),
+                         ["yrn:yahoo:::demo:role:a",
+                          "yrn:yahoo:::demo:role:a/b",
+                          "yrn:yahoo:::demo:role:c"])
+
+    def test_from_api(self):
+        """Returns the model class of the API."""
+        mytoken = ktoken.K2hr3RoleToken("token", "role", 0)
+        mytoken.resp = _response({"result": True, "token": "rtoken",
+                                  "registerpath": "path"})
+        mymodel = kmodel.from_api(mytoken)
+        self.assertIsInstance(mymodel, kmodel.K2hr3RoleTokenModel)
+        self.assertEqual(mymodel.registerpath, "path")
+
+        mytenant = ktenant.K2hr3Tenant("token")
+        mytenant.get_tenant_list(expand=False)
+        mytenant.resp = _response({"result": True, "tenants": ["t1", "t2"]})
+        mymodel = kmodel.from_api(mytenant)
+        self.assertIsInstance(mymodel, kmodel.K2hr3TenantListModel)
+        self.assertEqual(mymodel.names, ["t1", "t2"])
+
+        myrole = krole.K2hr3Role("token")
+        myrole.get_token_list("role")
+        myrole.resp = _response({"result": True, "tokens": ["t"]})
+        self.assertIsInstance(kmodel.from_api(myrole),
+                              kmodel.K2hr3RoleTokenListModel)
+
+        mylist = klist.K2hr3List("token", "service")
+        mylist.resp = _response({"result": True, "children": []})
+        self.assertIsInstance(kmodel.from_api(mylist), kmodel.K2hr3ListModel)
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
@@ -24,7 +24,6 @@ import json
 import logging
 import unittest
 from unittest.mock import patch
-import urllib.parse
 
 from k2hr3client import http as khttp
 from k2hr3client import policy as kpolicy
@@ -133,8 +132,12 @@ class TestK2hr3Policy(unittest.TestCase):
             'resource': self.resource,
             'alias': self.alias
         }
-        self.assertEqual(mypolicy.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(mypolicy.urlparams, s_s_urlparams)
+        s_urlparams = (
+            'name=testpolicy&effect=allow&'
+            'action=%5B%22yrn%3Ayahoo%3A%3A%3A%3Aaction%3Aread%22%5D&resource='
+            '%5B%22yrn%3Ayahoo%3A%3A%3Ademo%3Aresource%3Amy_resource%22%5D&'
+            'alias=%5B%5D')
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -166,8 +169,8 @@ class TestK2hr3Policy(unittest.TestCase):
         s_s_urlparams = {
             'service': self.service
         }
-        self.assertEqual(mypolicy.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(mypolicy.urlparams, s_s_urlparams)
+        s_urlparams = 'service=testservice'
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -205,8 +208,12 @@ class TestK2hr3Policy(unittest.TestCase):
             'action': self.action,
             'service': self.service
         }
-        self.assertEqual(mypolicy.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(mypolicy.urlparams, s_s_urlparams)
+        s_urlparams = (
+            'tenant=demo&resource=%5B%22yrn%3Ayahoo%3A%3A%3Ademo%3Aresource%3A'
+            'my_resource%22%5D&'
+            'action=%5B%22yrn%3Ayahoo%3A%3A%3A%3Aaction%3Aread%22%5D&'
+            'service=testservice')
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers 
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+"""Test Package for K2hr3 Python Client."""
+
+import json
+import logging
+import unittest
+from unittest.mock import patch
+
+from k2hr3client.api import K2hr3ApiResponse
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client import http as khttp
+from k2hr3client import resolver as kresolver
+
+LOG = logging.getLogger(__name__)
+
+ROLES = {
+    "top": {"policies": ["p1"], "aliases": ["mid1", "mid2"],
+            "hosts": {"hostnames": ["top 0 "], "ips": []}},
+    "mid1": {"policies": ["p2"], "aliases": ["leaf"],
+             "hosts": {"hostnames": [], "ips": ["10.0.0.1 0 "]}},
+    "mid2": {"policies": ["p1", "p3"], "aliases": ["leaf"],
+             "hosts": {"hostnames": [], "ips": []}},
+    "leaf": {"policies": ["p4"], "aliases": [],
+             "hosts": {"hostnames": [], "ips": ["10.0.0.1 0 ",
+                                                "10.0.0.2 0 "]}},
+}
+
+
+class TestK2hr3RoleResolver(unittest.TestCase):
+    """Tests the K2hr3RoleResolver class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_resolver.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.base_url = "http://127.0.0.1:18080"
+        self.roles = dict(ROLES)
+        self.now = 1000.0
+        self.resolver = kresolver.K2hr3RoleResolver(
+            khttp.K2hr3Http(self.base_url), "r3token", ttl=60,
+            clock=lambda: self.now)
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def _send(self, request):
+        name = request.path.rsplit('/', 1)[-1]
+        self.assertEqual(request.urlparams, {'expand': False})
+        if name not in self.roles:
+            return K2hr3ApiResponse(code=404, url=self.base_url,
+                                    hdrs={'Content-Type': 'text/plain'},
+                                    body='')
+        body = json.dumps({"result": True, "message": None,
+                           "role": self.roles[name]})
+        return K2hr3ApiResponse(code=200, url=self.base_url,
+                                hdrs={'Content-Type': 'application/json'},
+                                body=body)
+
+    def test_resolve(self):
+        """Expands the nested roles."""
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=self._send) as mock_send:
+            role = self.resolver.resolve("top")
+        self.assertEqual(mock_send.call_count, 4)
+        self.assertEqual(role.roles, ("top", "mid1", "leaf", "mid2"))
+        self.assertEqual(role.policies, ("p1", "p2", "p4", "p3"))
+        self.assertEqual([host.host for host in role.hosts],
+                         ["top", "10.0.0.1", "10.0.0.2"])
+
+    def test_resolve_cached(self):
+        """Gets the roles once while they are cached."""
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=self._send) as mock_send:
+            role = self.resolver.resolve("top")
+            self.assertIs(self.resolver.resolve("top"), role)
+            self.assertEqual(self.resolver.resolve("mid2").policies,
+                             ("p1", "p3", "p4"))
+            self.assertEqual(mock_send.call_count, 4)
+            # The expansion is computed again after a role expired.
+            self.now += 61
+            self.roles["leaf"] = {"policies": ["p5"], "aliases": []}
+            role2 = self.resolver.resolve("top")
+        self.assertEqual(mock_send.call_count, 8)
+        self.assertIsNot(role2, role)
+        self.assertEqual(role2.policies, ("p1", "p2", "p5", "p3"))
+
+    def test_resolve_cycle(self):
+        """Raises an exception if the roles are nested circularly."""
+        self.roles["leaf"] = {"policies": [], "aliases": ["mid1"]}
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            with self.assertRaises(K2hr3Exception) as context:
+                self.resolver.resolve("top")
+        self.assertIn("mid1 -> leaf -> mid1", str(context.exception))
+
+    def test_resolve_not_found(self):
+        """Raises an exception if a nested role could not be got."""
+        self.roles["leaf"] = {"policies": [], "aliases": ["missing"]}
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            with self.assertRaises(K2hr3Exception):
+                self.resolver.resolve("top")
+
+    def test_resolve_yrn_full_path(self):
+        """Shares the cached role of a role name and the YRN full path."""
+        resolver = kresolver.K2hr3RoleResolver(
+            khttp.K2hr3Http(self.base_url), "r3token", ttl=60,
+            clock=lambda: self.now, tenant="demo")
+        self.roles = {
+            "yrn:yahoo:::demo:role:top": {
+                "policies": ["p1"], "aliases": ["yrn:yahoo:::demo:role:leaf"]},
+            "yrn:yahoo:::demo:role:leaf": {"policies": ["p2"], "aliases": []},
+        }
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=self._send) as mock_send:
+            role = resolver.resolve("top")
+            self.assertIs(resolver.resolve("yrn:yahoo:::demo:role:top"), role)
+            self.assertEqual(resolver.resolve("leaf").policies, ("p2",))
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertEqual(role.roles, ("yrn:yahoo:::demo:role:top",
+                                      "yrn:yahoo:::demo:role:leaf"))
+        resolver.invalidate("top")
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=self._send) as mock_send:
+            self.assertIsNot(resolver.resolve("top"), role)
+        self.assertEqual(mock_send.call_count, 1)
+
+    def test_resolve_memo_bounded(self):
+        """Keeps the expansions up to the maxsize."""
+        resolver = kresolver.K2hr3RoleResolver(
+            khttp.K2hr3Http(self.base_url), "r3token", ttl=60, maxsize=2,
+            clock=lambda: self.now)
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            resolver.resolve("top")
+        self.assertEqual(len(resolver._memo), 2)  # pylint: disable=protected-access # noqa
+        self.assertIn("top", resolver._memo)  # pylint: disable=protected-access # noqa
+
+    def test_hosts(self):
+        """Returns the unique hosts of the roles."""
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            hosts = self.resolver.hosts(["mid1", "mid2"])
+        self.assertEqual([host.host for host in hosts],
+                         ["10.0.0.1", "10.0.0.2"])
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
@@ -21,10 +21,13 @@
 """Test Package for K2hr3 Python Client."""
 import json
 import logging
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
-import urllib.parse
 
+from k2hr3client.api import K2hr3HTTPMethod
+from k2hr3client.exception import K2hr3Exception
 from k2hr3client import http as khttp
 from k2hr3client import resource as kresource
 
@@ -109,8 +112,8 @@ class TestK2hr3Resource(unittest.TestCase):
             'keys': self.keys,
             'alias': self.alias
         }
-        self.assertEqual(myresource.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myresource.urlparams, s_s_urlparams)
+        s_urlparams = khttp._encode_urlparams(s_s_urlparams)
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -121,6 +124,54 @@ class TestK2hr3Resource(unittest.TestCase):
         # 4. assert Request body
         self.assertEqual(myresource.body, None)
 
+    def test_resource_create_resource_stream(self):
+        """Streams the resource data of a file by POST."""
+        data = 'line1\n"quoted"\t\\ \u3042\U0001f600' * 100
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8',
+                                         delete=False) as fileobj:
+            fileobj.write(data)
+        self.addCleanup(os.unlink, fileobj.name)
+        myresource = kresource.K2hr3Resource("token")
+        myresource.create_conf_resource(
+            self.name, self.data_type,
+            kresource.K2hr3ResourceData(fileobj.name, chunk_size=7),
+            keys=self.keys, alias=self.alias)
+        request = myresource.build_request(K2hr3HTTPMethod.POST)
+        self.assertEqual(request.path, "v1/resource")
+        chunks = list(request.body)
+        self.assertTrue(all(len(chunk) < 64 for chunk in chunks[1:]))
+        self.assertEqual(json.loads(b''.join(chunks)), {
+            "resource": {
+                "name": self.name,
+                "type": self.data_type,
+                "data": data,
+                "keys": self.keys,
+                "alias": self.alias
+            }
+        })
+        # The data of a path can be read again.
+        self.assertEqual(b''.join(request.body), b''.join(chunks))
+
+        req = khttp.K2hr3Http(self.base_url)._to_urllib_request(request)
+        self.assertIs(req.data, request.body)
+
+    def test_resource_create_resource_stream_once(self):
+        """Reads the data of an iterable only once."""
+        encoded = '\u3042'.encode('utf-8')
+        myresource = kresource.K2hr3Resource(roletoken="roletoken",
+                                             resource_path="conf")
+        myresource.create_conf_resource(
+            self.name, self.data_type,
+            kresource.K2hr3ResourceData(iter([encoded[:1], encoded[1:]])))
+        request = myresource.build_request(K2hr3HTTPMethod.POST)
+        self.assertEqual(request.path, "v1/resource/conf")
+        body = json.loads(b''.join(request.body))
+        self.assertEqual(body["resource"]["data"], '\u3042')
+        with self.assertRaises(K2hr3Exception):
+            list(request.body)
+        with self.assertRaises(K2hr3Exception):
+            myresource.build_request(K2hr3HTTPMethod.PUT)
+
     #
     # TestCases using GET Requests
     #
@@ -146,8 +197,8 @@ class TestK2hr3Resource(unittest.TestCase):
             'expand': self.expand,
             'service': self.service
         }
-        self.assertEqual(myresource.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myresource.urlparams, s_s_urlparams)
+        s_urlparams = khttp._encode_urlparams(s_s_urlparams)
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -158,6 +209,54 @@ class TestK2hr3Resource(unittest.TestCase):
         # 4. assert Request body
         self.assertEqual(myresource.body, None)
 
+    def test_resource_create_resource_stream(self):
+        """Streams the resource data of a file by POST."""
+        data = 'line1\n"quoted"\t\\ \u3042\U0001f600' * 100
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8',
+                                         delete=False) as fileobj:
+            fileobj.write(data)
+        self.addCleanup(os.unlink, fileobj.name)
+        myresource = kresource.K2hr3Resource("token")
+        myresource.create_conf_resource(
+            self.name, self.data_type,
+            kresource.K2hr3ResourceData(fileobj.name, chunk_size=7),
+            keys=self.keys, alias=self.alias)
+        request = myresource.build_request(K2hr3HTTPMethod.POST)
+        self.assertEqual(request.path, "v1/resource")
+        chunks = list(request.body)
+        self.assertTrue(all(len(chunk) < 64 for chunk in chunks[1:]))
+        self.assertEqual(json.loads(b''.join(chunks)), {
+            "resource": {
+                "name": self.name,
+                "type": self.data_type,
+                "data": data,
+                "keys": self.keys,
+                "alias": self.alias
+            }
+        })
+        # The data of a path can be read again.
+        self.assertEqual(b''.join(request.body), b''.join(chunks))
+
+        req = khttp.K2hr3Http(self.base_url)._to_urllib_request(request)
+        self.assertIs(req.data, request.body)
+
+    def test_resource_create_resource_stream_once(self):
+        """Reads the data of an iterable only once."""
+        encoded = '\u3042'.encode('utf-8')
+        myresource = kresource.K2hr3Resource(roletoken="roletoken",
+                                             resource_path="conf")
+        myresource.create_conf_resource(
+            self.name, self.data_type,
+            kresource.K2hr3ResourceData(iter([encoded[:1], encoded[1:]])))
+        request = myresource.build_request(K2hr3HTTPMethod.POST)
+        self.assertEqual(request.path, "v1/resource/conf")
+        body = json.loads(b''.join(request.body))
+        self.assertEqual(body["resource"]["data"], '\u3042')
+        with self.assertRaises(K2hr3Exception):
+            list(request.body)
+        with self.assertRaises(K2hr3Exception):
+            myresource.build_request(K2hr3HTTPMethod.PUT)
+
     #
     # TestCases using GET Requests
     #
@@ -185,8 +284,8 @@ class TestK2hr3Resource(unittest.TestCase):
             'keys': self.keys,
             'service': self.service
         }
-        self.assertEqual(myresource.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myresource.urlparams, s_s_urlparams)
+        s_urlparams = khttp._encode_urlparams(s_s_urlparams)
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -229,8 +328,8 @@ class TestK2hr3Resource(unittest.TestCase):
             'keys': self.keys,
             'service': self.service
         }
-        self.assertEqual(myresource.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myresource.urlparams, s_s_urlparams)
+        s_urlparams = khttp._encode_urlparams(s_s_urlparams)
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -272,8 +371,8 @@ class TestK2hr3Resource(unittest.TestCase):
             'keys': self.keys,
             'service': self.service
         }
-        self.assertEqual(myresource.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myresource.urlparams, s_s_urlparams)
+        s_urlparams = khttp._encode_urlparams(s_s_urlparams)
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers 
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+"""Test Package for K2hr3 Python Client."""
+
+import json
+import logging
+import unittest
+from unittest.mock import patch
+
+from k2hr3client.api import K2hr3ApiResponse, K2hr3HTTPMethod
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client import http as khttp
+from k2hr3client import resource as kresource
+from k2hr3client import resourcecache as kresourcecache
+
+LOG = logging.getLogger(__name__)
+
+
+class TestK2hr3ResourceCache(unittest.TestCase):
+    """Tests the K2hr3ResourceCache class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_resourcecache.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.base_url = "http://127.0.0.1:18080"
+        self.now = 1000.0
+        self.data = "data1"
+        self.cache = kresourcecache.K2hr3ResourceCache(
+            khttp.K2hr3Http(self.base_url), ttl=60, maxsize=2,
+            clock=lambda: self.now)
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def _send(self, request):
+        if request.method != K2hr3HTTPMethod.GET:
+            self.data = "data2"
+            return K2hr3ApiResponse(code=200, url=self.base_url,
+                                    hdrs={'Content-Type': 'text/plain'},
+                                    body='')
+        body = json.dumps({"result": True, "message": None,
+                           "resource": self.data})
+        return K2hr3ApiResponse(code=200, url=self.base_url,
+                                hdrs={'Content-Type': 'application/json'},
+                                body=body)
+
+    @staticmethod
+    def _read(path="conf", keys=None, roletoken="rt1"):
+        return kresource.K2hr3Resource(
+            roletoken=roletoken,
+            resource_path=path).get_with_roletoken("string", keys)
+
+    def test_get(self):
+        """Reads a resource once in the ttl."""
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=self._send) as mock_send:
+            self.assertEqual(self.cache.get(self._read()).data, "data1")
+            self.assertEqual(self.cache.get(self._read()).data, "data1")
+            self.assertEqual(mock_send.call_count, 1)
+            # The keys and the tokens are parts of the cache keys.
+            self.cache.get(self._read(keys={"b": 1, "a": 2}))
+            self.cache.get(self._read(keys={"a": 2, "b": 1}))
+            self.assertEqual(mock_send.call_count, 2)
+            self.cache.get(self._read(roletoken="rt2"))
+            self.assertEqual(mock_send.call_count, 3)
+            self.now += 61
+            self.cache.get(self._read())
+            self.assertEqual(mock_send.call_count, 4)
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.stats.hits, 2)
+
+    def test_write_evicts(self):
+        """Evicts the reads of the path that is written."""
+        with patch.object(khttp.K2hr3Http, 'send',
+                          side_effect=self._send) as mock_send:
+            self.cache.get(self._read())
+            self.cache.get(self._read(path="other"))
+            myresource = kresource.K2hr3Resource("r3token")
+            self.cache.write(
+                myresource.create_conf_resource("conf", "string", "data2"),
+                K2hr3HTTPMethod.PUT)
+            self.assertEqual(self.cache.get(self._read()).data, "data2")
+            self.cache.get(self._read(path="other"))
+            self.assertEqual(mock_send.call_count, 4)
+            # A YRN full path evicts the reads of the path.
+            myresource = kresource.K2hr3Resource(
+                "r3token", resource_path="yrn:yahoo:::demo:resource:conf")
+            self.cache.write(myresource.delete_with_scopedtoken("string", None),
+                             K2hr3HTTPMethod.DELETE)
+            self.cache.get(self._read())
+            self.assertEqual(mock_send.call_count, 6)
+
+    def test_rotated_tokens(self):
+        """Keeps the index of the reads bounded by the maxsize."""
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            for i in range(10):
+                self.cache.get(self._read(roletoken=f"rt{i}"))
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(len(self.cache._names["conf"]), 2)  # pylint: disable=protected-access # noqa
+        # A read that failed is not indexed.
+        resp = K2hr3ApiResponse(code=404, url=self.base_url,
+                                hdrs={'Content-Type': 'text/plain'}, body='')
+        with patch.object(khttp.K2hr3Http, 'send', return_value=resp):
+            with self.assertRaises(K2hr3Exception):
+                self.cache.get(self._read(path="missing"))
+        self.assertNotIn("missing", self.cache._names)  # pylint: disable=protected-access # noqa
+
+    def test_get_not_read(self):
+        """Raises an exception if the request is not a read."""
+        myresource = kresource.K2hr3Resource("r3token", resource_path="conf")
+        with self.assertRaises(K2hr3Exception):
+            self.cache.get(myresource.delete_with_scopedtoken("string", None))
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
@@ -24,8 +24,8 @@ import json
 import logging
 import unittest
 from unittest.mock import patch
-import urllib
 
+from k2hr3client.api import K2hr3HTTPMethod
 from k2hr3client import http as khttp
 from k2hr3client import role as krole
 
@@ -128,8 +128,8 @@ class TestK2hr3Role(unittest.TestCase):
             'policies': self.policies,
             'alias': self.alias
         }
-        self.assertEqual(myrole.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myrole.urlparams, s_s_urlparams)
+        s_urlparams = khttp._encode_urlparams(s_s_urlparams)
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -176,9 +176,21 @@ class TestK2hr3Role(unittest.TestCase):
         python_data['host']['tag'] = self.host.tag
         python_data['host']['inboundip'] = self.host.inboundip
         python_data['host']['outboundip'] = self.host.outboundip
+        python_data['clear_hostname'] = bool(self.clear_hostname)
+        python_data['clear_ips'] = bool(self.clear_ips)
         body = json.dumps(python_data)
         self.assertEqual(myrole.body, body)
 
+    def test_role_add_member_using_post_booleans(self):
+        """Sends clear_hostname and clear_ips as JSON booleans."""
+        myrole = krole.K2hr3Role(self.token)
+        request = myrole.add_member(self.name, self.host, True,
+                                    None).build_request(K2hr3HTTPMethod.POST)
+        python_data = json.loads(request.body)
+        self.assertIs(python_data['clear_hostname'], True)
+        self.assertIs(python_data['clear_ips'], False)
+        self.assertNotIn('<true/false>', request.body)
+
     @patch('k2hr3client.http.K2hr3Http._HTTP_REQUEST_METHOD')
     def test_role_add_member_using_put(self, mock_HTTP_REQUEST_METHOD):
         myrole = krole.K2hr3Role(self.token)
@@ -206,14 +218,90 @@ class TestK2hr3Role(unittest.TestCase):
             'inboundip': self.host.inboundip,
             'outboundip': self.host.outboundip
         }
-        self.assertEqual(myrole.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myrole.urlparams, s_s_urlparams)
+        s_urlparams = khttp._encode_urlparams(s_s_urlparams)
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         self.assertEqual(myrole.headers, headers)
         # 4. assert Request body
         self.assertEqual(myrole.body, None)
 
+    @patch('k2hr3client.http.K2hr3Http._HTTP_REQUEST_METHOD')
+    def test_role_add_members_using_post(self, mock_HTTP_REQUEST_METHOD):
+        """Adds the hosts in the request body."""
+        myrole = krole.K2hr3Role(self.token)
+        hostlist = krole.K2hr3RoleHostList()
+        hostlist.add_host(self.host)
+        myrole.add_members(self.name, hostlist, self.clear_hostname,
+                           self.clear_ips)
+
+        httpreq = khttp.K2hr3Http(self.base_url)
+        self.assertTrue(httpreq.POST(myrole))
+
+        # 1. assert URL
+        self.assertEqual(httpreq.url, f"{self.base_url}/v1/role/{self.name}")
+        # 2. assert URL params
+        self.assertEqual(myrole.urlparams, None)
+        # 3. assert Request body
+        import json
+        python_data = json.loads(myrole.body)
+        self.assertEqual(python_data['host'], [{
+            'host': 'localhost', 'port': '1024', 'cuk': 'testcuk',
+            'extra': 'testextra', 'tag': 'testtag',
+            'inboundip': '10.0.0.1', 'outboundip': '172.24.4.1'}])
+        self.assertFalse(python_data['clear_hostname'])
+        self.assertFalse(python_data['clear_ips'])
+
+    @patch('k2hr3client.http.K2hr3Http._HTTP_REQUEST_METHOD')
+    def test_role_add_members_using_put(self, mock_HTTP_REQUEST_METHOD):
+        """Adds the hosts in the url params."""
+        myrole = krole.K2hr3Role(self.token)
+        myrole.add_members(self.name, [self.host], self.clear_hostname,
+                           self.clear_ips)
+
+        httpreq = khttp.K2hr3Http(self.base_url)
+        self.assertTrue(httpreq.PUT(myrole))
+
+        # 1. assert URL
+        self.assertEqual(httpreq.url, f"{self.base_url}/v1/role/{self.name}")
+        # 2. assert URL params
+        s_s_urlparams = {
+            'host': [krole.role_host_to_dict(self.host)],
+            'clear_hostname': False,
+            'clear_ips': False
+        }
+        self.assertEqual(myrole.urlparams, s_s_urlparams)
+        s_urlparams = khttp._encode_urlparams(s_s_urlparams)
+        self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
+        # 3. assert Request body
+        self.assertEqual(myrole.body, None)
+
+    @patch('k2hr3client.http.K2hr3Http._HTTP_REQUEST_METHOD')
+    def test_role_add_member_with_roletoken_using_post(
+            self, mock_HTTP_REQUEST_METHOD):
+        myrole = krole.K2hr3Role(self.token, krole.K2hr3TokenType.ROLE_TOKEN)
+        myrole.add_member_with_roletoken(
+            self.name, self.host.port, self.host.cuk, self.host.extra,
+            self.host.tag, self.host.inboundip, self.host.outboundip)
+
+        httpreq = khttp.K2hr3Http(self.base_url)
+        self.assertTrue(httpreq.POST(myrole))
+
+        # 1. assert URL
+        self.assertEqual(httpreq.url, f"{self.base_url}/v1/role/{self.name}")
+        # 2. assert URL params
+        self.assertEqual(myrole.urlparams, None)
+        # 3. assert Request body
+        import json
+        python_data = json.loads(krole._ROLE_API_ADD_MEMBER_USING_ROLETOKEN)
+        python_data['host']['port'] = self.host.port
+        python_data['host']['cuk'] = self.host.cuk
+        python_data['host']['extra'] = self.host.extra
+        python_data['host']['tag'] = self.host.tag
+        python_data['host']['inboundip'] = self.host.inboundip
+        python_data['host']['outboundip'] = self.host.outboundip
+        self.assertEqual(myrole.body, json.dumps(python_data))
+
     @patch('k2hr3client.http.K2hr3Http._HTTP_REQUEST_METHOD')
     def test_role_add_member_with_roletoken_using_put(
             self, mock_HTTP_REQUEST_METHOD):
@@ -244,8 +332,8 @@ class TestK2hr3Role(unittest.TestCase):
             'inboundip': self.host.inboundip,
             'outboundip': self.host.outboundip
         }
-        self.assertEqual(myrole.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myrole.urlparams, s_s_urlparams)
+        s_urlparams = khttp._encode_urlparams(s_s_urlparams)
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         self.assertEqual(myrole.headers, headers)
@@ -274,8 +362,8 @@ class TestK2hr3Role(unittest.TestCase):
         s_s_urlparams = {
             'expand': True
         }
-        self.assertEqual(myrole.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myrole.urlparams, s_s_urlparams)
+        s_urlparams = khttp._encode_urlparams(s_s_urlparams)
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         self.assertEqual(myrole.headers, headers)
@@ -304,8 +392,8 @@ class TestK2hr3Role(unittest.TestCase):
         s_s_urlparams = {
             'expand': True
         }
-        self.assertEqual(myrole.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myrole.urlparams, s_s_urlparams)
+        s_urlparams = khttp._encode_urlparams(s_s_urlparams)
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         self.assertEqual(myrole.headers, headers)
@@ -386,8 +474,8 @@ class TestK2hr3Role(unittest.TestCase):
             'port': self.host.port,
             'cuk': self.host.cuk,
         }
-        self.assertEqual(myrole.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myrole.urlparams, s_s_urlparams)
+        s_urlparams = khttp._encode_urlparams(s_s_urlparams)
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         self.assertEqual(myrole.headers, headers)
@@ -415,8 +503,8 @@ class TestK2hr3Role(unittest.TestCase):
         s_s_urlparams = {
             'cuk': self.host.cuk,
         }
-        self.assertEqual(myrole.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myrole.urlparams, s_s_urlparams)
+        s_urlparams = khttp._encode_urlparams(s_s_urlparams)
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         self.assertEqual(myrole.headers, headers)
@@ -446,8 +534,8 @@ class TestK2hr3Role(unittest.TestCase):
             'port': self.host.port,
             'cuk': self.host.cuk,
         }
-        self.assertEqual(myrole.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myrole.urlparams, s_s_urlparams)
+        s_urlparams = khttp._encode_urlparams(s_s_urlparams)
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         self.assertEqual(myrole.headers, headers)
@@ -24,7 +24,6 @@ import json
 import logging
 import unittest
 from unittest.mock import patch
-import urllib.parse
 
 from k2hr3client import http as khttp
 from k2hr3client import service as kservice
@@ -181,8 +180,11 @@ class TestK2hr3Service(unittest.TestCase):
             'name': self.name,
             'verify': verify
         }
-        self.assertEqual(myservice.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myservice.urlparams, s_s_urlparams)
+        s_urlparams = (
+            'name=testservice&verify=%5B%7B%22name%22%3A%22testresource2%22%2C'
+            '%22type%22%3A%22string%22%2C%22data%22%3A%22testresource_str2%22%'
+            '2C%22keys%22%3A%7B%7D%7D%5D')
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -222,8 +224,8 @@ class TestK2hr3Service(unittest.TestCase):
             'tenant': tenant,
             'clear_tenant': clear_tenant
         }
-        self.assertEqual(myservice.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myservice.urlparams, s_s_urlparams)
+        s_urlparams = 'tenant=mytenant&clear_tenant=false'
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -261,8 +263,11 @@ class TestK2hr3Service(unittest.TestCase):
         s_s_urlparams = {
             'verify': verify
         }
-        self.assertEqual(myservice.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myservice.urlparams, s_s_urlparams)
+        s_urlparams = (
+            'verify=%5B%7B%22name%22%3A%22testresource2%22%2C%22type%22%3A%22s'
+            'tring%22%2C%22data%22%3A%22testresource_str2%22%2C%22keys%22%3A%7'
+            'B%7D%7D%5D')
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -396,8 +401,8 @@ class TestK2hr3Service(unittest.TestCase):
         s_s_urlparams = {
             'tenant': tenant
         }
-        self.assertEqual(myservice.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(myservice.urlparams, s_s_urlparams)
+        s_urlparams = 'tenant=mytenant'
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
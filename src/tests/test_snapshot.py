@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers 
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+"""Test Package for K2hr3 Python Client."""
+
+import json
+import logging
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from k2hr3client.api import K2hr3ApiResponse
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client import http as khttp
+from k2hr3client import snapshot as ksnapshot
+
+LOG = logging.getLogger(__name__)
+
+_YRN = "yrn:yahoo:::demo:resource:"
+
+
+class TestK2hr3ResourceSnapshot(unittest.TestCase):
+    """Tests the K2hr3ResourceSnapshot class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_snapshot.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.base_url = "http://127.0.0.1:18080"
+        self.now = 1000.0
+        self.resources = {
+            _YRN + "conf": {"string": "data1", "keys": {"a": 1},
+                            "aliases": [_YRN + "other"]},
+            _YRN + "other": {"object": {"b": [1, 2]}, "keys": {}},
+        }
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "resources.db")
+        self.http = khttp.K2hr3Http(self.base_url)
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def _send(self, request):
+        if request.path == "v1/list/resource":
+            body = {"result": True, "message": None,
+                    "children": [{"name": name, "children": []}
+                                 for name in self.resources]}
+        else:
+            name = request.path.split('/', 2)[-1]
+            if name not in self.resources:
+                return K2hr3ApiResponse(code=404, url=self.base_url,
+                                        hdrs={'Content-Type': 'text/plain'},
+                                        body='')
+            self.assertIs(request.urlparams['expand'], False)
+            body = {"result": True, "message": None,
+                    "resource": self.resources[name]}
+        return K2hr3ApiResponse(code=200, url=self.base_url,
+                                hdrs={'Content-Type': 'application/json'},
+                                body=json.dumps(body))
+
+    def _export(self):
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            return ksnapshot.export_resources(self.http, "r3token",
+                                              self.path,
+                                              clock=lambda: self.now)
+
+    def test_export(self):
+        """Exports the resources and reads them without the network."""
+        self.assertTrue(self._export().ok)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+        with ksnapshot.K2hr3ResourceSnapshot(self.path,
+                                             readonly=True) as snapshot:
+            self.assertEqual(len(snapshot), 2)
+            self.assertIn(_YRN + "conf", snapshot)
+            entry = snapshot.get(_YRN + "conf")
+            self.assertEqual(entry.as_dict(), {
+                "path": _YRN + "conf", "name": "conf", "type": "string",
+                "data": "data1", "keys": {"a": 1},
+                "alias": [_YRN + "other"]})
+            self.assertEqual(entry.fetched, 1000.0)
+            entry = snapshot.get(_YRN + "other")
+            self.assertEqual(entry.data_type, "object")
+            self.assertEqual(entry.data, {"b": [1, 2]})
+            self.assertIsNone(snapshot.get(_YRN + "none"))
+            self.assertEqual([entry.name for entry in snapshot.entries()],
+                             ["conf", "other"])
+            with self.assertRaises(K2hr3Exception):
+                snapshot.remove([_YRN + "conf"])
+
+    def test_export_failed(self):
+        """Keeps the previous file if a resource could not be got."""
+        self._export()
+        self.resources[_YRN + "new"] = {"string": "data"}
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            with patch.object(ksnapshot, 'send_api',
+                              side_effect=K2hr3Exception('error')):
+                result = ksnapshot.export_resources(
+                    self.http, "r3token", self.path, paths=[_YRN + "new"])
+        self.assertFalse(result.ok)
+        with ksnapshot.K2hr3ResourceSnapshot(self.path) as snapshot:
+            self.assertNotIn(_YRN + "new", snapshot)
+            self.assertEqual(len(snapshot), 2)
+        self.assertEqual(os.listdir(self.tmpdir.name), ["resources.db"])
+
+    def test_refresh(self):
+        """Stores only the changed resources."""
+        self._export()
+        self.now += 100
+        self.resources[_YRN + "conf"]["keys"] = {"a": 2}
+        self.resources[_YRN + "new"] = {"string": "data"}
+        del self.resources[_YRN + "other"]
+        with ksnapshot.K2hr3ResourceSnapshot(self.path) as snapshot:
+            with patch.object(khttp.K2hr3Http, 'send',
+                              side_effect=self._send):
+                result = ksnapshot.refresh_snapshot(
+                    snapshot, self.http, "r3token", clock=lambda: self.now)
+            self.assertEqual(result.succeeded,
+                             {_YRN + "conf": True, _YRN + "new": True})
+            self.assertEqual(snapshot.get(_YRN + "conf").keys, {"a": 2})
+            self.assertNotIn(_YRN + "other", snapshot)
+
+            # Only the old resources are got and the unchanged ones are
+            # touched.
+            self.now += 100
+            self.resources[_YRN + "added"] = {"string": "data"}
+            with patch.object(khttp.K2hr3Http, 'send',
+                              side_effect=self._send) as mock_send:
+                result = ksnapshot.refresh_snapshot(
+                    snapshot, self.http, "r3token", max_age=150,
+                    clock=lambda: self.now)
+            self.assertEqual(result.succeeded, {_YRN + "added": True})
+            self.assertEqual(mock_send.call_count, 2)
+            with patch.object(khttp.K2hr3Http, 'send',
+                              side_effect=self._send):
+                result = ksnapshot.refresh_snapshot(
+                    snapshot, self.http, "r3token", paths=[_YRN + "conf"],
+                    clock=lambda: self.now)
+            self.assertEqual(result.succeeded, {_YRN + "conf": False})
+            self.assertEqual(snapshot.get(_YRN + "conf").fetched, 1200.0)
+
+    def test_open_invalid(self):
+        """Raises an exception if the file is not a snapshot."""
+        with self.assertRaises(K2hr3Exception):
+            ksnapshot.K2hr3ResourceSnapshot(self.path, readonly=True)
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write('not a sqlite file' * 10)
+        with self.assertRaises(K2hr3Exception):
+            ksnapshot.K2hr3ResourceSnapshot(self.path)
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
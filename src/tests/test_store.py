@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers 
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+"""Test Package for K2hr3 Python Client."""
+
+import json
+import logging
+import os
+from pathlib import Path
+import stat
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from k2hr3client.api import K2hr3ApiResponse
+from k2hr3client import auth as kauth
+from k2hr3client import http as khttp
+from k2hr3client import store as kstore
+from k2hr3client.exception import K2hr3Exception
+
+LOG = logging.getLogger(__name__)
+
+
+class _Clock():
+    """Fake clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestK2hr3TokenStore(unittest.TestCase):
+    """Tests the K2hr3TokenStore class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_store.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / 'dir' / 'tokens.json'
+        self.clock = _Clock()
+        self.base_url = "http://127.0.0.1:18080"
+
+    def tearDown(self):
+        """Tears down a test case."""
+        self.tmpdir.cleanup()
+
+    def test_put_get(self):
+        """Shares a token with another instance."""
+        store = kstore.K2hr3TokenStore(self.path, clock=self.clock)
+        self.assertIsNone(store.get(self.base_url, "demo", "user"))
+        store.put(self.base_url, "demo", "user", "token", 1100)
+        other = kstore.K2hr3TokenStore(self.path, clock=self.clock)
+        self.assertEqual(other.get(self.base_url, "demo", "user"),
+                         ("token", 1100))
+        self.assertIsNone(other.get(self.base_url, "demo", "other"))
+        self.assertIsNone(other.get(self.base_url, "demo", "user",
+                                    kind="roletoken:0"))
+
+    def test_permissions(self):
+        """Writes the file that only the owner can read."""
+        store = kstore.K2hr3TokenStore(self.path, clock=self.clock)
+        store.put(self.base_url, "demo", "user", "token", 1100)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path.parent).st_mode),
+                         0o700)
+        self.assertEqual(sorted(os.listdir(self.path.parent)),
+                         ['tokens.json', 'tokens.json.lock'])
+
+    def test_insecure_file(self):
+        """Ignores a file that other users can access."""
+        store = kstore.K2hr3TokenStore(self.path, clock=self.clock)
+        store.put(self.base_url, "demo", "user", "token", 1100)
+        self.path.chmod(0o644)
+        with self.assertLogs('k2hr3client.store', level='WARNING'):
+            self.assertIsNone(store.get(self.base_url, "demo", "user"))
+
+    def test_lock_error(self):
+        """Raises a K2hr3Exception if the directory could not be made."""
+        self.path.parent.write_text('')
+        store = kstore.K2hr3TokenStore(self.path, clock=self.clock)
+        with self.assertRaises(K2hr3Exception):
+            store.get(self.base_url, "demo", "user")
+        with self.assertRaises(K2hr3Exception):
+            store.put(self.base_url, "demo", "user", "token", 1100)
+
+    def test_expiry(self):
+        """Does not return and removes the expired tokens."""
+        store = kstore.K2hr3TokenStore(self.path, clock=self.clock)
+        store.put(self.base_url, "p1", None, "token1", 1100)
+        self.assertIsNone(store.get(self.base_url, "p1", min_ttl=100))
+        self.clock.now = 1100
+        self.assertIsNone(store.get(self.base_url, "p1"))
+        store.put(self.base_url, "p2", None, "token2", 1200)
+        with open(self.path, encoding='utf-8') as file:
+            self.assertEqual(len(json.load(file)['tokens']), 1)
+
+    def test_delete_clear_broken(self):
+        """Deletes tokens and ignores a broken file."""
+        store = kstore.K2hr3TokenStore(self.path, clock=self.clock)
+        store.put(self.base_url, "p1", None, "token1", 1100)
+        store.put(self.base_url, "p2", None, "token2", 1100)
+        store.delete(self.base_url, "p1")
+        self.assertIsNone(store.get(self.base_url, "p1"))
+        self.assertIsNotNone(store.get(self.base_url, "p2"))
+        store.clear()
+        self.assertIsNone(store.get(self.base_url, "p2"))
+        self.path.write_text('{broken')
+        self.path.chmod(0o600)
+        self.assertIsNone(store.get(self.base_url, "p2"))
+        store.put(self.base_url, "p2", None, "token2", 1100)
+        self.assertIsNotNone(store.get(self.base_url, "p2"))
+
+    def test_concurrent_put(self):
+        """Keeps all tokens that are stored concurrently."""
+        store = kstore.K2hr3TokenStore(self.path, clock=self.clock)
+        threads = [threading.Thread(
+            target=store.put, args=(self.base_url, f"p{i}", None, "t", 1100))
+            for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for i in range(16):
+            self.assertIsNotNone(store.get(self.base_url, f"p{i}"))
+
+    def test_token_manager_store(self):
+        """Reuses a token that another manager stored."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        resp = K2hr3ApiResponse(code=201, url=self.base_url,
+                                hdrs={'Content-Type': 'application/json'},
+                                body='{"result":true,"token":"r3token"}')
+        with patch.object(khttp.K2hr3Http, 'send',
+                          return_value=resp) as mock_send:
+            for _ in range(2):
+                manager = kauth.K2hr3TokenManager(
+                    myhttp, clock=self.clock,
+                    store=kstore.K2hr3TokenStore(self.path,
+                                                 clock=self.clock))
+                self.assertEqual(manager.get_token("demo", "iaas"),
+                                 "r3token")
+        self.assertEqual(mock_send.call_count, 1)
+
+    def test_token_manager_store_error(self):
+        """Returns the tokens from the server if the store failed."""
+        self.path.parent.write_text('')
+        myhttp = khttp.K2hr3Http(self.base_url)
+        store = kstore.K2hr3TokenStore(self.path, clock=self.clock)
+        token_resp = K2hr3ApiResponse(
+            code=201, url=self.base_url,
+            hdrs={'Content-Type': 'application/json'},
+            body='{"result":true,"token":"r3token"}')
+        role_resp = K2hr3ApiResponse(
+            code=200, url=self.base_url,
+            hdrs={'Content-Type': 'application/json'},
+            body='{"result":true,"token":"rt","registerpath":"path"}')
+        manager = kauth.K2hr3TokenManager(myhttp, clock=self.clock,
+                                          store=store)
+        roletokens = kauth.K2hr3RoleTokenCache(myhttp, clock=self.clock,
+                                               store=store)
+        with self.assertLogs('k2hr3client.auth', level='WARNING'):
+            with patch.object(khttp.K2hr3Http, 'send',
+                              return_value=token_resp):
+                self.assertEqual(manager.get_token("demo", "iaas"),
+                                 "r3token")
+            with patch.object(khttp.K2hr3Http, 'send',
+                              return_value=role_resp):
+                self.assertEqual(
+                    roletokens.get_registerpath("r3token", "role", 3600),
+                    "path")
+            manager.invalidate()
+
+    def test_token_manager_invalidate_store(self):
+        """Removes only the tokens of the manager from the store."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        resp = K2hr3ApiResponse(code=201, url=self.base_url,
+                                hdrs={'Content-Type': 'application/json'},
+                                body='{"result":true,"token":"r3token"}')
+        store = kstore.K2hr3TokenStore(self.path, clock=self.clock)
+        store.put(self.base_url, "role", "digest", {"token": "rt"}, 1100,
+                  "roletoken:0")
+        manager = kauth.K2hr3TokenManager(myhttp, clock=self.clock,
+                                          store=store)
+        with patch.object(khttp.K2hr3Http, 'send', return_value=resp):
+            manager.get_token("demo", "iaas")
+        manager.invalidate()
+        self.assertNotIn("r3token", self.path.read_text())
+        self.assertNotIn("iaas", self.path.read_text())
+        self.assertIsNotNone(store.get(self.base_url, "role", "digest",
+                                       "roletoken:0"))
+
+    def test_role_token_cache_store(self):
+        """Reuses a role token that another cache stored."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        resp = K2hr3ApiResponse(
+            code=200, url=self.base_url,
+            hdrs={'Content-Type': 'application/json'},
+            body='{"result":true,"token":"rt","registerpath":"path"}')
+        with patch.object(khttp.K2hr3Http, 'send',
+                          return_value=resp) as mock_send:
+            for _ in range(2):
+                roletokens = kauth.K2hr3RoleTokenCache(
+                    myhttp, clock=self.clock,
+                    store=kstore.K2hr3TokenStore(self.path,
+                                                 clock=self.clock))
+                self.assertEqual(
+                    roletokens.get_registerpath("r3token", "role", 3600),
+                    "path")
+        self.assertEqual(mock_send.call_count, 1)
+        self.assertNotIn("r3token", self.path.read_text())
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
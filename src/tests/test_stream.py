@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers 
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+"""Test Package for K2hr3 Python Client."""
+
+import io
+import json
+import logging
+import unittest
+from unittest.mock import patch
+
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client import http as khttp
+from k2hr3client import jsonscan as kjsonscan
+from k2hr3client import list as klist
+from k2hr3client import role as krole
+from k2hr3client import stream as kstream
+from k2hr3client import tenant as ktenant
+
+LOG = logging.getLogger(__name__)
+
+
+def _chunks(text, size=1):
+    return (text[i:i + size] for i in range(0, len(text), size))
+
+
+class _Response(io.BytesIO):
+    """Fake response of urllib.request.urlopen."""
+
+
+class TestK2hr3Stream(unittest.TestCase):
+    """Tests the streaming functions.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_stream.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.base_url = "http://127.0.0.1:18080"
+        self.document = json.dumps({
+            "result": True,
+            "message": "skip \"}]{[\\ this",
+            "ignored": {"tenants": [1, 2, {"nested": ["a", "b"]}]},
+            "tenants": [
+                {"name": "t1", "id": 12345678901234},
+                "t2", 3.25, None, True, "あ \\ \""],
+            "empty": []})
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def test_iter_json_array(self):
+        """Yields the array elements whatever the chunk size is."""
+        expected = json.loads(self.document)['tenants']
+        for size in (1, 2, 3, 7, 4096):
+            with self.subTest(size=size):
+                self.assertEqual(
+                    list(kstream.iter_json(_chunks(self.document, size),
+                                           ('tenants',))),
+                    expected)
+
+    def test_iter_json_numbers(self):
+        """Yields the numbers split at any offset of the document."""
+        document = '{"children": [1.5, -2e+10, 3E-2, 0, 12345, -0.25e3], ' \
+                   '"tokens": {"a": 1.0e1, "b": 7}}'
+        for offset in range(1, len(document)):
+            chunks = [document[:offset], document[offset:]]
+            with self.subTest(offset=offset):
+                self.assertEqual(
+                    list(kstream.iter_json(iter(chunks), ('children',),
+                                           ('tokens',))),
+                    [1.5, -2e+10, 3E-2, 0, 12345, -0.25e3,
+                     ("a", 10.0), ("b", 7)])
+        self.assertEqual(
+            list(kstream.iter_json(iter(['{"children": [1.', '5]}']),
+                                   ('children',))),
+            [1.5])
+
+    def test_iter_json_object(self):
+        """Yields the object members as tuples."""
+        document = '{"tokens": {"a": {"registerpath": "p"}, "b": {}}}'
+        self.assertEqual(
+            list(kstream.iter_json(_chunks(document), ('tokens',))),
+            [("a", {"registerpath": "p"}), ("b", {})])
+
+    def test_iter_json_paths(self):
+        """Yields the elements of several paths in the document order."""
+        document = json.dumps({"role": {"policies": [], "hosts": {
+            "hostnames": ["h1", "h2"], "ips": ["1.1.1.1"]}}})
+        self.assertEqual(
+            list(kstream.iter_json(_chunks(document, 5),
+                                   ('role', 'hosts', 'hostnames'),
+                                   ('role', 'hosts', 'ips'))),
+            ["h1", "h2", "1.1.1.1"])
+
+    def test_iter_json_empty(self):
+        """Yields nothing if the path is empty or not found."""
+        self.assertEqual(
+            list(kstream.iter_json(_chunks(self.document), ('empty',))), [])
+        self.assertEqual(
+            list(kstream.iter_json(_chunks(self.document), ('none',))), [])
+
+    def test_iter_json_lazily(self):
+        """Yields the first element before reading all chunks."""
+        chunks = _chunks('{"tenants": ["t1", "t2", "t3"]}', 4)
+        myiter = kstream.iter_json(chunks, ('tenants',))
+        self.assertEqual(next(myiter), "t1")
+        self.assertNotEqual(list(chunks), [])
+
+    def test_iter_json_invalid(self):
+        """Raises an exception if the document is invalid."""
+        with self.assertRaises(K2hr3Exception):
+            list(kstream.iter_json(_chunks('{"tenants": ["t1", '),
+                                   ('tenants',)))
+        with self.assertRaises(K2hr3Exception):
+            list(kstream.iter_json(_chunks('{"a": {"b": '), ('tenants',)))
+
+    def test_find_json(self):
+        """Returns the value at the path whatever the chunk size is."""
+        for size in (1, 3, 4096):
+            with self.subTest(size=size):
+                self.assertEqual(
+                    kjsonscan.find_json(_chunks(self.document, size),
+                                        ('tenants',)),
+                    json.loads(self.document)['tenants'])
+                self.assertEqual(
+                    kjsonscan.find_json(_chunks(self.document, size),
+                                        ('ignored', 'tenants')),
+                    [1, 2, {"nested": ["a", "b"]}])
+        self.assertIsNone(
+            kjsonscan.find_json(_chunks(self.document), ('none',)))
+        self.assertEqual(
+            kjsonscan.find_json(_chunks(self.document), ('result', 'x'), 0),
+            0)
+        with self.assertRaises(K2hr3Exception):
+            kjsonscan.find_json(_chunks('{"a": {"b": '), ('a', 'b'))
+
+    def test_iter_list_yrns(self):
+        """Yields the YRN paths of the nested children."""
+        mylist = klist.K2hr3List("token", "service")
+        document = json.dumps({"result": True, "children": [
+            {"name": "yrn:a", "children": [{"name": "yrn:a/b",
+                                            "children": []}]},
+            "yrn:c"]})
+        myhttp = khttp.K2hr3Http(self.base_url)
+        with patch.object(khttp.K2hr3Http, 'stream',
+                          return_value=_chunks(document, 3)) as mock_stream:
+            self.assertEqual(
+                list(kstream.iter_list_yrns(myhttp, mylist.get(expand=True))),
+                ["yrn:a", "yrn:a/b", "yrn:c"])
+        request = mock_stream.call_args[0][0]
+        self.assertEqual(request.urlparams, {'expand': True})
+
+    def test_iter_tenants_role_tokens_hosts(self):
+        """Yields tenants, role tokens and hosts."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        mytenant = ktenant.K2hr3Tenant("token")
+        with patch.object(khttp.K2hr3Http, 'stream',
+                          return_value=_chunks(self.document)):
+            self.assertEqual(
+                len(list(kstream.iter_tenants(
+                    myhttp, mytenant.get_tenant_list(expand=True)))), 6)
+
+        myrole = krole.K2hr3Role("token")
+        document = '{"tokens": {"rt1": {"registerpath": "p1"}}}'
+        with patch.object(khttp.K2hr3Http, 'stream',
+                          return_value=_chunks(document)):
+            tokens = list(kstream.iter_role_tokens(
+                myhttp, myrole.get_token_list("role")))
+        self.assertEqual([(t.token, t.registerpath) for t in tokens],
+                         [("rt1", "p1")])
+
+        document = json.dumps({"role": {"hosts": {
+            "hostnames": ["localhost 80 cuk"], "ips": ["127.0.0.1"]}}})
+        with patch.object(khttp.K2hr3Http, 'stream',
+                          return_value=_chunks(document)):
+            hosts = list(kstream.iter_role_hosts(
+                myhttp, myrole.get("role", expand=True)))
+        self.assertEqual([(h.host, h.port, h.cuk) for h in hosts],
+                         [("localhost", "80", "cuk"), ("127.0.0.1", "", "")])
+
+    def test_http_stream(self):
+        """Reads and decodes the response by chunks."""
+        myhttp = khttp.K2hr3Http(self.base_url)
+        myrole = krole.K2hr3Role("token")
+        body = '{"message": "あい"}'.encode('utf-8')
+        with patch('urllib.request.urlopen',
+                   return_value=_Response(body)) as mock_urlopen:
+            chunks = list(myhttp.stream(
+                myrole.get("role").build_request(
+                    khttp.K2hr3HTTPMethod.GET), chunk_size=4))
+        self.assertEqual(''.join(chunks), body.decode('utf-8'))
+        self.assertEqual(mock_urlopen.call_args[0][0].full_url,
+                         f"{self.base_url}/v1/role/role?expand=true")
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#
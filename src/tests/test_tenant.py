@@ -23,7 +23,6 @@ import json
 import logging
 import unittest
 from unittest.mock import patch
-import urllib.parse
 
 from k2hr3client import http as khttp
 from k2hr3client import tenant as ktenant
@@ -124,8 +123,10 @@ class TestK2hr3Tenant(unittest.TestCase):
             'desc': self.desc,
             'display': self.display,
         }
-        self.assertEqual(mytenant.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(mytenant.urlparams, s_s_urlparams)
+        s_urlparams = (
+            'name=testtenant&users=%5B%22demo%22%5D&desc=test+description&'
+            'display=Demone')
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -199,8 +200,10 @@ class TestK2hr3Tenant(unittest.TestCase):
             'desc': self.desc,
             'display': self.display,
         }
-        self.assertEqual(mytenant.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(mytenant.urlparams, s_s_urlparams)
+        s_urlparams = (
+            'id=123&users=%5B%22demo%22%5D&desc=test+description&'
+            'display=Demone')
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -232,8 +235,8 @@ class TestK2hr3Tenant(unittest.TestCase):
         s_s_urlparams = {
             'expand': False
         }
-        self.assertEqual(mytenant.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(mytenant.urlparams, s_s_urlparams)
+        s_urlparams = 'expand=false'
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -324,8 +327,8 @@ class TestK2hr3Tenant(unittest.TestCase):
             'tenant': self.tenant_name,
             'id': self.tenant_id
         }
-        self.assertEqual(mytenant.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(mytenant.urlparams, s_s_urlparams)
+        s_urlparams = 'tenant=testtenant&id=123'
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -358,8 +361,8 @@ class TestK2hr3Tenant(unittest.TestCase):
         s_s_urlparams = {
             'id': self.tenant_id
         }
-        self.assertEqual(mytenant.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(mytenant.urlparams, s_s_urlparams)
+        s_urlparams = 'id=123'
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -22,10 +22,11 @@
 
 import json
 import logging
+import ssl
 import unittest
 from unittest.mock import patch
-import urllib.parse
 
+from k2hr3client.api import K2hr3ApiResponse
 from k2hr3client import http as khttp
 from k2hr3client import token as ktoken
 
@@ -115,8 +116,8 @@ class TestK2hr3token(unittest.TestCase):
         self.assertEqual(httpreq.url, f"{self.base_url}/v1/user/tokens")
         # 2. assert URL params
         s_s_urlparams = {'tenantname': self.iaas_project}
-        self.assertEqual(mytoken.urlparams, json.dumps(s_s_urlparams))
-        s_urlparams = urllib.parse.urlencode(s_s_urlparams)
+        self.assertEqual(mytoken.urlparams, s_s_urlparams)
+        s_urlparams = khttp._encode_urlparams(s_s_urlparams)
         self.assertEqual(httpreq.urlparams, f"{s_urlparams}")
         # 3. assert Request headers
         headers = {
@@ -177,6 +178,143 @@ class TestK2hr3token(unittest.TestCase):
         # 4. assert Request body
         self.assertEqual(mytoken.body, None)
 
+    @patch('k2hr3client.http.K2hr3Http._HTTP_REQUEST_METHOD')
+    def test_role_token_list_expand(self, mock_HTTP_REQUEST_METHOD):
+        """Sends the expand url parameter."""
+        mylist = ktoken.K2hr3RoleTokenList(self.r3token, self.role,
+                                           self.expand)
+        httpreq = khttp.K2hr3Http(self.base_url)
+        self.assertTrue(httpreq.GET(mylist))
+        self.assertEqual(httpreq.url,
+                         f"{self.base_url}/v1/role/token/list/{self.role}")
+        self.assertEqual(mylist.urlparams, {'expand': True})
+        self.assertEqual(httpreq.urlparams, "expand=true")
+
+
+class TestK2hr3RoleTokenIndex(unittest.TestCase):
+    """Tests the K2hr3RoleTokenIndex class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_token.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.tokens = {
+            f"rt{i}": {"registerpath": f"path{i}",
+                       "expire": f"1970-01-01T00:{i:02d}:00Z"}
+            for i in (5, 3, 9, 1, 7, 2, 8)}
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def test_lookup(self):
+        """Looks up a role token and a registerpath."""
+        index = ktoken.K2hr3RoleTokenIndex(self.tokens)
+        self.assertEqual(len(index), 7)
+        self.assertIn("rt5", index)
+        self.assertEqual(index.registerpath("rt5"), "path5")
+        self.assertEqual(index.token("path5"), "rt5")
+        self.assertIsNone(index.token("none"))
+        self.assertEqual(index.get("rt1")["registerpath"], "path1")
+        self.assertEqual(index.next_expiry(), 60.0)
+
+    def test_expired(self):
+        """Returns the expired role tokens ordered by the expiry."""
+        index = ktoken.K2hr3RoleTokenIndex(self.tokens)
+        self.assertEqual(index.expired(0), [])
+        self.assertEqual(index.expired(5 * 60),
+                         ["rt1", "rt2", "rt3", "rt5"])
+        self.assertEqual(len(index.expired(3600)), 7)
+
+    def test_list_tokens(self):
+        """Indexes the role tokens without details."""
+        index = ktoken.K2hr3RoleTokenIndex(["rt1", "rt2"])
+        self.assertIn("rt1", index)
+        self.assertIsNone(index.registerpath("rt1"))
+        self.assertIsNone(index.next_expiry())
+
+    def test_role_token_list_index(self):
+        """Builds the index once for a response."""
+        mylist = ktoken.K2hr3RoleTokenList("r3token", "role", True)
+        mylist.resp = K2hr3ApiResponse(
+            code=200, url="http://127.0.0.1:18080",
+            hdrs={'Content-Type': 'application/json'},
+            body=json.dumps({"result": True, "tokens": self.tokens}))
+        self.assertIs(mylist.index, mylist.index)
+        self.assertEqual(mylist.registerpath("rt3"), "path3")
+        with self.assertRaises(KeyError):
+            mylist.registerpath("none")
+
+
+class TestK2hr3OpenstackToken(unittest.TestCase):
+    """Tests the openstack token functions.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_token.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.identity_url = "http://127.0.0.1/identity/v3/auth/tokens"
+        ktoken._UNSCOPED_TOKENS.invalidate()
+
+    def tearDown(self):
+        """Tears down a test case."""
+        ktoken._UNSCOPED_TOKENS.invalidate()
+
+    @staticmethod
+    def _urlopen(req, timeout=None, context=None):
+        python_data = json.loads(req.data)
+        scope = python_data['auth'].get('scope')
+        token_id = 'unscoped'
+        if scope:
+            token_id = 'scoped_' + scope['project']['name']
+        return K2hr3ApiResponse(
+            code=201, url=req.full_url,
+            hdrs={'X-Subject-Token': token_id},
+            body=json.dumps({"token": {
+                "expires_at": "2999-01-01T00:00:00.000000Z"}}))
+
+    def test_get_openstack_token_reuse_unscoped(self):
+        """Gets the unscoped token once for several projects."""
+        with patch.object(khttp.K2hr3ConnectionPool, 'urlopen',
+                          side_effect=self._urlopen) as mock_urlopen:
+            self.assertEqual(ktoken.K2hr3Token.get_openstack_token(
+                self.identity_url, "user", "pass", "p1"), "scoped_p1")
+            self.assertEqual(ktoken.K2hr3Token.get_openstack_token(
+                self.identity_url, "user", "pass", "p2"), "scoped_p2")
+        self.assertEqual(mock_urlopen.call_count, 3)
+        # The identity server is verified whatever allow_self_signed_cert is.
+        for call in mock_urlopen.call_args_list:
+            context = call[0][2]
+            self.assertEqual(context.verify_mode, ssl.CERT_REQUIRED)
+            self.assertTrue(context.check_hostname)
+
+    def test_get_openstack_tokens(self):
+        """Gets the scoped tokens of the projects concurrently."""
+        projects = [f"p{i}" for i in range(10)]
+        with patch.object(khttp.K2hr3ConnectionPool, 'urlopen',
+                          side_effect=self._urlopen) as mock_urlopen:
+            tokens = ktoken.K2hr3Token.get_openstack_tokens(
+                self.identity_url, "user", "pass", projects, max_workers=4)
+        self.assertEqual(tokens, {p: f"scoped_{p}" for p in projects})
+        self.assertEqual(mock_urlopen.call_count, 11)
+
+    def test_get_openstack_token_error(self):
+        """Raises an exception if the identity server returns an error."""
+        with patch.object(khttp.K2hr3ConnectionPool, 'urlopen',
+                          return_value=K2hr3ApiResponse(
+                              code=401, url=self.identity_url,
+                              hdrs={'Content-Type': 'application/json'},
+                              body='{}')):
+            with self.assertRaises(ktoken.K2hr3Exception):
+                ktoken.K2hr3Token.get_openstack_token(
+                    self.identity_url, "user", "pass", "p1")
 
 #
 # Local variables:
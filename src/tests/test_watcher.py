@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#
+# k2hr3client - Python client for K2HR3 REST API
+#
+# Copyright 2020 Yahoo Japan Corporation
+# Copyright 2024 LY Corporation
+#
+# K2HR3 is K2hdkc based Resource and Roles and policy Rules, gathers 
+# common management information for the cloud.
+# K2HR3 can dynamically manage information as "who", "what", "operate".
+# These are stored as roles, resources, policies in K2hdkc, and the
+# client system can dynamically read and modify these information.
+#
+# For the full copyright and license information, please view
+# the license file that was distributed with this source code.
+#
+# AUTHOR:   Hirotaka Wakabayashi
+# CREATE:   Mon Sep 14 2020
+# REVISION:
+#
+"""Test Package for K2hr3 Python Client."""
+
+import json
+import logging
+import unittest
+from unittest.mock import patch
+
+from k2hr3client.api import K2hr3ApiResponse
+from k2hr3client.exception import K2hr3Exception
+from k2hr3client import http as khttp
+from k2hr3client import watcher as kwatcher
+
+LOG = logging.getLogger(__name__)
+
+
+class TestK2hr3ResourceWatcher(unittest.TestCase):
+    """Tests the K2hr3ResourceWatcher class.
+
+    Simple usage(this class only):
+    $ python -m unittest tests/test_watcher.py
+
+    Simple usage(all):
+    $ python -m unittest tests
+    """
+    def setUp(self):
+        """Sets up a test case."""
+        self.base_url = "http://127.0.0.1:18080"
+        self.now = 1000.0
+        self.resources = {
+            "conf": {"string": "data1", "keys": {"a": 1, "b": 2}}
+        }
+        self.etags = {}
+        self.requests = []
+        self.watcher = kwatcher.K2hr3ResourceWatcher(
+            khttp.K2hr3Http(self.base_url), r3token="r3token",
+            min_interval=5, max_interval=20, clock=lambda: self.now)
+
+    def tearDown(self):
+        """Tears down a test case."""
+
+    def _send(self, request):
+        self.requests.append(request)
+        path = request.path.rsplit('/', 1)[-1]
+        if path not in self.resources:
+            return K2hr3ApiResponse(code=404, url=self.base_url,
+                                    hdrs={'Content-Type': 'text/plain'},
+                                    body='')
+        etag = self.etags.get(path)
+        hdrs = {'Content-Type': 'application/json'}
+        if etag:
+            hdrs['ETag'] = etag
+            if request.headers.get('If-None-Match') == etag:
+                return K2hr3ApiResponse(code=304, url=self.base_url,
+                                        hdrs=hdrs, body='')
+        body = json.dumps({"result": True, "message": None,
+                           "resource": self.resources[path]})
+        return K2hr3ApiResponse(code=200, url=self.base_url, hdrs=hdrs,
+                                body=body)
+
+    def test_poll_changes(self):
+        """Calls the callbacks only with the changes."""
+        changes = []
+        self.watcher.watch("conf", changes.append)
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            self.watcher.poll()
+            self.assertEqual(len(changes), 1)
+            self.assertTrue(changes[0].data_changed)
+            self.assertIsNone(changes[0].previous)
+            self.assertEqual(changes[0].keys, {"a": 1, "b": 2})
+            self.assertEqual(self.watcher.mirror("conf"), "data1")
+            # Nothing is changed.
+            self.assertEqual(self.watcher.poll(force=True), [])
+            # A key is changed and a key is removed.
+            self.resources["conf"] = {"string": "data1", "keys": {"a": 3}}
+            self.watcher.poll(force=True)
+            self.assertEqual(len(changes), 2)
+            self.assertFalse(changes[1].data_changed)
+            self.assertEqual(changes[1].keys, {"a": 3})
+            self.assertEqual(changes[1].removed_keys, frozenset({"b"}))
+            # The resource is deleted.
+            del self.resources["conf"]
+            self.watcher.poll(force=True)
+            self.assertTrue(changes[2].deleted)
+            self.assertEqual(changes[2].previous, "data1")
+            self.assertIsNone(self.watcher.mirror("conf"))
+
+    def test_etag(self):
+        """Sends the ETag and skips the not modified resources."""
+        self.etags["conf"] = '"v1"'
+        self.watcher.watch("conf")
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            self.assertEqual(len(self.watcher.poll()), 1)
+            self.assertEqual(self.watcher.poll(force=True), [])
+        self.assertNotIn('If-None-Match', self.requests[0].headers)
+        self.assertEqual(self.requests[1].headers['If-None-Match'], '"v1"')
+
+    def test_adaptive_interval(self):
+        """Polls the unchanged resources less often."""
+        self.watcher.watch("conf")
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            self.watcher.poll()
+            self.assertEqual(self.watcher.next_poll(), 1005.0)
+            self.now = 1005.0
+            self.watcher.poll()
+            self.assertEqual(self.watcher.next_poll(), 1015.0)
+            # A resource that is not due is not polled.
+            self.assertEqual(self.watcher.poll(), [])
+            self.assertEqual(len(self.requests), 2)
+            self.now = 1015.0
+            self.watcher.poll()
+            self.assertEqual(self.watcher.next_poll(), 1035.0)
+            self.now = 1035.0
+            self.resources["conf"] = {"string": "data2"}
+            self.watcher.poll()
+            self.assertEqual(self.watcher.next_poll(), 1040.0)
+
+    def test_poll_error(self):
+        """Keeps the interval and calls on_error if a poll failed."""
+        errors = []
+        watcher = kwatcher.K2hr3ResourceWatcher(
+            khttp.K2hr3Http(self.base_url), r3token="r3token",
+            min_interval=5, max_interval=20, clock=lambda: self.now,
+            on_error=lambda path, message: errors.append(path))
+        watcher.watch("conf")
+        resp = K2hr3ApiResponse(code=401, url=self.base_url,
+                                hdrs={'Content-Type': 'text/plain'}, body='')
+        with patch.object(khttp.K2hr3Http, 'send', return_value=resp):
+            with self.assertLogs('k2hr3client.watcher', level='WARNING'):
+                for _ in range(3):
+                    self.assertEqual(watcher.poll(force=True), [])
+        self.assertEqual(errors, ["conf"] * 3)
+        self.assertEqual(watcher.next_poll(), 1005.0)
+
+    def test_callback_error(self):
+        """Keeps polling if a callback raises an exception."""
+        changes = []
+
+        def broken(change):
+            raise ValueError(change.path)
+        self.watcher.watch("conf", broken)
+        self.watcher.watch("conf", changes.append)
+        with patch.object(khttp.K2hr3Http, 'send', side_effect=self._send):
+            with self.assertLogs('k2hr3client.watcher', level='ERROR'):
+                self.watcher.poll()
+        self.assertEqual(len(changes), 1)
+
+    def test_no_token(self):
+        """Raises an exception if no token is given."""
+        with self.assertRaises(K2hr3Exception):
+            kwatcher.K2hr3ResourceWatcher(khttp.K2hr3Http(self.base_url))
+
+#
+# Local variables:
+# tab-width: 4
+# c-basic-offset: 4
+# End:
+# vim600: expandtab sw=4 ts=4 fdm=marker
+# vim<600: expandtab sw=4 ts=4
+#